@@ -1,790 +1,3364 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import time
-from concurrent.futures import ThreadPoolExecutor
-from threading import Lock, Event
-import queue
-import os
-import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
-import threading
-import sys
-from io import StringIO
-import shutil
-
-
-# ============================================================================
-# KONFIGURACJA
-# ============================================================================
-class Config:
-    """Konfiguracja crawlera"""
-    def __init__(self, url=None, max_pages=1000, max_workers=10, delay=0.3):
-        self.url = url
-        self.max_pages = max(1, max_pages)
-        self.max_workers = max(1, min(50, max_workers))
-        self.delay = max(0.3, delay)
-        self.headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-    
-    def normalize_url(self):
-        if self.url and not self.url.startswith(('http://', 'https://')):
-            self.url = 'https://' + self.url
-
-
-# ============================================================================
-# DOMENY
-# ============================================================================
-class DomainManager:
-    """Zarządza domenami"""
-    def __init__(self, url):
-        domain = urlparse(url).netloc
-        if domain.startswith('www.'):
-            self.allowed = [domain, domain[4:]]
-        else:
-            self.allowed = [domain, 'www.' + domain]
-    
-    def is_allowed(self, domain):
-        return domain in self.allowed
-
-
-# ============================================================================
-# PARSER HTML
-# ============================================================================
-class HTMLParser:
-    """Parsuje HTML"""
-    SKIP = {'mailto:', 'tel:', 'javascript:', '#'}
-    BINARY = {'.pdf', '.jpg', '.png', '.zip', '.doc', '.docx', '.xls', '.xlsx', 
-              '.gif', '.jpeg', '.svg', '.mp4', '.avi', '.mp3'}
-    
-    def __init__(self, domain_manager):
-        self.dm = domain_manager
-    
-    def parse(self, url, html):
-        """Zwraca (links[], errors[], text)"""
-        soup = BeautifulSoup(html, 'html.parser')
-        links, errors = self._extract_links(url, soup)
-        text = self._extract_text(soup)
-        return links, errors, text
-    
-    def _extract_links(self, source_url, soup):
-        links, errors = [], []
-        
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            
-            if any(href.startswith(p) for p in self.SKIP):
-                continue
-            
-            try:
-                full = urljoin(source_url, href)
-                parsed = urlparse(full)
-                
-                is_internal = self.dm.is_allowed(parsed.netloc) or parsed.netloc == ''
-                
-                if not parsed.scheme or not parsed.netloc:
-                    if is_internal or href.startswith(('/', './', '../', 'wp-content', 'uploads')):
-                        errors.append(f"{href} | Niepoprawny URL (brak schematu/domeny) | Źródło: {source_url}")
-                    continue
-                
-                if not self.dm.is_allowed(parsed.netloc):
-                    continue
-                
-                clean = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                
-                if any(clean.lower().endswith(ext) for ext in self.BINARY):
-                    continue
-                
-                links.append(clean)
-            except Exception as e:
-                errors.append(f"{href} | Błąd parsowania linku: {type(e).__name__}: {e} | Źródło: {source_url}")
-        
-        return links, errors
-    
-    def _extract_text(self, soup):
-        for tag in ['script', 'style', 'head', 'title', 'meta', 'iframe', 'noscript']:
-            for el in soup.find_all(tag):
-                el.extract()
-        
-        for br in soup.find_all('br'):
-            br.replace_with('\n')
-        for p in soup.find_all('p'):
-            p.append(soup.new_string('\n\n'))
-        for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            h.append(soup.new_string('\n\n'))
-        for li in soup.find_all('li'):
-            li.insert(0, soup.new_string('• '))
-            li.append(soup.new_string('\n'))
-        
-        text = soup.get_text()
-        lines = [l.strip() for l in text.split('\n')]
-        text = '\n'.join(l for l in lines if l)
-        
-        while '\n\n\n' in text:
-            text = text.replace('\n\n\n', '\n\n')
-        
-        return text.strip()
-
-
-# ============================================================================
-# HTTP CLIENT
-# ============================================================================
-class HTTPClient:
-    """Pobiera strony"""
-    def __init__(self, config, stop_event=None):
-        self.config = config
-        self.stop_event = stop_event
-    
-    def fetch(self, url):
-        """Zwraca (success: bool, content: str, error_msg: str|None)"""
-        if self.stop_event and self.stop_event.is_set():
-            return False, None, "Przerwano przez użytkownika"
-        
-        time.sleep(self.config.delay)
-        
-        try:
-            r = requests.get(url, timeout=15, headers=self.config.headers)
-            r.raise_for_status()
-            
-            content_type = r.headers.get('Content-Type', '')
-            if 'text/html' not in content_type:
-                return False, None, f"Nie-HTML (Content-Type: {content_type})"
-            
-            return True, r.text, None
-        except requests.exceptions.RequestException as e:
-            return False, None, f"{type(e).__name__}: {e}"
-
-
-# ============================================================================
-# STORAGE
-# ============================================================================
-class Storage:
-    """Zapisuje pliki"""
-    SEP = "_" * 80
-    
-    def __init__(self):
-        self.lock = Lock()
-        self.texts_f = open("teksty.txt", 'w', encoding='utf-8')
-        self.links_f = open("all_links.txt", 'w', encoding='utf-8')
-    
-    def save_page(self, url, text):
-        with self.lock:
-            try:
-                self.texts_f.write(f"{url}\n\n{text}\n\n{self.SEP}\n\n")
-                self.texts_f.flush()
-                self.links_f.write(f"{url}\n")
-                self.links_f.flush()
-                return True
-            except Exception as e:
-                print(f"   ⚠️  Błąd zapisu: {e}")
-                return False
-    
-    def save_errors(self, errors):
-        if errors:
-            try:
-                with open("error_links.txt", 'w', encoding='utf-8') as f:
-                    for e in sorted(errors):
-                        f.write(e + '\n')
-            except Exception as ex:
-                print(f"⚠️  Błąd zapisu errorów: {ex}")
-    
-    def close(self):
-        self.texts_f.close()
-        self.links_f.close()
-    
-    def get_file_size_mb(self, filename):
-        try:
-            return os.path.getsize(filename) / (1024 * 1024)
-        except:
-            return 0
-
-
-# ============================================================================
-# STATYSTYKI
-# ============================================================================
-class Stats:
-    """Statystyki"""
-    def __init__(self):
-        self.visited = set()
-        self.queued = set()
-        self.errors = []
-        self.lock = Lock()
-        self.start = time.time()
-    
-    def mark_visited(self, url):
-        with self.lock:
-            if url in self.visited:
-                return False
-            self.visited.add(url)
-            return True
-    
-    def add_queued(self, urls):
-        added = []
-        with self.lock:
-            for url in urls:
-                if url not in self.visited and url not in self.queued:
-                    self.queued.add(url)
-                    added.append(url)
-        return added
-    
-    def add_errors(self, errors):
-        with self.lock:
-            self.errors.extend(errors)
-    
-    def add_error(self, error):
-        with self.lock:
-            self.errors.append(error)
-    
-    def get_counts(self):
-        with self.lock:
-            return len(self.visited), len(self.queued), len(self.errors)
-    
-    def get_elapsed_time(self):
-        return time.time() - self.start
-    
-    def get_errors(self):
-        with self.lock:
-            return self.errors.copy()
-
-
-# ============================================================================
-# CRAWLER
-# ============================================================================
-class Crawler:
-    """Główny crawler"""
-    def __init__(self, config, stop_event=None):
-        self.config = config
-        self.stop_event = stop_event
-        
-        self.dm = DomainManager(config.url)
-        self.http = HTTPClient(config, stop_event)
-        self.parser = HTMLParser(self.dm)
-        self.storage = Storage()
-        self.stats = Stats()
-        
-        self.queue = queue.Queue()
-        self.queue.put(config.url)
-        self.stats.add_queued([config.url])
-    
-    def run(self):
-        """Uruchamia crawling"""
-        print(f"\n🚀 Start: {self.config.url}")
-        print(f"📍 Domeny: {', '.join(self.dm.allowed)}")
-        print(f"🔧 Wątków: {self.config.max_workers}")
-        print(f"📊 Limit: {self.config.max_pages}")
-        print(f"⏱️  Opóźnienie: {self.config.delay}s\n")
-        
-        try:
-            with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-                futures = {}
-                
-                while True:
-                    if self.stop_event and self.stop_event.is_set():
-                        print("\n⚠️  Przerwano przez użytkownika")
-                        break
-                    
-                    visited, _, _ = self.stats.get_counts()
-                    if visited >= self.config.max_pages:
-                        print(f"\n⚠️  Osiągnięto limit {self.config.max_pages} stron")
-                        break
-                    
-                    # Dodaj zadania
-                    while not self.queue.empty() and len(futures) < self.config.max_workers:
-                        url = self.queue.get()
-                        if url in self.stats.visited:
-                            continue
-                        future = executor.submit(self._process, url)
-                        futures[future] = url
-                    
-                    # Zbieraj wyniki
-                    done = [f for f in futures if f.done()]
-                    for future in done:
-                        url = futures.pop(future)
-                        try:
-                            new_links = future.result()
-                            for link in new_links:
-                                self.queue.put(link)
-                        except Exception as e:
-                            print(f"❌ Błąd wątku: {e}")
-                            self.stats.add_error(f"{url} | Błąd wątku: {type(e).__name__}: {e}")
-                    
-                    if self.queue.empty() and not futures:
-                        print("\n⚠️  Brak więcej linków do przetworzenia")
-                        break
-                    
-                    time.sleep(0.01)
-        finally:
-            self.storage.close()
-        
-        self._print_summary()
-    
-    def _process(self, url):
-        """Przetwarza URL"""
-        if not self.stats.mark_visited(url):
-            return []
-        
-        visited, queued, _ = self.stats.get_counts()
-        print(f"🔍 [{visited}/{queued}] {url}")
-        
-        # Pobierz
-        success, content, error = self.http.fetch(url)
-        
-        if not success:
-            self.stats.add_error(f"{url} | {error}")
-            print(f"   ❌ Błąd pobierania")
-            return []
-        
-        # Parsuj
-        try:
-            links, errors, text = self.parser.parse(url, content)
-            self.stats.add_errors(errors)
-        except Exception as e:
-            self.stats.add_error(f"{url} | Błąd parsowania HTML: {type(e).__name__}: {e}")
-            print(f"   ❌ Błąd parsowania")
-            return []
-        
-        # Zapisz
-        if not self.storage.save_page(url, text):
-            self.stats.add_error(f"{url} | Błąd zapisu do pliku")
-        
-        # Dodaj nowe linki
-        new = self.stats.add_queued(links)
-        
-        if new:
-            _, total, _ = self.stats.get_counts()
-            print(f"   ✅ Zapisano | +{len(new)} nowych linków (razem: {total})")
-        else:
-            print(f"   ✅ Zapisano")
-        
-        return new
-    
-    def _print_summary(self):
-        visited, queued, errors = self.stats.get_counts()
-        elapsed = self.stats.get_elapsed_time()
-        
-        print(f"\n{'='*60}")
-        print(f"✅ CRAWLING ZAKOŃCZONY")
-        print(f"{'='*60}")
-        print(f"⏱️  Czas: {elapsed:.2f}s ({elapsed/60:.1f} min)")
-        print(f"📊 Przetworzone strony: {visited}")
-        print(f"🔗 Znalezione linki: {queued}")
-        print(f"❌ Błędów: {errors}")
-        if visited > 0:
-            print(f"⚡ Prędkość: {visited/elapsed:.2f} stron/s")
-        print(f"{'='*60}")
-        
-        # Zapisz błędy
-        error_list = self.stats.get_errors()
-        if error_list:
-            self.storage.save_errors(error_list)
-            print(f"\n❌ Błędy zapisano w: error_links.txt ({len(error_list)} błędów)")
-        
-        # Statystyki plików
-        print(f"\n💾 Zapisane pliki:")
-        texts_size = self.storage.get_file_size_mb("teksty.txt")
-        if texts_size > 0:
-            print(f"   📝 teksty.txt ({texts_size:.2f} MB)")
-        links_size = self.storage.get_file_size_mb("all_links.txt")
-        if links_size > 0:
-            print(f"   🔗 all_links.txt ({links_size * 1024:.1f} KB)")
-        if os.path.exists("error_links.txt"):
-            err_size = self.storage.get_file_size_mb("error_links.txt")
-            print(f"   ❌ error_links.txt ({err_size * 1024:.1f} KB)")
-        
-        print(f"\n🎉 CRAWLING GOTOWY!")
-        print(f"   ✅ Pomyślnie: {visited}")
-        print(f"   ❌ Błędy: {errors}")
-        print(f"   🔗 Odkryte linki: {queued}")
-
-
-# ============================================================================
-# DEDUPLIKATOR
-# ============================================================================
-class Deduplicator:
-    """Deduplikuje teksty"""
-    SEP_IN = "_" * 80
-    SEP_OUT = "_" * 50
-    
-    def __init__(self, input_file="teksty.txt", output_file="teksty_unikalne.txt"):
-        self.input = input_file
-        self.output = output_file
-    
-    def run(self):
-        print(f"\n{'='*60}")
-        print("🧹 DEDUPLIKATOR TEKSTU")
-        print(f"{'='*60}")
-        print(f"\n📄 Źródło: {self.input}")
-        print(f"💾 Cel: {self.output}\n")
-        
-        start = time.time()
-        
-        try:
-            print("📖 Wczytuję plik...")
-            with open(self.input, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            sections = content.split(self.SEP_IN)
-            if sections and not sections[-1].strip():
-                sections.pop()
-            
-            print(f"📊 Znaleziono {len(sections)} sekcji\n")
-            
-            total_lines = 0
-            unique_lines = 0
-            processed = []
-            
-            for i, section in enumerate(sections, 1):
-                lines = section.split('\n')
-                seen = set()
-                unique = []
-                
-                for line in lines:
-                    total_lines += 1
-                    if line not in seen:
-                        seen.add(line)
-                        unique.append(line)
-                        unique_lines += 1
-                
-                processed.append('\n'.join(unique))
-                
-                if i % 10 == 0:
-                    print(f"   Przetworzono {i}/{len(sections)} sekcji...")
-            
-            print(f"\n💾 Zapisuję wynik...")
-            with open(self.output, 'w', encoding='utf-8') as f:
-                for i, section in enumerate(processed):
-                    f.write(section)
-                    if i < len(processed) - 1:
-                        if not section.endswith('\n'):
-                            f.write('\n')
-                        f.write(self.SEP_OUT + '\n')
-            
-            elapsed = time.time() - start
-            removed = total_lines - unique_lines
-            
-            print(f"\n{'='*60}")
-            print(f"✅ DEDUPLIKACJA ZAKOŃCZONA")
-            print(f"{'='*60}")
-            print(f"⏱️  Czas: {elapsed:.2f}s")
-            print(f"📊 Sekcji: {len(sections)}")
-            print(f"📝 Łącznie linii: {total_lines}")
-            print(f"✅ Unikalne: {unique_lines}")
-            print(f"🗑️  Usunięte: {removed}")
-            if total_lines > 0:
-                print(f"💾 Oszczędność: {(removed/total_lines*100):.1f}%")
-            print(f"{'='*60}")
-            
-            try:
-                size = os.path.getsize(self.output) / (1024 * 1024)
-                print(f"\n💾 Plik wyjściowy:")
-                print(f"   📝 {self.output} ({size:.2f} MB)")
-            except:
-                pass
-            
-            return True
-        except FileNotFoundError:
-            print(f"❌ Błąd: Plik '{self.input}' nie istnieje!")
-            return False
-        except Exception as e:
-            print(f"❌ Błąd deduplikacji: {e}")
-            return False
-
-
-# ============================================================================
-# GUI
-# ============================================================================
-class ConsoleRedirect:
-    """Przekierowuje print() do GUI"""
-    def __init__(self, widget):
-        self.widget = widget
-    
-    def write(self, text):
-        try:
-            self.widget.insert(tk.END, text)
-            self.widget.see(tk.END)
-            self.widget.update_idletasks()
-        except:
-            pass
-    
-    def flush(self):
-        pass
-
-
-class GUI:
-    """Interfejs graficzny"""
-    def __init__(self, root):
-        self.root = root
-        self.root.title("🕷️ Web Crawler + Ekstraktor")
-        self.root.geometry("900x850")
-        self.root.configure(bg="#f0f0f0")
-        
-        self.crawler = None
-        self.stop_event = Event()
-        self.running = False
-        self.stats_job = None
-        
-        self._build()
-    
-    def _build(self):
-        """Buduje UI"""
-        # URL
-        f1 = tk.Frame(self.root, bg="#f0f0f0", padx=10, pady=10)
-        f1.pack(fill=tk.X)
-        tk.Label(f1, text="📍 URL Strony:", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor=tk.W)
-        self.url_entry = tk.Entry(f1, font=("Arial", 11), width=80)
-        self.url_entry.pack(fill=tk.X, pady=5)
-        self.url_entry.insert(0, "https://example.com")
-        
-        # Parametry
-        f2 = tk.LabelFrame(self.root, text="⚙️ Parametry", font=("Arial", 11, "bold"),
-                          bg="#f0f0f0", padx=10, pady=10)
-        f2.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Max stron
-        r1 = tk.Frame(f2, bg="#f0f0f0")
-        r1.pack(fill=tk.X, pady=3)
-        tk.Label(r1, text="📊 Max stron:", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
-        self.max_pages = tk.Spinbox(r1, from_=1, to=100000, width=15, font=("Arial", 10))
-        self.max_pages.delete(0, tk.END)
-        self.max_pages.insert(0, "1000")
-        self.max_pages.pack(side=tk.LEFT, padx=5)
-        tk.Label(r1, text="(min: 1)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
-        
-        # Wątki
-        r2 = tk.Frame(f2, bg="#f0f0f0")
-        r2.pack(fill=tk.X, pady=3)
-        tk.Label(r2, text="🔧 Liczba wątków:", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
-        self.workers = tk.Spinbox(r2, from_=1, to=50, width=15, font=("Arial", 10))
-        self.workers.delete(0, tk.END)
-        self.workers.insert(0, "10")
-        self.workers.pack(side=tk.LEFT, padx=5)
-        tk.Label(r2, text="(min: 1, max: 50)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
-        
-        # Opóźnienie
-        r3 = tk.Frame(f2, bg="#f0f0f0")
-        r3.pack(fill=tk.X, pady=3)
-        tk.Label(r3, text="⏱️ Opóźnienie (s):", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
-        self.delay = tk.Spinbox(r3, from_=0.3, to=10.0, increment=0.1, width=15, 
-                               font=("Arial", 10), format="%.1f")
-        self.delay.delete(0, tk.END)
-        self.delay.insert(0, "0.3")
-        self.delay.pack(side=tk.LEFT, padx=5)
-        tk.Label(r3, text="(min: 0.3)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
-        
-        # Przyciski START/STOP
-        f3 = tk.Frame(self.root, bg="#f0f0f0", pady=10)
-        f3.pack(fill=tk.X)
-        
-        self.start_btn = tk.Button(f3, text="🚀 SCRAPUJ", font=("Arial", 14, "bold"),
-                                   bg="#4CAF50", fg="white", command=self.start,
-                                   cursor="hand2", padx=30, pady=10)
-        self.start_btn.pack(side=tk.LEFT, padx=(250, 10))
-        
-        self.stop_btn = tk.Button(f3, text="⛔ PRZERWIJ", font=("Arial", 14, "bold"),
-                                  bg="#F44336", fg="white", command=self.stop,
-                                  cursor="hand2", padx=30, pady=10, state=tk.DISABLED)
-        self.stop_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Statystyki
-        f4 = tk.LabelFrame(self.root, text="📊 Statystyki Live", font=("Arial", 11, "bold"),
-                          bg="#f0f0f0", padx=10, pady=10)
-        f4.pack(fill=tk.X, padx=10, pady=5)
-        
-        grid = tk.Frame(f4, bg="#f0f0f0")
-        grid.pack(fill=tk.X)
-        
-        tk.Label(grid, text="✅ Przetworzone:", width=18, anchor=tk.W, bg="#f0f0f0", 
-                font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.stat_visited = tk.Label(grid, text="0", width=12, anchor=tk.W,
-                                     font=("Arial", 10, "bold"), fg="#2196F3", bg="#f0f0f0")
-        self.stat_visited.grid(row=0, column=1, sticky=tk.W)
-        
-        tk.Label(grid, text="🔗 Znalezione linki:", width=18, anchor=tk.W, bg="#f0f0f0",
-                font=("Arial", 10)).grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.stat_links = tk.Label(grid, text="0", width=12, anchor=tk.W,
-                                   font=("Arial", 10, "bold"), fg="#FF9800", bg="#f0f0f0")
-        self.stat_links.grid(row=1, column=1, sticky=tk.W)
-        
-        tk.Label(grid, text="❌ Błędy:", width=18, anchor=tk.W, bg="#f0f0f0",
-                font=("Arial", 10)).grid(row=2, column=0, sticky=tk.W, pady=2)
-        self.stat_errors = tk.Label(grid, text="0", width=12, anchor=tk.W,
-                                    font=("Arial", 10, "bold"), fg="#F44336", bg="#f0f0f0")
-        self.stat_errors.grid(row=2, column=1, sticky=tk.W)
-        
-        tk.Label(grid, text="⏱️ Czas:", width=18, anchor=tk.W, bg="#f0f0f0",
-                font=("Arial", 10)).grid(row=3, column=0, sticky=tk.W, pady=2)
-        self.stat_time = tk.Label(grid, text="0.0s", width=12, anchor=tk.W,
-                                  font=("Arial", 10, "bold"), fg="#9C27B0", bg="#f0f0f0")
-        self.stat_time.grid(row=3, column=1, sticky=tk.W)
-        
-        self.progress = ttk.Progressbar(f4, mode='indeterminate')
-        self.progress.pack(fill=tk.X, pady=5)
-        
-        # Konsola
-        f5 = tk.LabelFrame(self.root, text="📋 Logi", font=("Arial", 11, "bold"),
-                          bg="#f0f0f0", padx=10, pady=10)
-        f5.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        self.console = scrolledtext.ScrolledText(f5, height=15, font=("Consolas", 9),
-                                                 bg="#1e1e1e", fg="#d4d4d4", insertbackground="white")
-        self.console.pack(fill=tk.BOTH, expand=True)
-        
-        # Download
-        f6 = tk.Frame(self.root, bg="#f0f0f0", pady=10)
-        f6.pack(fill=tk.X, padx=10)
-        
-        self.dl_texts = tk.Button(f6, text="📥 Pobierz Teksty", font=("Arial", 11, "bold"),
-                                 bg="#2196F3", fg="white", command=self.download_texts,
-                                 cursor="hand2", padx=20, pady=8, state=tk.DISABLED)
-        self.dl_texts.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
-        
-        self.dl_errors = tk.Button(f6, text="⚠️ Pobierz Errory", font=("Arial", 11, "bold"),
-                                  bg="#FF5722", fg="white", command=self.download_errors,
-                                  cursor="hand2", padx=20, pady=8, state=tk.DISABLED)
-        self.dl_errors.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
-    
-    def start(self):
-        if self.running:
-            messagebox.showwarning("Ostrzeżenie", "Crawling już trwa!")
-            return
-        
-        # Walidacja
-        url = self.url_entry.get().strip()
-        if not url:
-            messagebox.showerror("Błąd", "Podaj URL!")
-            return
-        
-        try:
-            max_pages = int(self.max_pages.get())
-            workers = int(self.workers.get())
-            delay = float(self.delay.get())
-            
-            if max_pages < 1:
-                messagebox.showerror("Błąd", "Minimalna liczba stron to 1!")
-                return
-            if workers < 1:
-                messagebox.showerror("Błąd", "Minimalna liczba wątków to 1!")
-                return
-            if workers > 50:
-                messagebox.showerror("Błąd", "Maksymalna liczba wątków to 50!")
-                return
-            if delay < 0.3:
-                messagebox.showerror("Błąd", "Minimalne opóźnienie to 0.3s!")
-                return
-        except ValueError:
-            messagebox.showerror("Błąd", "Nieprawidłowe parametry!")
-            return
-        
-        # UI
-        self.stop_event.clear()
-        self.start_btn.config(state=tk.DISABLED, bg="#cccccc")
-        self.stop_btn.config(state=tk.NORMAL, bg="#F44336")
-        self.dl_texts.config(state=tk.DISABLED)
-        self.dl_errors.config(state=tk.DISABLED)
-        self.console.delete(1.0, tk.END)
-        self.stat_visited.config(text="0")
-        self.stat_links.config(text="0")
-        self.stat_errors.config(text="0")
-        self.stat_time.config(text="0.0s")
-        self.progress.start()
-        
-        # Redirect
-        sys.stdout = ConsoleRedirect(self.console)
-        
-        # Thread
-        self.running = True
-        config = Config(url, max_pages, workers, delay)
-        config.normalize_url()
-        
-        threading.Thread(target=self._run, args=(config,), daemon=True).start()
-        self._schedule_stats_update()
-    
-    def stop(self):
-        if self.running:
-            self.stop_event.set()
-            self.stop_btn.config(state=tk.DISABLED, bg="#cccccc")
-            print("\n⚠️  Żądanie przerwania... Proszę czekać...")
-    
-    def _run(self, config):
-        try:
-            self.crawler = Crawler(config, self.stop_event)
-            self.crawler.run()
-            
-            if not self.stop_event.is_set():
-                Deduplicator().run()
-            
-            self.root.after(0, lambda: self.dl_texts.config(state=tk.NORMAL))
-            if os.path.exists("error_links.txt"):
-                self.root.after(0, lambda: self.dl_errors.config(state=tk.NORMAL))
-        except Exception as e:
-            error_msg = f"Błąd podczas crawlingu:\n{e}"
-            self.root.after(0, lambda: messagebox.showerror("Błąd", error_msg))
-            print(f"\n❌ {error_msg}")
-        finally:
-            self.running = False
-            self.root.after(0, lambda: self.start_btn.config(state=tk.NORMAL, bg="#4CAF50"))
-            self.root.after(0, lambda: self.stop_btn.config(state=tk.DISABLED, bg="#cccccc"))
-            self.root.after(0, self.progress.stop)
-            self.root.after(100, self._final_stats_update)
-    
-    def _schedule_stats_update(self):
-        if self.running:
-            self._update_stats()
-            self.stats_job = self.root.after(300, self._schedule_stats_update)
-    
-    def _update_stats(self):
-        if self.crawler:
-            try:
-                v, l, e = self.crawler.stats.get_counts()
-                t = self.crawler.stats.get_elapsed_time()
-                self.stat_visited.config(text=str(v))
-                self.stat_links.config(text=str(l))
-                self.stat_errors.config(text=str(e))
-                self.stat_time.config(text=f"{t:.1f}s")
-            except:
-                pass
-    
-    def _final_stats_update(self):
-        if self.crawler:
-            try:
-                v, l, e = self.crawler.stats.get_counts()
-                t = self.crawler.stats.get_elapsed_time()
-                self.stat_visited.config(text=str(v))
-                self.stat_links.config(text=str(l))
-                self.stat_errors.config(text=str(e))
-                self.stat_time.config(text=f"{t:.1f}s")
-            except:
-                pass
-    
-    def download_texts(self):
-        self._download("teksty_unikalne.txt", "Zapisz teksty")
-    
-    def download_errors(self):
-        self._download("error_links.txt", "Zapisz errory")
-    
-    def _download(self, source, title):
-        if not os.path.exists(source):
-            messagebox.showerror("Błąd", f"Plik {source} nie istnieje!")
-            return
-        
-        dest = filedialog.asksaveasfilename(
-            title=title,
-            defaultextension=".txt",
-            filetypes=[("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")],
-            initialfile=source
-        )
-        
-        if dest:
-            try:
-                shutil.copy(source, dest)
-                messagebox.showinfo("Sukces", f"Zapisano:\n{dest}")
-            except Exception as e:
-                messagebox.showerror("Błąd", f"Nie można zapisać pliku:\n{e}")
-
-
-# ============================================================================
-# MAIN
-# ============================================================================
-if __name__ == "__main__":
-    root = tk.Tk()
-    GUI(root)
-    root.mainloop()
+from urllib.parse import urljoin, urlparse
+import time
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Event
+import queue
+import os
+import threading
+import sys
+from io import StringIO
+import shutil
+import re
+import hashlib
+import json
+import gzip
+import io
+import sqlite3
+import struct
+import mmap
+import bisect
+import base64
+import uuid
+import zlib
+import random
+import heapq
+import logging
+import logging.handlers
+import argparse
+import signal
+import importlib
+import importlib.util
+from datetime import datetime, timezone
+from http import HTTPStatus
+from collections import namedtuple, OrderedDict, deque
+from itertools import chain
+from array import array
+
+
+class LazyModule:
+    """Moduł importowany przy pierwszym użyciu atrybutu - import app (CLI, testy) bez kosztu GUI i numpy"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        try:
+            return getattr(self._module, attr)
+        except AttributeError as e:
+            # Podmoduł jeszcze nie zaimportowany, np. pyarrow.parquet; brak podmodułu = brak atrybutu (hasattr)
+            name = f"{self._name}.{attr}"
+            try:
+                return importlib.import_module(name)
+            except ModuleNotFoundError as missing:
+                if missing.name != name:
+                    raise
+                raise e from None
+    
+    @classmethod
+    def optional(cls, name):
+        """LazyModule lub None, gdy pakiet nie jest zainstalowany"""
+        return cls(name) if importlib.util.find_spec(name) else None
+
+
+requests = LazyModule('requests')
+bs4 = LazyModule('bs4')
+tk = LazyModule('tkinter')
+ttk = LazyModule('tkinter.ttk')
+scrolledtext = LazyModule('tkinter.scrolledtext')
+filedialog = LazyModule('tkinter.filedialog')
+messagebox = LazyModule('tkinter.messagebox')
+HTTP_REASONS = {status.value: status.phrase for status in HTTPStatus}
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+np = LazyModule.optional('numpy')
+pyarrow = LazyModule.optional('pyarrow')
+
+
+# ============================================================================
+# KONFIGURACJA
+# ============================================================================
+class Config:
+    """Konfiguracja crawlera"""
+    MAX_WORKERS = 50
+    MIN_DELAY = 0.3
+    
+    def __init__(self, url=None, max_pages=1000, max_workers=10, delay=0.3, skip_duplicate_links=False,
+                 durability='periodic', flush_interval=1.0, compression='none', compression_level=None,
+                 record_format=None, shard_mb=None, shard_records=None, warc=False, dedupe=True,
+                 boilerplate=None, near_duplicates=None, texts_format='txt', log_level='info', log_every=1,
+                 log_errors_only=False, log_json=None, trap_detection=True, trap_pattern_limit=200,
+                 trap_same_outlinks=20, trap_outlink_similarity=0.98, simhash=False, learn_non_html=True,
+                 non_html_path="wzorce_nie_html.json"):
+        self.url = url
+        self.max_pages = max(1, max_pages)
+        self.max_workers = max(1, min(self.MAX_WORKERS, max_workers))
+        self.delay = max(self.MIN_DELAY, delay)
+        self.skip_duplicate_links = skip_duplicate_links
+        self.durability = durability
+        self.flush_interval = max(0.05, flush_interval)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.record_format = record_format
+        self.shard_mb = shard_mb
+        self.shard_records = shard_records
+        self.warc = warc
+        self.dedupe = dedupe              # deduplikacja w trakcie zapisu (teksty_unikalne.txt bez drugiego przejścia)
+        self.boilerplate = boilerplate    # np. 0.5 = usuń linie obecne w >50% stron (tylko z dedupe)
+        self.near_duplicates = near_duplicates  # np. 0.8 = usuń prawie identyczne akapity (MinHash)
+        self.texts_format = texts_format  # 'txt' (separatory) lub 'rec' (kontener z prefiksem długości)
+        self.log_level = log_level        # 'debug' / 'info' / 'warning' / 'error'
+        self.log_every = max(1, log_every)  # loguj co N-tą stronę (błędy zawsze)
+        self.log_errors_only = log_errors_only  # z logów stron tylko ostrzeżenia i błędy
+        self.log_json = log_json          # np. "crawl.jsonl" - dodatkowy log JSON lines
+        self.trap_detection = trap_detection  # wykrywanie pułapek URL (kalendarze, filtry, ID sesji)
+        self.trap_pattern_limit = trap_pattern_limit  # URL-i wzorca, po których duplikaty dławią wzorzec
+        self.trap_same_outlinks = trap_same_outlinks  # stron wzorca z prawie tymi samymi linkami = pułapka
+        self.trap_outlink_similarity = trap_outlink_similarity  # próg Jaccarda zbiorów linków
+        self.simhash = simhash            # pomijanie prawie identycznych stron (SimHash treści bez szablonu)
+        self.learn_non_html = learn_non_html  # uczenie się i pomijanie wzorców URL nie-HTML / 404
+        self.non_html_path = non_html_path  # plik wyuczonych wzorców (zachowywany między uruchomieniami)
+        self.headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    
+    def normalize_url(self):
+        if self.url and not self.url.startswith(('http://', 'https://')):
+            self.url = 'https://' + self.url
+
+
+# ============================================================================
+# LOGI
+# ============================================================================
+class JsonLogFormatter(logging.Formatter):
+    """Wpis logu jako jedna linia JSON: czas, poziom, treść oraz page/url, gdy podane"""
+    FIELDS = ('page', 'url', 'workers', 'delay', 'pages_per_s')
+    
+    def format(self, record):
+        entry = {'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                 'level': record.levelname.lower(), 'msg': record.getMessage().strip()}
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CrawlLog:
+    """Logi crawlera z poziomami i próbkowaniem; wątki tylko kolejkują wpisy, zapis robi wątek w tle"""
+    LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR}
+    
+    class Listener(logging.handlers.QueueListener):
+        def prepare(self, item):
+            # LogRecord powstaje dopiero w wątku w tle - wątek crawlera kolejkuje tylko krotkę
+            level, msg, extra, created = item
+            record = logging.makeLogRecord(extra)
+            record.name, record.msg, record.created = "crawler", msg, created
+            record.levelno, record.levelname = level, logging.getLevelName(level)
+            return record
+    
+    class Stream(logging.StreamHandler):
+        def __init__(self, stream, pending):
+            super().__init__(stream)
+            self.pending = pending
+        
+        def flush(self):
+            # Jeden flush na partię wpisów, gdy kolejka opustoszeje, a nie po każdej linii
+            if self.pending.empty():
+                super().flush()
+    
+    def __init__(self, level='info', every=1, errors_only=False, json_path=None, streams=None):
+        self.level = self.LEVELS[level]
+        self.every = max(1, every)
+        self.errors_only = errors_only
+        self.queue = queue.SimpleQueue()
+        
+        # Subskrybenci: konsola (stdout) albo GUI (ConsoleRedirect) i opcjonalny plik JSONL
+        handlers = []
+        for stream in streams or [sys.stdout]:
+            handler = self.Stream(stream, self.queue)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            handlers.append(handler)
+        if json_path:
+            handler = logging.FileHandler(json_path, 'w', encoding='utf-8')
+            handler.setFormatter(JsonLogFormatter())
+            handlers.append(handler)
+        self.listener = self.Listener(self.queue, *handlers)
+        self.listener.start()
+        self.closed = False
+    
+    def log(self, level, msg, page=None, **extra):
+        """Kolejkuje wpis; wpisy stron poniżej WARNING przechodzą próbkowanie (co N-ta strona, errors_only)"""
+        if level < self.level:
+            return
+        if page is not None:
+            if level < logging.WARNING and (self.errors_only or page % self.every):
+                return
+            extra['page'] = page
+        self.queue.put((level, msg, extra, time.time()))
+    
+    def debug(self, msg, page=None, **extra):
+        self.log(logging.DEBUG, msg, page, **extra)
+    
+    def info(self, msg, page=None, **extra):
+        self.log(logging.INFO, msg, page, **extra)
+    
+    def warning(self, msg, page=None, **extra):
+        self.log(logging.WARNING, msg, page, **extra)
+    
+    def error(self, msg, page=None, **extra):
+        self.log(logging.ERROR, msg, page, **extra)
+    
+    def close(self):
+        """Czeka na zapis zaległych wpisów i zamyka plik JSONL"""
+        if self.closed:
+            return
+        self.closed = True
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            logging.StreamHandler.flush(handler)
+            handler.close()
+
+
+# ============================================================================
+# DOMENY
+# ============================================================================
+class DomainManager:
+    """Zarządza domenami"""
+    def __init__(self, url):
+        domain = urlparse(url).netloc
+        if domain.startswith('www.'):
+            self.allowed = [domain, domain[4:]]
+        else:
+            self.allowed = [domain, 'www.' + domain]
+    
+    def is_allowed(self, domain):
+        return domain in self.allowed
+
+
+# ============================================================================
+# PARSER HTML
+# ============================================================================
+class HTMLParser:
+    """Parsuje HTML"""
+    SKIP = {'mailto:', 'tel:', 'javascript:', '#'}
+    BINARY = {'.pdf', '.jpg', '.png', '.zip', '.doc', '.docx', '.xls', '.xlsx', 
+              '.gif', '.jpeg', '.svg', '.mp4', '.avi', '.mp3'}
+    
+    def __init__(self, domain_manager):
+        self.dm = domain_manager
+    
+    def parse(self, url, html):
+        """Zwraca (links[], errors[], text, canonical|None)"""
+        soup = bs4.BeautifulSoup(html, 'html.parser')
+        links, errors = self._extract_links(url, soup)
+        canonical = self._extract_canonical(url, soup)
+        text = self._extract_text(soup)
+        return links, errors, text, canonical
+    
+    def normalize(self, url):
+        """Zwraca URL w postaci scheme://netloc/path lub None, gdy spoza domeny"""
+        parsed = urlparse(url)
+        if not parsed.scheme or not self.dm.is_allowed(parsed.netloc):
+            return None
+        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    
+    def _extract_canonical(self, source_url, soup):
+        link = soup.find('link', rel='canonical', href=True)
+        if not link:
+            return None
+        try:
+            return self.normalize(urljoin(source_url, link['href'].strip()))
+        except ValueError:
+            return None
+    
+    def _extract_links(self, source_url, soup):
+        links, errors = [], []
+        
+        for a in soup.find_all('a', href=True):
+            href = a['href']
+            
+            if any(href.startswith(p) for p in self.SKIP):
+                continue
+            
+            try:
+                full = urljoin(source_url, href)
+                parsed = urlparse(full)
+                
+                is_internal = self.dm.is_allowed(parsed.netloc) or parsed.netloc == ''
+                
+                if not parsed.scheme or not parsed.netloc:
+                    if is_internal or href.startswith(('/', './', '../', 'wp-content', 'uploads')):
+                        errors.append(f"{href} | Niepoprawny URL (brak schematu/domeny) | Źródło: {source_url}")
+                    continue
+                
+                if not self.dm.is_allowed(parsed.netloc):
+                    continue
+                
+                clean = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                
+                if any(clean.lower().endswith(ext) for ext in self.BINARY):
+                    continue
+                
+                links.append(clean)
+            except Exception as e:
+                errors.append(f"{href} | Błąd parsowania linku: {type(e).__name__}: {e} | Źródło: {source_url}")
+        
+        return links, errors
+    
+    def _extract_text(self, soup):
+        for tag in ['script', 'style', 'head', 'title', 'meta', 'iframe', 'noscript']:
+            for el in soup.find_all(tag):
+                el.extract()
+        
+        for br in soup.find_all('br'):
+            br.replace_with('\n')
+        for p in soup.find_all('p'):
+            p.append(soup.new_string('\n\n'))
+        for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            h.append(soup.new_string('\n\n'))
+        for li in soup.find_all('li'):
+            li.insert(0, soup.new_string('• '))
+            li.append(soup.new_string('\n'))
+        
+        text = soup.get_text()
+        lines = [l.strip() for l in text.split('\n')]
+        text = '\n'.join(l for l in lines if l)
+        
+        while '\n\n\n' in text:
+            text = text.replace('\n\n\n', '\n\n')
+        
+        return text.strip()
+
+
+# ============================================================================
+# PUŁAPKI CRAWLERA
+# ============================================================================
+class TrapDetector:
+    """Wykrywa nieskończone przestrzenie URL (kalendarze, filtry, ID sesji)"""
+    NUM = re.compile(r'\d+')
+    TOKEN = re.compile(r'[0-9a-fA-F-]{16,}')
+    EXPLOSION = "Eksplozja wzorca"
+    SAME_OUTLINKS = "Identyczne linki wychodzące"
+    THROTTLED = {EXPLOSION, SAME_OUTLINKS}
+    
+    REPRESENTATIVES = 32    # zbiorów linków zapamiętanych na wzorzec
+    MIN_OBSERVED = 20       # stron wzorca potrzebnych do oceny udziału duplikatów
+    
+    def __init__(self, max_depth=15, max_repeat=3, pattern_limit=200, throttle=10, same_outlinks=20,
+                 outlink_similarity=0.98, duplicate_ratio=0.5):
+        self.max_depth = max_depth
+        self.max_repeat = max_repeat
+        self.pattern_limit = pattern_limit
+        self.throttle = throttle
+        self.same_outlinks = same_outlinks
+        self.outlink_similarity = outlink_similarity    # Jaccard zbiorów linków uznawany za "te same linki"
+        self.duplicate_ratio = duplicate_ratio          # udział duplikatów treści, od którego wzorzec to eksplozja
+        self.lock = Lock()
+        self.patterns = {}
+        self.outlinks = {}      # wzorzec -> [[zbiór linków, liczba stron], ...]
+        self.observed = {}      # wzorzec -> [stron, duplikatów treści]
+        self.trapped = {}
+        self.blocked = {}
+    
+    @classmethod
+    def template(cls, url):
+        """Zamienia zmienne fragmenty ścieżki na symbole: /cal/2024/5 -> /cal/{n}/{n}"""
+        parsed = urlparse(url)
+        segments = []
+        for seg in parsed.path.split('/'):
+            if cls.TOKEN.fullmatch(seg) and any(c.isdigit() for c in seg):
+                segments.append('{id}')
+            else:
+                segments.append(cls.NUM.sub('{n}', seg))
+        return f"{parsed.netloc}{'/'.join(segments)}"
+    
+    def filter(self, urls):
+        """Zwraca URL-e, które nie wyglądają na pułapkę (wywoływać tylko dla nowych URL-i)"""
+        allowed = []
+        with self.lock:
+            for url in urls:
+                reason, pattern = self._check(url)
+                if reason:
+                    self.trapped.setdefault(pattern, reason)
+                    self.blocked[pattern] = self.blocked.get(pattern, 0) + 1
+                else:
+                    allowed.append(url)
+        return allowed
+    
+    def _check(self, url):
+        segments = [s for s in urlparse(url).path.split('/') if s]
+        pattern = self.template(url)
+        reason = self.trapped.get(pattern)
+        
+        if reason and reason not in self.THROTTLED:
+            return reason, pattern
+        
+        if len(segments) > self.max_depth:
+            return f"Zbyt głęboka ścieżka (>{self.max_depth})", pattern
+        
+        counts = {}
+        for seg in segments:
+            counts[seg] = counts.get(seg, 0) + 1
+            if counts[seg] > self.max_repeat:
+                return f"Powtarzający się segment '{seg}'", pattern
+        
+        # Wzorzec podejrzany - przepuszczaj tylko co N-ty URL. Liczna, ale zwykła przestrzeń (katalog
+        # /produkt/{n}, artykuły /artykul/{n}) nie jest pułapką: eksplozja wymaga, by pobrane strony
+        # wzorca były w większości duplikatami treści
+        n = self.patterns.get(pattern, 0) + 1
+        self.patterns[pattern] = n
+        if reason is None and n > self.pattern_limit and self._mostly_duplicates(pattern):
+            reason = self.trapped[pattern] = self.EXPLOSION
+        if reason and n % self.throttle:
+            return reason, pattern
+        
+        return None, pattern
+    
+    def _mostly_duplicates(self, pattern):
+        pages, duplicates = self.observed.get(pattern, (0, 0))
+        return pages >= self.MIN_OBSERVED and duplicates >= self.duplicate_ratio * pages
+    
+    def observe_page(self, url, links, duplicate=False):
+        """Rejestruje pobraną stronę: duplikat treści (identyczna, prawie identyczna, sam szablon) i jej linki.
+        Wzorzec jest dławiony, gdy same_outlinks jego stron ma prawie ten sam zbiór linków (Jaccard), a strony
+        są w większości duplikatami - artykuły z samym menu mają te same linki, ale własną treść"""
+        pattern = self.template(url)
+        links = frozenset(links)
+        with self.lock:
+            observed = self.observed.setdefault(pattern, [0, 0])
+            observed[0] += 1
+            observed[1] += bool(duplicate)
+            groups = self.outlinks.setdefault(pattern, [])
+            if links:
+                for group in groups:
+                    common = len(links & group[0])
+                    if common >= self.outlink_similarity * (len(links) + len(group[0]) - common):
+                        group[1] += 1
+                        break
+                else:
+                    if len(groups) < self.REPRESENTATIVES:
+                        groups.append([links, 1])
+            if (pattern not in self.trapped and any(count >= self.same_outlinks for _, count in groups)
+                    and self._mostly_duplicates(pattern)):
+                self.trapped[pattern] = self.SAME_OUTLINKS
+    
+    def report(self):
+        """Zwraca [(wzorzec, powód, zablokowane)] posortowane malejąco"""
+        with self.lock:
+            rows = [(p, r, self.blocked.get(p, 0)) for p, r in self.trapped.items()]
+        return sorted(rows, key=lambda r: -r[2])
+    
+    def get_blocked(self):
+        with self.lock:
+            return sum(self.blocked.values())
+
+
+# ============================================================================
+# WZORCE NIE-HTML
+# ============================================================================
+class NonHTMLLearner:
+    """Uczy się wzorców URL, które zwracają nie-HTML lub trwale nie istnieją (404/410), i pomija je"""
+    NON_HTML = "Nie-HTML"
+    GONE = (404, 410)  # 429, 5xx i timeouty są przejściowe - nie świadczą o wzorcu
+    
+    def __init__(self, path="wzorce_nie_html.json", min_samples=5, threshold=0.9, probe=50, keep_ratio=0.5,
+                 max_saved=1000):
+        self.path = path
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.probe = probe
+        self.keep_ratio = keep_ratio    # zapisywane są tylko wzorce z takim udziałem nie-HTML (blisko progu)
+        self.max_saved = max_saved      # i najwyżej tyle - najczęściej nie-HTML
+        self.lock = Lock()
+        self.patterns = {}
+        self.matched = 0
+        self.skipped = 0
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.patterns = {p: list(c) for p, c in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"⚠️  Nie można wczytać {self.path}: {e}")
+    
+    def save(self):
+        """Zapisuje wzorce nie-HTML i bliskie progu; wzorce samych stron HTML nie trafiają do pliku"""
+        with self.lock:
+            candidates = [(p, c) for p, c in self.patterns.items() if c[0] and c[0] >= self.keep_ratio * sum(c)]
+        candidates.sort(key=lambda pc: -pc[1][0])
+        data = dict(candidates[:self.max_saved])
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️  Nie można zapisać {self.path}: {e}")
+    
+    def record(self, url, success, error=None, status=None):
+        """Zapisuje wynik pobrania URL-a"""
+        bad = not success and (status in self.GONE or error is not None and error.startswith(self.NON_HTML))
+        if not success and not bad:
+            return
+        pattern = TrapDetector.template(url)
+        with self.lock:
+            counts = self.patterns.setdefault(pattern, [0, 0])
+            counts[0 if bad else 1] += 1
+    
+    def _is_bad(self, pattern):
+        bad, good = self.patterns.get(pattern, (0, 0))
+        return bad >= self.min_samples and bad / (bad + good) >= self.threshold
+    
+    def filter(self, urls):
+        """Pomija URL-e pasujące do wyuczonych wzorców (co N-ty przepuszcza jako próbę)"""
+        allowed = []
+        with self.lock:
+            for url in urls:
+                if self._is_bad(TrapDetector.template(url)):
+                    self.matched += 1
+                    if self.matched % self.probe:
+                        self.skipped += 1
+                        continue
+                allowed.append(url)
+        return allowed
+    
+    def report(self):
+        """Zwraca [(wzorzec, nie-HTML/404, HTML)] dla wzorców uznanych za nie-HTML"""
+        with self.lock:
+            return sorted(((p, c[0], c[1]) for p, c in self.patterns.items() if self._is_bad(p)),
+                          key=lambda r: -r[1])
+
+
+# ============================================================================
+# PRAWIE-DUPLIKATY
+# ============================================================================
+class TemplateLines:
+    """Linie szablonu serwisu (menu, stopki, nagłówki) - powtarzające się na wielu pobranych stronach.
+    Odciski i ocena duplikatów liczone są z samej treści strony, bez szablonu"""
+    def __init__(self, min_pages=2, max_lines=200000, min_tokens=10):
+        self.min_pages = min_pages      # linia z tylu stron to szablon
+        self.max_lines = max_lines      # powyżej - zapominane linie widziane tylko raz
+        self.min_tokens = min_tokens    # mniej słów po usunięciu szablonu = strona bez własnej treści
+        self.lock = Lock()
+        self.counts = {}
+    
+    def strip(self, text):
+        """Zlicza linie strony i zwraca jej tekst bez linii szablonu"""
+        lines = text.split('\n')
+        keys = {hash(line) for line in lines if line.strip()}
+        with self.lock:
+            counts = self.counts
+            for key in keys:
+                counts[key] = counts.get(key, 0) + 1
+            if len(counts) > self.max_lines:
+                self.counts = counts = {k: c for k, c in counts.items() if c > 1}
+            common = {key for key in keys if counts.get(key, 0) >= self.min_pages}
+        return '\n'.join(line for line in lines if hash(line) not in common)
+    
+    def is_template_only(self, content):
+        """Strona bez własnej treści (np. pusty miesiąc kalendarza) - duplikat dla wykrywania pułapek"""
+        return len(content.split()) < self.min_tokens
+
+
+class SimHashIndex:
+    """Indeks odcisków SimHash (64 bity) do wykrywania prawie identycznych stron"""
+    BITS = 64
+    BANDS = 4
+    
+    def __init__(self, max_distance=3, shingle=3, min_tokens=10):
+        self.max_distance = max_distance
+        self.shingle = shingle
+        self.min_tokens = min_tokens
+        self.lock = Lock()
+        self.buckets = {}
+        self.band_bits = self.BITS // self.BANDS
+        self.band_mask = (1 << self.band_bits) - 1
+    
+    def fingerprint(self, text):
+        """Zwraca 64-bitowy SimHash tekstu lub None dla zbyt krótkich tekstów"""
+        tokens = text.lower().split()
+        if len(tokens) < self.min_tokens:
+            return None
+        
+        digests = [hashlib.blake2b(' '.join(tokens[i:i + self.shingle]).encode('utf-8'), digest_size=8).digest()
+                   for i in range(len(tokens) - self.shingle + 1)]
+        if np is not None:
+            # Bity wszystkich skrótów naraz: bit ustawiony, gdy jest jedynką w ponad połowie skrótów
+            bits = np.unpackbits(np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(len(digests), 8),
+                                 axis=1, bitorder='little')
+            majority = np.packbits(2 * bits.sum(axis=0, dtype=np.int64) > len(digests), bitorder='little')
+            return int.from_bytes(majority.tobytes(), 'little')
+        
+        weights = [0] * self.BITS
+        for digest in digests:
+            h = int.from_bytes(digest, 'little')
+            for bit in range(self.BITS):
+                weights[bit] += 1 if h >> bit & 1 else -1
+        
+        return sum(1 << bit for bit in range(self.BITS) if weights[bit] > 0)
+    
+    def _bands(self, fp):
+        return [(i, fp >> (i * self.band_bits) & self.band_mask) for i in range(self.BANDS)]
+    
+    def add(self, url, text):
+        """Dodaje stronę; zwraca URL prawie-duplikatu albo None, gdy strona jest nowa"""
+        fp = self.fingerprint(text)
+        if fp is None:
+            return None
+        
+        with self.lock:
+            bands = self._bands(fp)
+            # Przy max_distance < BANDS co najmniej jedno pasmo musi być identyczne
+            for band in bands:
+                for other_fp, other_url in self.buckets.get(band, ()):
+                    if bin(fp ^ other_fp).count('1') <= self.max_distance:
+                        return other_url
+            for band in bands:
+                self.buckets.setdefault(band, []).append((fp, url))
+        return None
+
+
+class IntMap:
+    """Słownik int64 -> wiersz w tablicach array (adresowanie otwarte, ~12 B na wpis zamiast ~100 B w dict)"""
+    def __init__(self, capacity=1024):
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        self.keys = array('q', bytes(8 * capacity))
+        self.rows = array('i', [-1]) * capacity
+        self.mask = capacity - 1
+        self.size = 0
+    
+    def _find(self, key):
+        i = key & self.mask
+        while self.rows[i] != -1 and self.keys[i] != key:
+            i = (i + 1) & self.mask
+        return i
+    
+    def get(self, key):
+        row = self.rows[self._find(key)]
+        return None if row == -1 else row
+    
+    def set(self, key, row):
+        if 2 * (self.size + 1) > len(self.rows):
+            self._grow()
+        i = self._find(key)
+        if self.rows[i] == -1:
+            self.size += 1
+            self.keys[i] = key
+        self.rows[i] = row
+    
+    def remove(self, key, row):
+        """Usuwa wpis, jeśli nadal wskazuje na row (przesunięcie wstecz - bez znaczników usunięcia)"""
+        i = self._find(key)
+        if self.rows[i] != row:
+            return
+        keys, rows, mask = self.keys, self.rows, self.mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            if rows[j] == -1:
+                break
+            home = keys[j] & mask
+            # Wpis j może zająć lukę i, gdy jego pozycja domowa nie leży cyklicznie w (i, j]
+            if (home <= i < j) or (i < j < home) or (j < home <= i):
+                keys[i], rows[i] = keys[j], rows[j]
+                i = j
+        rows[i] = -1
+        self.size -= 1
+    
+    def _grow(self):
+        keys, rows = self.keys, self.rows
+        self._allocate(2 * len(rows))
+        for key, row in zip(keys, rows):
+            if row != -1:
+                self.set(key, row)
+
+
+class MinHashIndex:
+    """MinHash + LSH dla akapitów - wykrywa prawie identyczne akapity w całym korpusie"""
+    PRIME = (1 << 61) - 1
+    NUMBERS = re.compile(r'\d+')
+    
+    def __init__(self, threshold=0.8, num_perm=64, shingle=3, min_tokens=4, max_signatures=200000, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.min_tokens = min_tokens
+        self.max_signatures = max_signatures
+        # h(x) = (a*x + b) mod 2^61-1; a, b < 2^31 i x < 2^32, więc a*x + b mieści się w uint64
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, 1 << 31), rng.randrange(1 << 31)) for _ in range(num_perm)]
+        if np is not None:
+            self.a = np.array([a for a, _ in self.params], dtype=np.uint64)[:, None]
+            self.b = np.array([b for _, b in self.params], dtype=np.uint64)[:, None]
+        self.bands, self.rows = self.choose_bands(num_perm, threshold)
+        # Kubełek pasma: skrót pasma -> wiersz sygnatury
+        self.buckets = [IntMap() for _ in range(self.bands)]
+        # Sygnatury ostatnich max_signatures akapitów w buforze cyklicznym uint64 (8 B na wartość);
+        # akapit n zajmuje wiersz n % max_signatures, najstarszy jest nadpisywany razem z kubełkami
+        self.signatures = array('Q')
+        self.next_id = 0
+    
+    @staticmethod
+    def choose_bands(num_perm, threshold):
+        """Zwraca (pasma, wiersze), dla których próg LSH (1/b)^(1/r) jest najbliższy threshold"""
+        options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+        return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+    
+    def signature(self, text):
+        """Sygnatura MinHash akapitu (array uint64) lub None dla zbyt krótkich (liczby i białe znaki są ujednolicane)"""
+        tokens = self.NUMBERS.sub('0', text.lower()).split()
+        if len(tokens) < self.min_tokens:
+            return None
+        shingles = {zlib.crc32(' '.join(tokens[i:i + self.shingle]).encode('utf-8'))
+                    for i in range(len(tokens) - self.shingle + 1)}
+        if np is not None:
+            x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+            sig = array('Q')
+            sig.frombytes(((self.a * x + self.b) % np.uint64(self.PRIME)).min(axis=1).tobytes())
+            return sig
+        return array('Q', (min((a * x + b) % self.PRIME for x in shingles) for a, b in self.params))
+    
+    def _band_keys(self, sig):
+        return [hash(sig[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+    
+    def _row(self, row):
+        return self.signatures[row * self.num_perm:(row + 1) * self.num_perm]
+    
+    def export(self):
+        """Zapamiętane sygnatury od najstarszej, sklejone w jedną array (do stanu deduplikacji przyrostowej)"""
+        count = min(self.next_id, self.max_signatures)
+        first = (self.next_id - count) % self.max_signatures if count else 0
+        width = self.num_perm
+        return self.signatures[first * width:count * width] + self.signatures[:first * width]
+    
+    def restore(self, signatures):
+        """Odtwarza indeks z zapisanych sygnatur (array sklejonych sygnatur, np. ze stanu przyrostowego)"""
+        width = self.num_perm
+        for i in range(max(0, len(signatures) // width - self.max_signatures), len(signatures) // width):
+            self._store(signatures[i * width:(i + 1) * width])
+    
+    def _store(self, sig, keys=None):
+        row = self.next_id % self.max_signatures
+        self.next_id += 1
+        width = self.num_perm
+        if self.next_id > self.max_signatures:
+            for band, key in enumerate(self._band_keys(self._row(row))):
+                self.buckets[band].remove(key, row)
+            self.signatures[row * width:(row + 1) * width] = sig
+        else:
+            self.signatures.extend(sig)
+        for band, key in enumerate(keys or self._band_keys(sig)):
+            self.buckets[band].set(key, row)
+    
+    def add(self, text):
+        """Zwraca True dla prawie-duplikatu wcześniejszego akapitu; nowy akapit jest zapamiętywany"""
+        sig = self.signature(text)
+        if sig is None:
+            return False
+        
+        keys = self._band_keys(sig)
+        for band, key in enumerate(keys):
+            row = self.buckets[band].get(key)
+            # Kandydat z LSH jest weryfikowany estymatą podobieństwa Jaccarda z sygnatur
+            if row is not None and sum(x == y for x, y in zip(sig, self._row(row))) >= self.threshold * len(sig):
+                return True
+        
+        self._store(sig, keys)
+        return False
+
+
+# ============================================================================
+# METRYKI
+# ============================================================================
+class LatencyHistogram:
+    """Histogram opóźnień w stylu HDR: kubełki log-liniowe w µs, błąd względny percentyla < 1/SUB"""
+    SUB_BITS = 5
+    SUB = 1 << SUB_BITS         # 32 kubełki na każdą potęgę dwójki
+    LINEAR = SUB * 2            # wartości < 64 µs mają własne kubełki
+    
+    def __init__(self):
+        self.counts = [0] * (self.LINEAR + self.SUB * 40)
+        self.total = 0
+    
+    @classmethod
+    def index(cls, micros):
+        if micros < cls.LINEAR:
+            return max(0, micros)
+        shift = micros.bit_length() - cls.SUB_BITS - 1
+        return cls.LINEAR + (shift - 1) * cls.SUB + (micros >> shift) - cls.SUB
+    
+    @classmethod
+    def value(cls, index):
+        """Środek kubełka w µs"""
+        if index < cls.LINEAR:
+            return index
+        shift = (index - cls.LINEAR) // cls.SUB + 1
+        top = (index - cls.LINEAR) % cls.SUB + cls.SUB
+        return (top << shift) + (1 << (shift - 1))
+    
+    def record(self, seconds):
+        self.counts[min(self.index(int(seconds * 1e6)), len(self.counts) - 1)] += 1
+        self.total += 1
+    
+    def percentiles(self, *ps):
+        """Percentyle w sekundach (0.0, gdy brak pomiarów)"""
+        if not self.total:
+            return [0.0] * len(ps)
+        targets = sorted((max(1, -(-p * self.total // 100)), i) for i, p in enumerate(ps))
+        result = [0.0] * len(ps)
+        seen = 0
+        t = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            while t < len(targets) and seen >= targets[t][0]:
+                result[targets[t][1]] = self.value(index) / 1e6
+                t += 1
+            if t == len(targets):
+                break
+        return result
+
+
+MetricsSnapshot = namedtuple('MetricsSnapshot', 'pages_per_s bytes_per_s in_flight fetch parse slow history')
+
+
+class Metrics:
+    """Metryki crawla na żywo: przepustowość (okno kroczące), żądania w toku, histogramy, najwolniejsze URL-e"""
+    WINDOW = 5          # s - okno dla stron/s i bajtów/s
+    HISTORY = 60        # s - długość wykresu przepustowości
+    SLOW = 5            # liczba najwolniejszych URL-i
+    SPARK = "▁▂▃▄▅▆▇█"
+    
+    def __init__(self):
+        self.lock = Lock()
+        self.fetch = LatencyHistogram()
+        self.parse = LatencyHistogram()
+        self.in_flight = 0
+        self.series = deque(maxlen=self.HISTORY + 1)    # [sekunda, strony, bajty]
+        self.slow = []                                  # kopiec (czas, url) najwolniejszych pobrań
+    
+    def start_fetch(self):
+        with self.lock:
+            self.in_flight += 1
+    
+    def end_fetch(self, url, elapsed, size):
+        second = int(time.monotonic())
+        with self.lock:
+            self.in_flight -= 1
+            self.fetch.record(elapsed)
+            if not self.series or self.series[-1][0] != second:
+                self.series.append([second, 0, 0])
+            bucket = self.series[-1]
+            bucket[1] += 1
+            bucket[2] += size
+            if len(self.slow) < self.SLOW:
+                heapq.heappush(self.slow, (elapsed, url))
+            elif elapsed > self.slow[0][0]:
+                heapq.heapreplace(self.slow, (elapsed, url))
+    
+    def record_parse(self, elapsed):
+        with self.lock:
+            self.parse.record(elapsed)
+    
+    def snapshot(self):
+        """Stan do wyświetlenia: przepustowość z pełnych sekund okna, percentyle p50/p95/p99, historia stron/s"""
+        now = int(time.monotonic())
+        with self.lock:
+            per_second = {second: (pages, size) for second, pages, size in self.series}
+            fetch = self.fetch.percentiles(50, 95, 99)
+            parse = self.parse.percentiles(50, 95, 99)
+            slow = sorted(self.slow, reverse=True)
+            in_flight = self.in_flight
+        window = [per_second.get(now - i, (0, 0)) for i in range(1, self.WINDOW + 1)]
+        history = [per_second.get(second, (0, 0))[0] for second in range(now - self.HISTORY, now)]
+        return MetricsSnapshot(sum(p for p, _ in window) / self.WINDOW, sum(b for _, b in window) / self.WINDOW,
+                               in_flight, fetch, parse, slow, history)
+    
+    @classmethod
+    def sparkline(cls, values):
+        top = max(values, default=0)
+        if not top:
+            return cls.SPARK[0] * len(values)
+        return ''.join(cls.SPARK[v * (len(cls.SPARK) - 1) // top] for v in values)
+
+
+# ============================================================================
+# HTTP CLIENT
+# ============================================================================
+FetchResult = namedtuple('FetchResult', 'success content error final_url status size elapsed body headers',
+                         defaults=(None, None))
+
+
+class HTTPClient:
+    """Pobiera strony"""
+    def __init__(self, config, stop_event=None, metrics=None):
+        self.config = config
+        self.stop_event = stop_event
+        self.metrics = metrics
+        self.first = True
+        self.first_lock = Lock()    # fetch() wołany równolegle z wątków crawlera
+    
+    @staticmethod
+    def content_hash(body):
+        """Szybki 128-bitowy skrót surowych bajtów odpowiedzi (xxhash, gdy dostępny; inaczej blake2b)"""
+        if xxhash:
+            return xxhash.xxh3_128_digest(body)
+        return hashlib.blake2b(body, digest_size=16).digest()
+    
+    def fetch(self, url):
+        """Zwraca FetchResult(success, content, error, final_url, status, size, elapsed, body, headers)"""
+        if self.stop_event and self.stop_event.is_set():
+            return FetchResult(False, None, "Przerwano przez użytkownika", url, None, 0, 0.0)
+        
+        # Pierwsze żądanie bez czekania - opóźnienie dzieli kolejne żądania, a nie start programu
+        with self.first_lock:
+            first, self.first = self.first, False
+        if not first:
+            time.sleep(self.config.delay)
+        
+        if self.metrics is None:
+            return self._get(url)
+        self.metrics.start_fetch()
+        result = None
+        try:
+            result = self._get(url)
+        finally:
+            self.metrics.end_fetch(url, result.elapsed if result else 0.0, result.size if result else 0)
+        return result
+    
+    def _get(self, url):
+        t0 = time.perf_counter()
+        try:
+            r = requests.get(url, timeout=15, headers=self.config.headers)
+            elapsed = time.perf_counter() - t0
+            r.raise_for_status()
+            
+            content_type = r.headers.get('Content-Type', '')
+            if 'text/html' not in content_type:
+                return FetchResult(False, None, f"Nie-HTML (Content-Type: {content_type})",
+                                   r.url, r.status_code, len(r.content), elapsed)
+            
+            return FetchResult(True, r.text, None, r.url, r.status_code, len(r.content), elapsed,
+                               r.content, dict(r.headers))
+        except requests.exceptions.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            return FetchResult(False, None, f"{type(e).__name__}: {e}", url, status, 0,
+                               time.perf_counter() - t0)
+
+
+# ============================================================================
+# KOMPRESJA
+# ============================================================================
+class Compression:
+    """Strumieniowe otwieranie plików tekstowych z kompresją gzip/zstd"""
+    METHODS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+    DEFAULT_LEVEL = {'gzip': 6, 'zstd': 3}
+    BUFFER = 1024 * 1024
+    
+    @classmethod
+    def path(cls, filename, method='none'):
+        """Zwraca nazwę pliku z rozszerzeniem metody kompresji"""
+        return filename + cls.METHODS[method]
+    
+    @classmethod
+    def check(cls, method):
+        if method not in cls.METHODS:
+            raise ValueError(f"Nieznana kompresja: {method}")
+        if method == 'zstd' and zstandard is None:
+            raise ValueError("Kompresja zstd wymaga pakietu 'zstandard'")
+    
+    @classmethod
+    def open_write(cls, path, method='none', level=None, binary=False):
+        """Otwiera plik do zapisu (tekst UTF-8 lub bajty, bufor 1 MB przed kompresorem)"""
+        cls.check(method)
+        if method == 'none':
+            if binary:
+                return open(path, 'wb', buffering=cls.BUFFER)
+            return open(path, 'w', encoding='utf-8', buffering=cls.BUFFER)
+        level = cls.DEFAULT_LEVEL[method] if level is None else level
+        if method == 'gzip':
+            raw = gzip.GzipFile(path, 'wb', compresslevel=level)
+        else:
+            raw = zstandard.ZstdCompressor(level=level).stream_writer(open(path, 'wb'))
+        f = io.BufferedWriter(raw, cls.BUFFER)
+        return f if binary else io.TextIOWrapper(f, encoding='utf-8')
+    
+    @staticmethod
+    def flush(f):
+        """Opróżnia bufor i kompresor (BufferedWriter.flush nie woła raw.flush)"""
+        f.flush()
+        raw = getattr(f, 'raw', None) or getattr(getattr(f, 'buffer', None), 'raw', None)
+        if raw is not None:
+            raw.flush()
+    
+    @classmethod
+    def is_compressed(cls, path):
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+        return magic[:2] == b'\x1f\x8b' or magic == b'\x28\xb5\x2f\xfd'
+    
+    @classmethod
+    def open_read(cls, path, binary=False):
+        """Otwiera plik (tekst UTF-8 lub bajty) do odczytu, rozpoznając kompresję po nagłówku"""
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+        if magic[:2] == b'\x1f\x8b':
+            return gzip.open(path, 'rb') if binary else gzip.open(path, 'rt', encoding='utf-8')
+        if magic == b'\x28\xb5\x2f\xfd':
+            cls.check('zstd')
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+            f = io.BufferedReader(raw, cls.BUFFER)
+            return f if binary else io.TextIOWrapper(f, encoding='utf-8')
+        if binary:
+            return open(path, 'rb', buffering=cls.BUFFER)
+        return open(path, 'r', encoding='utf-8')
+
+
+# ============================================================================
+# KONTENER REKORDÓW
+# ============================================================================
+class RecordFormat:
+    """Kontener .rec: nagłówek (magic, wersja) + rekordy [dł. URL, dł. tekstu, CRC32] URL tekst
+
+    Długości zamiast separatorów - treść może zawierać dowolne znaki (także "_" * 80)."""
+    MAGIC = b'WCRF'
+    VERSION = 1
+    HEADER = struct.Struct('<4sB3x')
+    RECORD = struct.Struct('<III')
+    EXT = ".rec"
+    
+    @classmethod
+    def is_container(cls, path):
+        try:
+            with Compression.open_read(path, binary=True) as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except (OSError, EOFError, ValueError):
+            return False
+    
+    @classmethod
+    def from_text(cls, src, dst, compression='none', level=None):
+        """Konwertuje teksty.txt (separatory, także shardy z manifestu) do kontenera; zwraca liczbę rekordów"""
+        count = 0
+        with RecordWriter(Compression.open_write(dst, compression, level, binary=True)) as writer:
+            for section in Deduplicator(src, None)._sections():
+                # Sekcja: ["\n\n"]URL"\n\n"tekst"\n\n" - jak zapisuje Storage
+                if section.startswith('\n\n'):
+                    section = section[2:]
+                url, _, text = section.partition('\n\n')
+                writer.write(url, text[:-2] if text.endswith('\n\n') else text)
+                count += 1
+        return count
+    
+    @classmethod
+    def to_text(cls, src, dst, deduplicated=False):
+        """Konwertuje kontener do tekstu; zwraca liczbę rekordów
+
+        deduplicated=False - układ teksty.txt (URL, tekst, separator Storage);
+        True - układ teksty_unikalne.txt z Deduplicatora (Deduplicator.SEP_OUT między sekcjami)"""
+        count = 0
+        prev = None
+        with RecordReader(src) as reader, open(dst, 'wb', buffering=Compression.BUFFER) as f:
+            for url, text in reader:
+                if not deduplicated:
+                    f.write(url.encode('utf-8') + b"\n\n" + text.encode('utf-8') + Storage.TAIL)
+                    count += 1
+                    continue
+                # Jak _dedupe_section(): pusta linia zostaje raz na sekcję - w pierwszej za URL,
+                # w kolejnych przed nim ("\n\n" za separatorem)
+                lines = ['', url] if count else [url, '']
+                section = '\n'.join(lines + [text] if text else lines)
+                if prev is not None:
+                    f.write((('' if prev.endswith('\n') else '\n') + Deduplicator.SEP_OUT + '\n').encode('utf-8'))
+                f.write(section.encode('utf-8'))
+                prev = section
+                count += 1
+        return count
+
+
+class RecordWriter:
+    """Strumieniowy zapis rekordów kontenera do otwartego pliku binarnego (także przez kompresor)"""
+    def __init__(self, f, header=True):
+        self.f = f
+        self.offset = f.write(RecordFormat.HEADER.pack(RecordFormat.MAGIC, RecordFormat.VERSION)) if header else 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def write(self, url, text):
+        """Dopisuje rekord (str lub już zakodowane bajty); zwraca liczbę zapisanych bajtów"""
+        url = url.encode('utf-8') if isinstance(url, str) else url
+        text = text.encode('utf-8') if isinstance(text, str) else text
+        n = self.f.write(RecordFormat.RECORD.pack(len(url), len(text), zlib.crc32(text, zlib.crc32(url))))
+        n += self.f.write(url)
+        n += self.f.write(text)
+        self.offset += n
+        return n
+    
+    def close(self):
+        self.f.close()
+
+
+class RecordReader:
+    """Strumieniowy odczyt kontenera: (url, tekst) z kontrolą CRC32; ucięty ostatni rekord kończy odczyt"""
+    def __init__(self, path, start=0):
+        self.path = path
+        self.compressed = Compression.is_compressed(path)
+        self.f = Compression.open_read(path, binary=True)
+        header = self.f.read(RecordFormat.HEADER.size)
+        if len(header) < RecordFormat.HEADER.size:
+            raise ValueError(f"{path}: brak nagłówka kontenera")
+        magic, version = RecordFormat.HEADER.unpack(header)
+        if magic != RecordFormat.MAGIC:
+            raise ValueError(f"{path}: to nie jest kontener {RecordFormat.EXT}")
+        if version > RecordFormat.VERSION:
+            raise ValueError(f"{path}: nieobsługiwana wersja kontenera {version}")
+        self.offset = RecordFormat.HEADER.size   # koniec ostatniego kompletnego rekordu
+        if start > self.offset:
+            self.f.seek(start)
+            self.offset = start
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __iter__(self):
+        size = RecordFormat.RECORD.size
+        while True:
+            head = self.f.read(size)
+            if len(head) < size:
+                return
+            url_len, text_len, crc = RecordFormat.RECORD.unpack(head)
+            body = self.f.read(url_len + text_len)
+            if len(body) < url_len + text_len:
+                return
+            if zlib.crc32(body) != crc:
+                raise ValueError(f"{self.path}: uszkodzony rekord (CRC) na pozycji {self.offset}")
+            self.offset += size + url_len + text_len
+            yield body[:url_len].decode('utf-8'), body[url_len:].decode('utf-8')
+    
+    def read_at(self, offset):
+        """Odczytuje jeden rekord zaczynający się pod offsetem (np. z indeksu .idx)"""
+        if not self.compressed:
+            # pread czyta tylko bajty rekordu - seek w buforze 1 MB wczytywałby cały blok
+            fd = self.f.fileno()
+            head = os.pread(fd, RecordFormat.RECORD.size, offset)
+            if len(head) < RecordFormat.RECORD.size:
+                return None
+            url_len, text_len, crc = RecordFormat.RECORD.unpack(head)
+            body = os.pread(fd, url_len + text_len, offset + len(head))
+            if len(body) < url_len + text_len:
+                return None
+            if zlib.crc32(body) != crc:
+                raise ValueError(f"{self.path}: uszkodzony rekord (CRC) na pozycji {offset}")
+            return body[:url_len].decode('utf-8'), body[url_len:].decode('utf-8')
+        self.f.seek(offset)
+        self.offset = offset
+        return next(iter(self), None)
+    
+    def close(self):
+        self.f.close()
+
+
+# ============================================================================
+# INDEKS OFFSETÓW
+# ============================================================================
+class PageIndex:
+    """Indeks teksty.txt.idx: wpisy (hash URL, offset rekordu, dł. URL, dł. tekstu) w bajtach"""
+    ENTRY = struct.Struct('<QQII')
+    
+    @staticmethod
+    def url_hash(url):
+        return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+    
+    @classmethod
+    def path(cls, texts_path):
+        return texts_path + ".idx"
+    
+    @classmethod
+    def pack(cls, url, offset, url_len, text_len):
+        return cls.ENTRY.pack(cls.url_hash(url), offset, url_len, text_len)
+
+
+class PageReader:
+    """Odczyt stron z teksty.txt przez mmap i indeks offsetów (tylko plik bez kompresji)"""
+    def __init__(self, path="teksty.txt", index_path=None):
+        self.path = path
+        self.index_path = index_path or PageIndex.path(path)
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        # Ucięty ostatni wpis (indeks czytany w trakcie crawlingu) jest pomijany
+        data = data[:len(data) - len(data) % PageIndex.ENTRY.size]
+        self.entries = sorted(PageIndex.ENTRY.iter_unpack(data), key=lambda e: e[1])
+        self.offsets = [e[1] for e in self.entries]
+        self.by_hash = {e[0]: e for e in self.entries}
+        self.f = open(path, 'rb')
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b''
+        # Układ rekordu: teksty.txt - URL "\n\n" tekst TAIL; kontener - nagłówek rekordu, URL, tekst
+        self.container = self.mm[:len(RecordFormat.MAGIC)] == RecordFormat.MAGIC
+        self.lead, self.gap, self.tail = (RecordFormat.RECORD.size, 0, 0) if self.container else (0, 2, len(Storage.TAIL))
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self.f.close()
+    
+    def _read(self, entry):
+        _, offset, url_len, text_len = entry
+        offset += self.lead
+        url = self.mm[offset:offset + url_len].decode('utf-8')
+        start = offset + url_len + self.gap
+        return url, self.mm[start:start + text_len].decode('utf-8')
+    
+    def get(self, url):
+        """Zwraca tekst strony w O(1) lub None, gdy URL nie ma w indeksie"""
+        entry = self.by_hash.get(PageIndex.url_hash(url))
+        if entry is None:
+            return None
+        found, text = self._read(entry)
+        return text if found == url else None
+    
+    def is_complete(self):
+        """Sprawdza, czy indeks opisuje cały plik (a nie np. poprzedni crawling)"""
+        first = RecordFormat.HEADER.size if self.container else 0
+        if not self.entries:
+            return len(self.mm) == first
+        _, offset, url_len, text_len = self.entries[-1]
+        return (self.offsets[0] == first
+                and offset + self.lead + url_len + self.gap + text_len + self.tail == len(self.mm))
+    
+    def ranges(self, parts):
+        """Dzieli plik na <= parts zakresów bajtów wyrównanych do granic rekordów"""
+        if not self.entries:
+            return []
+        step = max(1, -(-len(self.entries) // parts))
+        bounds = self.offsets[::step] + [len(self.mm)]
+        return list(zip(bounds[:-1], bounds[1:]))
+    
+    def pages(self, start=0, end=None):
+        """Iteruje (url, tekst) rekordów zaczynających się w zakresie [start, end)"""
+        end = len(self.mm) if end is None else end
+        i = bisect.bisect_left(self.offsets, start)
+        while i < len(self.entries) and self.offsets[i] < end:
+            yield self._read(self.entries[i])
+            i += 1
+
+
+# ============================================================================
+# SHARDY
+# ============================================================================
+class ShardManifest:
+    """Manifest shardów teksty-NNNNN.txt: jeden wpis JSON na linię, dopisywany po zamknięciu shardu"""
+    NAME = "teksty.manifest.jsonl"
+    
+    @staticmethod
+    def is_manifest(path):
+        return path.endswith(ShardManifest.NAME)
+    
+    @staticmethod
+    def checksum(path):
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(Compression.BUFFER), b''):
+                h.update(chunk)
+        return h.hexdigest()
+    
+    @classmethod
+    def append(cls, path, shard, records, size):
+        entry = {'shard': os.path.basename(shard), 'records': records, 'bytes': size,
+                 'checksum': cls.checksum(shard)}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+    
+    @staticmethod
+    def read(path):
+        """Zwraca wpisy zakończonych shardów (można czytać w trakcie crawlingu)"""
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n'):
+                    entries.append(json.loads(line))
+        return entries
+    
+    @classmethod
+    def files(cls, path):
+        """Zwraca ścieżki plików z tekstami: shardy z manifestu albo [path]"""
+        if not cls.is_manifest(path):
+            return [path]
+        base = os.path.dirname(path)
+        return [os.path.join(base, e['shard']) for e in cls.read(path)]
+    
+    @classmethod
+    def verify(cls, path):
+        """Zwraca listę shardów, których rozmiar lub suma kontrolna nie zgadza się z manifestem"""
+        base = os.path.dirname(path)
+        bad = []
+        for e in cls.read(path):
+            shard = os.path.join(base, e['shard'])
+            if (not os.path.exists(shard) or os.path.getsize(shard) != e['bytes']
+                    or cls.checksum(shard) != e['checksum']):
+                bad.append(e['shard'])
+        return bad
+
+
+# ============================================================================
+# REKORDY (JSONL / SQLite / Parquet)
+# ============================================================================
+class RecordSink:
+    """Bazowy zapis ustrukturyzowanych rekordów stron (wywoływany z wątku zapisującego)"""
+    FIELDS = ('url', 'final_url', 'status', 'bytes', 'fetch_ms', 'parse_ms', 'content_hash', 'text')
+    FORMATS = {}
+    
+    @classmethod
+    def create(cls, fmt, compression='none', level=None):
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Nieznany format rekordów: {fmt}")
+        return cls.FORMATS[fmt](compression, level)
+    
+    def write(self, records):
+        raise NotImplementedError
+    
+    def flush(self, fsync=False):
+        pass
+    
+    def close(self):
+        pass
+
+
+class JSONLSink(RecordSink):
+    """Jeden rekord JSON na linię (strony.jsonl[.gz|.zst])"""
+    def __init__(self, compression='none', level=None):
+        self.path = Compression.path("strony.jsonl", compression)
+        self.f = Compression.open_write(self.path, compression, level)
+    
+    def write(self, records):
+        for rec in records:
+            self.f.write(json.dumps(rec, ensure_ascii=False))
+            self.f.write('\n')
+    
+    def flush(self, fsync=False):
+        Compression.flush(self.f)
+        if fsync:
+            os.fsync(self.f.fileno())
+    
+    def close(self):
+        self.f.close()
+
+
+class SQLiteSink(RecordSink):
+    """Tabela 'strony' w strony.sqlite (jedna transakcja na paczkę rekordów)"""
+    def __init__(self, compression='none', level=None):
+        self.path = "strony.sqlite"
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        # Połączenie tworzone w wątku crawlera, używane wyłącznie przez wątek zapisujący
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE strony (url TEXT, final_url TEXT, status INTEGER, bytes INTEGER, "
+                        "fetch_ms REAL, parse_ms REAL, content_hash TEXT, text TEXT)")
+        self.db.execute("CREATE INDEX strony_url ON strony (url)")
+        self.db.execute("CREATE INDEX strony_hash ON strony (content_hash)")
+        self.insert = f"INSERT INTO strony VALUES ({', '.join('?' * len(self.FIELDS))})"
+    
+    def write(self, records):
+        with self.db:
+            self.db.executemany(self.insert, ([rec[k] for k in self.FIELDS] for rec in records))
+    
+    def close(self):
+        self.db.close()
+
+
+class ParquetSink(RecordSink):
+    """Kolumnowy strony.parquet - wiersze buforowane w grupy po ROW_GROUP"""
+    ROW_GROUP = 10000
+    
+    def __init__(self, compression='none', level=None):
+        if pyarrow is None:
+            raise ValueError("Format parquet wymaga pakietu 'pyarrow'")
+        self.path = "strony.parquet"
+        self.schema = pyarrow.schema([
+            ('url', pyarrow.string()), ('final_url', pyarrow.string()), ('status', pyarrow.int32()),
+            ('bytes', pyarrow.int64()), ('fetch_ms', pyarrow.float64()), ('parse_ms', pyarrow.float64()),
+            ('content_hash', pyarrow.string()), ('text', pyarrow.string()),
+        ])
+        codec = 'snappy' if compression == 'none' else compression
+        self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema, compression=codec,
+                                                    compression_level=level)
+        self.rows = []
+    
+    def write(self, records):
+        self.rows.extend(records)
+        if len(self.rows) >= self.ROW_GROUP:
+            self._write_rows()
+    
+    def _write_rows(self):
+        if self.rows:
+            self.writer.write_table(pyarrow.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+    
+    def close(self):
+        self._write_rows()
+        self.writer.close()
+
+
+RecordSink.FORMATS = {'jsonl': JSONLSink, 'sqlite': SQLiteSink, 'parquet': ParquetSink}
+
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+class Storage:
+    """Zapisuje pliki (w tle, przez wątek zapisujący z kolejką)"""
+    SEP = "_" * 80
+    TAIL = f"\n\n{SEP}\n\n".encode('utf-8')
+    DURABILITY = ('none', 'periodic', 'fsync')
+    TEXTS_FORMATS = ('txt', 'rec')
+    _STOP = object()
+    
+    def __init__(self, durability='periodic', flush_interval=1.0, queue_size=1000, batch_size=256,
+                 compression='none', level=None, record_format=None, shard_bytes=None, shard_records=None,
+                 dedupe=False, boilerplate=None, near_duplicates=None, texts_format='txt'):
+        if durability not in self.DURABILITY:
+            raise ValueError(f"Nieznany tryb trwałości: {durability}")
+        Compression.check(compression)
+        self.sink = RecordSink.create(record_format, compression, level) if record_format else None
+        self.compression = compression
+        self.level = level
+        self.shard_bytes = shard_bytes
+        self.shard_records = shard_records
+        self.sharded = bool(shard_bytes or shard_records)
+        self.shard_no = 0
+        self.shard_count = 0
+        if texts_format not in self.TEXTS_FORMATS:
+            raise ValueError(f"Nieznany format tekstów: {texts_format}")
+        # 'rec' - kontener z prefiksem długości (RecordFormat) zamiast separatorów
+        self.container = texts_format == 'rec'
+        self.ext = RecordFormat.EXT if self.container else ".txt"
+        # Przy shardach texts_path wskazuje manifest (ShardManifest.files() zwraca listę shardów)
+        self.texts_path = ShardManifest.NAME if self.sharded else Compression.path("teksty" + self.ext, compression)
+        self.links_path = Compression.path("all_links.txt", compression)
+        self.errors_path = Compression.path("error_links.txt", compression)
+        self.unique_path = "teksty_unikalne" + self.ext if dedupe else None
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.lock = Lock()
+        self.closed = False
+        self.failed = []
+        self.records = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+        self.wait_time = 0.0
+        if self.sharded and os.path.exists(self.texts_path):
+            os.remove(self.texts_path)
+        self.links_f = Compression.open_write(self.links_path, compression, level)
+        self._open_texts()
+        # Deduplikacja jako etap zapisu - działa w wątku zapisującym, bez ponownego czytania teksty.txt
+        self.dedup = Deduplicator(None, self.unique_path, boilerplate,
+                                  near_duplicates=near_duplicates) if dedupe else None
+        if self.dedup:
+            self.dedup.open()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writer = threading.Thread(target=self._writer, name="storage-writer", daemon=True)
+        self.writer.start()
+    
+    def save_page(self, url, text, final_url=None, status=None, size=None, fetch_ms=None, parse_ms=None,
+                  content_hash=None):
+        """Przekazuje stronę do wątku zapisującego (blokuje tylko przy pełnej kolejce)"""
+        if self.closed:
+            return False
+        record = {'url': url, 'final_url': final_url or url, 'status': status, 'bytes': size,
+                  'fetch_ms': fetch_ms, 'parse_ms': parse_ms, 'content_hash': content_hash, 'text': text}
+        t0 = time.perf_counter()
+        self.queue.put(record)
+        waited = time.perf_counter() - t0
+        with self.lock:
+            self.wait_time += waited
+        return True
+    
+    def _open_texts(self):
+        if self.sharded:
+            self.shard_path = Compression.path(f"teksty-{self.shard_no:05d}{self.ext}", self.compression)
+        else:
+            self.shard_path = self.texts_path
+        self.texts_f = Compression.open_write(self.shard_path, self.compression, self.level, binary=True)
+        self.records_w = RecordWriter(self.texts_f) if self.container else None
+        # Offsety indeksu odnoszą się do nieskompresowanego strumienia - mmap tylko bez kompresji
+        self.index_path = PageIndex.path(self.shard_path) if self.compression == 'none' else None
+        self.index_f = open(self.index_path, 'wb', buffering=Compression.BUFFER) if self.index_path else None
+        self.offset = self.records_w.offset if self.records_w else 0
+        self.shard_count = 0
+    
+    def _close_texts(self):
+        if self.durability == 'fsync':
+            Compression.flush(self.texts_f)
+            os.fsync(self.texts_f.fileno())
+        self.texts_f.close()
+        if self.index_f:
+            self.index_f.close()
+        if not self.sharded:
+            return
+        if self.shard_count or self.shard_no == 0:
+            ShardManifest.append(self.texts_path, self.shard_path, self.shard_count,
+                                 os.path.getsize(self.shard_path))
+        else:
+            # Pusty shard otwarty tuż przed zamknięciem
+            for path in (self.shard_path, self.index_path):
+                if path:
+                    os.remove(path)
+    
+    def _rotate(self):
+        """Zamyka bieżący shard (wpis w manifeście) i otwiera kolejny"""
+        self._close_texts()
+        self.shard_no += 1
+        self._open_texts()
+    
+    def _writer(self):
+        last_flush = time.monotonic()
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+            if stop or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush(final=stop)
+                last_flush = time.monotonic()
+            if stop:
+                return
+    
+    def _next_batch(self):
+        """Zwraca (rekordy[], stop) - czeka najwyżej flush_interval na pierwszy rekord"""
+        batch = []
+        try:
+            item = self.queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return batch, False
+        while True:
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+    
+    def _write_batch(self, batch):
+        t0 = time.perf_counter()
+        try:
+            written = 0
+            # Pojedyncze write() do dużego bufora są tańsze niż sklejanie całej paczki
+            for rec in batch:
+                url = rec['final_url'].encode('utf-8')
+                text = rec['text'].encode('utf-8')
+                if self.index_f:
+                    self.index_f.write(PageIndex.pack(rec['final_url'], self.offset, len(url), len(text)))
+                if self.dedup:
+                    self.dedup.add_page(rec['final_url'], rec['text'])
+                if self.records_w:
+                    n = self.records_w.write(url, text)
+                else:
+                    n = self.texts_f.write(url + b"\n\n")
+                    n += self.texts_f.write(text)
+                    n += self.texts_f.write(self.TAIL)
+                self.offset += n
+                self.shard_count += 1
+                written += n
+                if self.sharded and ((self.shard_bytes and self.offset >= self.shard_bytes)
+                                     or (self.shard_records and self.shard_count >= self.shard_records)):
+                    self._rotate()
+            written += self.links_f.write(''.join(f"{rec['final_url']}\n" for rec in batch))
+            if self.sink:
+                self.sink.write(batch)
+            with self.lock:
+                self.records += len(batch)
+                self.bytes_written += written
+        except Exception as e:
+            print(f"   ⚠️  Błąd zapisu: {e}")
+            with self.lock:
+                self.failed.extend(rec['url'] for rec in batch)
+        with self.lock:
+            self.write_time += time.perf_counter() - t0
+    
+    def _flush(self, final=False):
+        """none: tylko przy zamknięciu; periodic: flush co flush_interval; fsync: flush + fsync (checkpoint)"""
+        if self.durability == 'none' and not final:
+            return
+        t0 = time.perf_counter()
+        try:
+            for f in (self.texts_f, self.links_f, self.index_f, self.dedup and self.dedup.f):
+                if f is None:
+                    continue
+                Compression.flush(f)
+                if self.durability == 'fsync':
+                    os.fsync(f.fileno())
+            if self.sink:
+                self.sink.flush(fsync=self.durability == 'fsync')
+        except Exception as e:
+            print(f"   ⚠️  Błąd zapisu: {e}")
+        with self.lock:
+            self.write_time += time.perf_counter() - t0
+    
+    def get_write_stats(self):
+        """Zwraca (rekordy, MB/s zapisu, czas oczekiwania wątków w s)"""
+        with self.lock:
+            rate = self.bytes_written / (1024 * 1024) / self.write_time if self.write_time else 0.0
+            return self.records, rate, self.wait_time
+    
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(self._STOP)
+        self.writer.join()
+        self._close_texts()
+        self.links_f.close()
+        if self.dedup:
+            self.dedup.close()
+        if self.sink:
+            self.sink.close()
+    
+    def get_file_size_mb(self, filename):
+        try:
+            return os.path.getsize(filename) / (1024 * 1024)
+        except:
+            return 0
+
+
+# ============================================================================
+# ARCHIWUM WARC
+# ============================================================================
+class WarcWriter:
+    """Zapisuje surowe odpowiedzi HTML do archiwum.warc.gz (identyczne treści jako 'revisit')"""
+    REVISIT = "http://netpreserve.org/warc/1.1/revisit/identical-payload-digest"
+    DROP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+    
+    def __init__(self, path="archiwum.warc.gz"):
+        self.path = path
+        self.lock = Lock()
+        self.digests = {}
+        self.responses = 0
+        self.revisits = 0
+        self.f = open(path, 'wb', buffering=Compression.BUFFER)
+    
+    @staticmethod
+    def payload_digest(body):
+        return "sha1:" + base64.b32encode(hashlib.sha1(body).digest()).decode('ascii')
+    
+    def _http_headers(self, status, headers, length):
+        # requests rozpakowuje treść, więc nagłówki kodowania transferu są usuwane
+        lines = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}"]
+        lines += [f"{k}: {v}" for k, v in headers.items() if k.lower() not in self.DROP_HEADERS]
+        lines.append(f"Content-Length: {length}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8')
+    
+    def _record(self, fields, block):
+        head = ['WARC/1.1'] + [f"{k}: {v}" for k, v in fields.items()] + [f"Content-Length: {len(block)}"]
+        data = ('\r\n'.join(head) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+        # Każdy rekord to osobny człon gzip - można go odczytać bez rozpakowywania poprzednich
+        return gzip.compress(data, compresslevel=6)
+    
+    def write(self, url, status, headers, body):
+        """Dopisuje odpowiedź; treść już zarchiwizowana zapisywana jest tylko jako odwołanie"""
+        digest = self.payload_digest(body)
+        date = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        http = self._http_headers(status, headers, len(body))
+        fields = {'WARC-Type': 'response', 'WARC-Record-ID': f"<urn:uuid:{uuid.uuid4()}>",
+                  'WARC-Date': date, 'WARC-Target-URI': url, 'WARC-Payload-Digest': digest,
+                  'Content-Type': 'application/http;msgtype=response'}
+        with self.lock:
+            original = self.digests.get(digest)
+            if original is None:
+                self.digests[digest] = (url, date)
+                self.responses += 1
+        
+        if original is None:
+            data = self._record(fields, http + body)
+        else:
+            fields.update({'WARC-Type': 'revisit', 'WARC-Profile': self.REVISIT,
+                           'WARC-Refers-To-Target-URI': original[0], 'WARC-Refers-To-Date': original[1]})
+            data = self._record(fields, http)
+        
+        with self.lock:
+            if original is not None:
+                self.revisits += 1
+            self.f.write(data)
+    
+    def close(self):
+        with self.lock:
+            self.f.close()
+
+
+class WarcReader:
+    """Sekwencyjny odczyt rekordów z pliku .warc / .warc.gz"""
+    def __init__(self, path):
+        self.path = path
+    
+    def records(self):
+        """Iteruje (nagłówki WARC: dict, blok: bytes)"""
+        opener = gzip.open if self.path.endswith('.gz') else open
+        with opener(self.path, 'rb') as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    return
+                if not line.strip():
+                    continue
+                fields = {}
+                for line in iter(f.readline, b'\r\n'):
+                    if not line:
+                        return
+                    key, _, value = line.decode('utf-8').partition(':')
+                    fields[key.strip()] = value.strip()
+                block = f.read(int(fields.get('Content-Length', 0)))
+                f.read(4)
+                yield fields, block
+    
+    def responses(self):
+        """Iteruje (url, nagłówki HTTP: dict, treść: bytes) rekordów typu 'response'"""
+        for fields, block in self.records():
+            if fields.get('WARC-Type') != 'response':
+                continue
+            head, _, body = block.partition(b'\r\n\r\n')
+            headers = {}
+            for line in head.decode('iso-8859-1').split('\r\n')[1:]:
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+            yield fields.get('WARC-Target-URI'), headers, body
+    
+    def reextract(self, workers=None, chunk=64):
+        """Ponownie ekstrahuje teksty z archiwum do teksty.txt (bez sieci, w puli procesów)"""
+        storage = Storage()
+        pages = 0
+        start = time.time()
+        try:
+            # Ograniczone okno zadań - archiwum nie jest wczytywane do pamięci w całości
+            pending = []
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                window = 2 * (workers or os.cpu_count() or 1)
+                for items in self._chunks(chunk):
+                    pending.append(pool.submit(_extract_chunk, items))
+                    if len(pending) >= window:
+                        pages += self._save(storage, pending.pop(0).result())
+                for future in pending:
+                    pages += self._save(storage, future.result())
+        finally:
+            storage.close()
+        elapsed = time.time() - start
+        print(f"♻️  Ponowna ekstrakcja: {pages} stron w {elapsed:.2f}s "
+              f"({pages / elapsed if elapsed else 0:.1f} stron/s) -> {storage.texts_path}")
+        return pages
+    
+    @staticmethod
+    def _save(storage, results):
+        for url, text in results:
+            storage.save_page(url, text)
+        return len(results)
+    
+    def _chunks(self, size):
+        chunk = []
+        for url, headers, body in self.responses():
+            chunk.append((url, headers.get('content-type', ''), body))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _extract_chunk(items):
+    """Zadanie dla puli procesów: [(url, content-type, body)] -> [(url, tekst)]"""
+    results = []
+    for url, content_type, body in items:
+        _, _, charset = content_type.partition('charset=')
+        html = body.decode(charset.split(';')[0].strip() or 'utf-8', errors='replace') if charset else body
+        parser = HTMLParser(DomainManager(url))
+        results.append((url, parser._extract_text(bs4.BeautifulSoup(html, 'html.parser'))))
+    return results
+
+
+# ============================================================================
+# LOG BŁĘDÓW
+# ============================================================================
+class ErrorLog:
+    """Strumieniowy, agregowany log błędów o ograniczonej pamięci"""
+    OTHER = "<inne>"
+    LINK_ERRORS = ("Niepoprawny URL", "Błąd parsowania linku")
+    
+    def __init__(self, path=None, compression='none', level=None, per_key=3, max_keys=10000):
+        self.path = path
+        self.compression = compression
+        self.level = level
+        self.per_key = per_key
+        self.max_keys = max_keys
+        self.lock = Lock()
+        self.f = None
+        self.total = 0
+        self.written = 0
+        self.by_class = {}
+        self.by_key = {}
+    
+    @staticmethod
+    def classify(error):
+        """Zwraca (klasa błędu, sprawca, czy_zły_link) dla wpisu 'href/url | komunikat | ...'"""
+        parts = error.split(' | ')
+        subject = parts[0].strip()
+        message = parts[1] if len(parts) > 1 else ''
+        cls = message.split(':')[0].split('(')[0].strip() or "Inny"
+        if cls == "HTTPError":
+            code = re.search(r'\b(\d{3})\b', message)
+            if code:
+                cls = f"HTTPError {code.group(1)}"
+        # Dla błędów pobierania sprawcą jest host, dla złych linków - sam href
+        if not message or message.startswith(ErrorLog.LINK_ERRORS):
+            return cls, subject, True
+        return cls, urlparse(subject).netloc or subject, False
+    
+    def add(self, error):
+        cls, offender, bad_link = self.classify(error)
+        with self.lock:
+            self.total += 1
+            self.by_class[cls] = self.by_class.get(cls, 0) + 1
+            key = (cls, offender)
+            if key not in self.by_key and len(self.by_key) >= self.max_keys:
+                key = (cls, self.OTHER)
+            n = self.by_key.get(key, 0) + 1
+            self.by_key[key] = n
+            # Błędy pobierania są unikalne per URL; powtarzające się złe linki - tylko pierwsze wystąpienia
+            if self.path and (not bad_link or n <= self.per_key):
+                self._write(error)
+    
+    def _write(self, error):
+        try:
+            if self.f is None:
+                self.f = Compression.open_write(self.path, self.compression, self.level)
+            self.f.write(error + '\n')
+            self.written += 1
+        except Exception as ex:
+            print(f"⚠️  Błąd zapisu errorów: {ex}")
+            self.path = None
+    
+    def count(self):
+        with self.lock:
+            return self.total
+    
+    def summary(self, top=10):
+        """Zwraca ({klasa: liczba}, [((klasa, sprawca), liczba)] - najczęstsi sprawcy)"""
+        with self.lock:
+            classes = dict(sorted(self.by_class.items(), key=lambda kv: -kv[1]))
+            offenders = sorted(self.by_key.items(), key=lambda kv: -kv[1])[:top]
+        return classes, offenders
+    
+    def close(self):
+        with self.lock:
+            if self.f:
+                self.f.close()
+                self.f = None
+
+
+# ============================================================================
+# STATYSTYKI
+# ============================================================================
+class Stats:
+    """Statystyki"""
+    def __init__(self, errors=None):
+        self.visited = set()
+        self.aliases = set()
+        self.queued = set()
+        self.blocked = set()
+        self.errors = errors if errors is not None else ErrorLog()
+        self.redirects = {}
+        self.avoided = 0
+        self.near_duplicates = 0
+        self.content = {}
+        self.content_aliases = {}
+        self.parse_time = 0.0
+        self.parsed = 0
+        self.lock = Lock()
+        self.start = time.time()
+    
+    def mark_visited(self, url):
+        with self.lock:
+            if url in self.visited or url in self.aliases:
+                return False
+            self.visited.add(url)
+            return True
+    
+    def mark_alias(self, source, target):
+        """Zapamiętuje przekierowanie/canonical; zwraca False, gdy cel był już znany"""
+        with self.lock:
+            if source == target:
+                return True
+            self.redirects[source] = target
+            if target in self.visited or target in self.aliases:
+                return False
+            self.aliases.add(target)
+            return True
+    
+    def _resolve(self, url):
+        seen = set()
+        while url in self.redirects and url not in seen:
+            seen.add(url)
+            url = self.redirects[url]
+        return url
+    
+    def next_target(self, url):
+        """Zwraca URL do pobrania (po przekierowaniach) lub None, gdy strona jest już znana"""
+        with self.lock:
+            target = self._resolve(url)
+            if target in self.visited or target in self.aliases:
+                if target != url or url in self.aliases:
+                    self.avoided += 1
+                return None
+            return target
+    
+    def claim_content(self, digest, url):
+        """Zwraca URL pierwszej strony o identycznej treści lub None (i rejestruje treść)"""
+        with self.lock:
+            first = self.content.get(digest)
+            if first is None:
+                self.content[digest] = url
+                return None
+            self.content_aliases[url] = first
+            return first
+    
+    def add_parse_time(self, seconds):
+        with self.lock:
+            self.parse_time += seconds
+            self.parsed += 1
+    
+    def get_saved_parse_time(self):
+        """Szacowany czas CPU zaoszczędzony na niesparsowanych duplikatach treści"""
+        with self.lock:
+            if not self.parsed:
+                return 0.0
+            return len(self.content_aliases) * self.parse_time / self.parsed
+    
+    def add_near_duplicate(self):
+        with self.lock:
+            self.near_duplicates += 1
+    
+    def add_queued(self, urls, filter=None):
+        """Dodaje nowe URL-e do kolejki; filter (lista -> przepuszczone) odrzuca je, zanim zostaną policzone"""
+        fresh = {}
+        with self.lock:
+            for url in urls:
+                if url in self.visited or url in self.queued or url in self.blocked:
+                    continue
+                target = self._resolve(url)
+                if target in self.visited or target in self.aliases or (target != url and target in self.queued):
+                    self.queued.add(url)
+                    self.avoided += 1
+                    continue
+                fresh.setdefault(target, set()).add(url)
+            allowed = set(filter(list(fresh))) if filter and fresh else fresh
+            added = []
+            for target, sources in fresh.items():
+                # Odrzucone są zapamiętywane osobno - nie trafiają do "Znalezione linki" ani ponownie do filtrów
+                known = self.queued if target in allowed else self.blocked
+                known.update(sources)
+                known.add(target)
+                if target in allowed:
+                    added.append(target)
+        return added
+    
+    def add_errors(self, errors):
+        for error in errors:
+            self.errors.add(error)
+    
+    def add_error(self, error):
+        self.errors.add(error)
+    
+    def get_counts(self):
+        with self.lock:
+            return len(self.visited), len(self.queued), self.errors.count()
+    
+    def get_elapsed_time(self):
+        return time.time() - self.start
+
+
+
+# ============================================================================
+# CRAWLER
+# ============================================================================
+class Crawler:
+    """Główny crawler"""
+    def __init__(self, config, stop_event=None, streams=None):
+        self.config = config
+        self.stop_event = stop_event
+        self.log = CrawlLog(config.log_level, config.log_every, config.log_errors_only, config.log_json, streams)
+        
+        self.dm = DomainManager(config.url)
+        self.metrics = Metrics()
+        self.http = HTTPClient(config, stop_event, self.metrics)
+        self.parser = HTMLParser(self.dm)
+        self.storage = Storage(config.durability, config.flush_interval,
+                               compression=config.compression, level=config.compression_level,
+                               record_format=config.record_format,
+                               shard_bytes=int(config.shard_mb * 1024 * 1024) if config.shard_mb else None,
+                               shard_records=config.shard_records,
+                               dedupe=config.dedupe, boilerplate=config.boilerplate,
+                               near_duplicates=config.near_duplicates, texts_format=config.texts_format)
+        if os.path.exists(self.storage.errors_path):
+            os.remove(self.storage.errors_path)
+        self.stats = Stats(ErrorLog(self.storage.errors_path, config.compression, config.compression_level))
+        self.traps = TrapDetector(pattern_limit=config.trap_pattern_limit, same_outlinks=config.trap_same_outlinks,
+                                  outlink_similarity=config.trap_outlink_similarity) if config.trap_detection else None
+        self.simhash = SimHashIndex() if config.simhash else None
+        self.template = TemplateLines() if config.simhash or config.trap_detection else None
+        self.learner = NonHTMLLearner(config.non_html_path) if config.learn_non_html else None
+        self.warc = WarcWriter() if config.warc else None
+        
+        self.queue = queue.Queue()
+        self.queue.put(config.url)
+        self.stats.add_queued([config.url])
+        self.tuning = []      # zmiany wątków/opóźnienia w trakcie: {time, workers, delay, before, after}
+    
+    def run(self):
+        """Uruchamia crawling"""
+        try:
+            self._crawl()
+        finally:
+            self.log.close()
+    
+    def _crawl(self):
+        self.log.info(f"\n🚀 Start: {self.config.url}")
+        self.log.info(f"📍 Domeny: {', '.join(self.dm.allowed)}")
+        self.log.info(f"🔧 Wątków: {self.config.max_workers}")
+        self.log.info(f"📊 Limit: {self.config.max_pages}")
+        self.log.info(f"⏱️  Opóźnienie: {self.config.delay}s\n")
+        
+        try:
+            # Pula na maksimum - liczbę równoległych pobrań wyznacza okno config.max_workers (strojone na żywo)
+            with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
+                futures = {}
+                
+                while True:
+                    if self.stop_event and self.stop_event.is_set():
+                        self.log.warning("\n⚠️  Przerwano przez użytkownika")
+                        break
+                    
+                    visited, _, _ = self.stats.get_counts()
+                    if visited >= self.config.max_pages:
+                        self.log.info(f"\n⚠️  Osiągnięto limit {self.config.max_pages} stron")
+                        break
+                    
+                    # Dodaj zadania
+                    while not self.queue.empty() and len(futures) < self.config.max_workers:
+                        url = self.queue.get()
+                        url = self.stats.next_target(url)
+                        if url is None:
+                            continue
+                        future = executor.submit(self._process, url)
+                        futures[future] = url
+                    
+                    # Zbieraj wyniki
+                    done = [f for f in futures if f.done()]
+                    for future in done:
+                        url = futures.pop(future)
+                        try:
+                            new_links = future.result()
+                            for link in new_links:
+                                self.queue.put(link)
+                        except Exception as e:
+                            self.log.error(f"❌ Błąd wątku: {e}", url=url)
+                            self.stats.add_error(f"{url} | Błąd wątku: {type(e).__name__}: {e}")
+                    
+                    if self.queue.empty() and not futures:
+                        self.log.info("\n⚠️  Brak więcej linków do przetworzenia")
+                        break
+                    
+                    self._report_tuning()
+                    time.sleep(0.01)
+        finally:
+            self.storage.close()
+            if self.learner:
+                self.learner.save()
+            if self.warc:
+                self.warc.close()
+            for url in self.storage.failed:
+                self.stats.add_error(f"{url} | Błąd zapisu do pliku")
+            self.stats.errors.close()
+        
+        self._print_summary()
+    
+    def tune(self, workers=None, delay=None):
+        """Zmienia liczbę wątków i opóźnienie w trakcie crawlingu (granice jak w Config)"""
+        workers = self.config.max_workers if workers is None else max(1, min(Config.MAX_WORKERS, workers))
+        delay = self.config.delay if delay is None else max(Config.MIN_DELAY, delay)
+        if (workers, delay) == (self.config.max_workers, self.config.delay):
+            return False
+        before = self.metrics.snapshot().pages_per_s
+        self.log.info(f"🎛️  Strojenie: wątki {self.config.max_workers} → {workers}, "
+                      f"opóźnienie {self.config.delay}s → {delay}s (przed: {before:.1f} stron/s)",
+                      workers=workers, delay=delay, pages_per_s=round(before, 2))
+        self.config.max_workers = workers
+        self.config.delay = delay
+        self.tuning.append({'time': time.monotonic(), 'workers': workers, 'delay': delay,
+                            'before': before, 'after': None})
+        return True
+    
+    def _report_tuning(self):
+        """Loguje przepustowość po zmianie, gdy okno metryk obejmuje już tylko czas po niej"""
+        now = time.monotonic()
+        for change in self.tuning:
+            if change['after'] is None and now - change['time'] >= Metrics.WINDOW + 1:
+                change['after'] = self.metrics.snapshot().pages_per_s
+                self.log.info(f"🎛️  Po zmianie (wątki {change['workers']}, opóźnienie {change['delay']}s): "
+                              f"{change['after']:.1f} stron/s (przed: {change['before']:.1f})",
+                              workers=change['workers'], delay=change['delay'],
+                              pages_per_s=round(change['after'], 2))
+    
+    def _process(self, url):
+        """Przetwarza URL"""
+        if not self.stats.mark_visited(url):
+            return []
+        
+        visited, queued, _ = self.stats.get_counts()
+        self.log.info(f"🔍 [{visited}/{queued}] {url}", page=visited, url=url)
+        
+        # Pobierz
+        result = self.http.fetch(url)
+        success, content, error = result.success, result.content, result.error
+        if self.learner:
+            self.learner.record(url, success, error, result.status)
+        
+        # Przekierowanie - oznacz cel jako odwiedzony
+        final = self.parser.normalize(result.final_url) or url
+        if final != url and not self.stats.mark_alias(url, final):
+            self.log.info(f"   ♻️  Przekierowanie do odwiedzonej strony: {final}", page=visited, url=url)
+            return []
+        
+        if not success:
+            self.stats.add_error(f"{url} | {error}")
+            self.log.error(f"   ❌ Błąd pobierania: {error}", page=visited, url=url)
+            return []
+        
+        if self.warc:
+            self.warc.write(final, result.status, result.headers, result.body)
+        
+        # Identyczna treść - alias pierwszej strony, bez parsowania
+        digest = self.http.content_hash(result.body)
+        first = self.stats.claim_content(digest, final)
+        if first:
+            if self.traps:
+                self.traps.observe_page(final, (), duplicate=True)
+            self.log.info(f"   ♻️  Identyczna treść jak: {first}", page=visited, url=url)
+            return []
+        
+        # Parsuj
+        try:
+            t0 = time.perf_counter()
+            links, errors, text, canonical = self.parser.parse(final, content)
+            parse_time = time.perf_counter() - t0
+            self.stats.add_parse_time(parse_time)
+            self.metrics.record_parse(parse_time)
+            self.stats.add_errors(errors)
+        except Exception as e:
+            self.stats.add_error(f"{url} | Błąd parsowania HTML: {type(e).__name__}: {e}")
+            self.log.error(f"   ❌ Błąd parsowania: {type(e).__name__}", page=visited, url=url)
+            return []
+        
+        # Canonical - zwiń aliasy strony
+        if canonical and canonical not in (url, final) and not self.stats.mark_alias(final, canonical):
+            if self.traps:
+                self.traps.observe_page(final, (), duplicate=True)
+            self.log.info(f"   ♻️  Duplikat strony kanonicznej: {canonical}", page=visited, url=url)
+            return []
+        
+        # Prawie-duplikat - nie zapisuj
+        status = "✅ Zapisano"
+        # Odcisk z samej treści - wspólne menu i stopka nie upodabniają różnych artykułów
+        content = self.template.strip(text) if self.template else text
+        original = self.simhash.add(final, content) if self.simhash else None
+        if original:
+            self.stats.add_near_duplicate()
+            status = f"♻️  Prawie-duplikat strony: {original}"
+            if self.config.skip_duplicate_links:
+                self.log.info(f"   {status}", page=visited, url=url)
+                return []
+        elif not self.storage.save_page(url, text, final_url=final, status=result.status, size=result.size,
+                                        fetch_ms=round(result.elapsed * 1000, 3), parse_ms=round(parse_time * 1000, 3),
+                                        content_hash=digest.hex()):
+            self.stats.add_error(f"{url} | Błąd zapisu do pliku")
+        
+        # Dodaj nowe linki (bez pułapek)
+        if self.traps:
+            duplicate = bool(original) or self.template.is_template_only(content)
+            self.traps.observe_page(final, links, duplicate=duplicate)
+        new = self.stats.add_queued(links, self._filter)
+        
+        if new:
+            _, total, _ = self.stats.get_counts()
+            self.log.info(f"   {status} | +{len(new)} nowych linków (razem: {total})", page=visited, url=url)
+        else:
+            self.log.info(f"   {status}", page=visited, url=url)
+        
+        return new
+    
+    def _filter(self, urls):
+        """Odrzuca wyuczone wzorce nie-HTML i pułapki URL (wywoływane tylko dla nowych URL-i)"""
+        if self.learner:
+            urls = self.learner.filter(urls)
+        if self.traps:
+            urls = self.traps.filter(urls)
+        return urls
+    
+    def _print_summary(self):
+        visited, queued, errors = self.stats.get_counts()
+        elapsed = self.stats.get_elapsed_time()
+        
+        self.log.info(f"\n{'='*60}")
+        self.log.info(f"✅ CRAWLING ZAKOŃCZONY")
+        self.log.info(f"{'='*60}")
+        self.log.info(f"⏱️  Czas: {elapsed:.2f}s ({elapsed/60:.1f} min)")
+        self.log.info(f"📊 Przetworzone strony: {visited}")
+        self.log.info(f"🔗 Znalezione linki: {queued}")
+        self.log.info(f"❌ Błędów: {errors}")
+        self.log.info(f"♻️  Uniknięte pobrania (przekierowania/canonical): {self.stats.avoided}")
+        self.log.info(f"♻️  Pominięte prawie-duplikaty (SimHash): {self.stats.near_duplicates}")
+        self.log.info(f"♻️  Identyczna treść (aliasy): {len(self.stats.content_aliases)} "
+              f"(zaoszczędzono ~{self.stats.get_saved_parse_time():.2f}s parsowania)")
+        if visited > 0:
+            self.log.info(f"⚡ Prędkość: {visited/elapsed:.2f} stron/s")
+            fetch, parse = self.metrics.fetch.percentiles(50, 95, 99), self.metrics.parse.percentiles(50, 95, 99)
+            self.log.info(f"📈 Pobieranie p50/p95/p99: {' / '.join(f'{t * 1000:.0f}' for t in fetch)} ms | "
+                          f"parsowanie: {' / '.join(f'{t * 1000:.1f}' for t in parse)} ms")
+        self.log.info(f"{'='*60}")
+        
+        # Strojenie w trakcie
+        if self.tuning:
+            self.log.info(f"\n🎛️  Zmiany parametrów w trakcie ({len(self.tuning)}):")
+            for change in self.tuning:
+                after = f"{change['after']:.1f}" if change['after'] is not None else "-"
+                self.log.info(f"   wątki {change['workers']}, opóźnienie {change['delay']}s | "
+                              f"stron/s przed: {change['before']:.1f}, po: {after}")
+        
+        # Pułapki
+        traps = self.traps.report() if self.traps else []
+        if traps:
+            self.log.info(f"\n🕳️  Wykryte pułapki ({len(traps)} wzorców, pominięto {self.traps.get_blocked()} URL-i):")
+            for pattern, reason, blocked in traps[:10]:
+                self.log.info(f"   {pattern} | {reason} | pominięto: {blocked}")
+        
+        # Wzorce nie-HTML
+        learned = self.learner.report() if self.learner else []
+        if learned:
+            self.log.info(f"\n📦 Wzorce nie-HTML ({len(learned)}, pominięto {self.learner.skipped} zbędnych pobrań):")
+            for pattern, bad, good in learned[:10]:
+                self.log.info(f"   {pattern} | nie-HTML/404: {bad} | HTML: {good}")
+        
+        # Błędy - liczniki klas i najczęstsi sprawcy (pełna lista jest w pliku)
+        if errors:
+            classes, offenders = self.stats.errors.summary()
+            self.log.info(f"\n❌ Błędy wg klasy:")
+            for cls, n in classes.items():
+                self.log.info(f"   {cls}: {n}")
+            self.log.info(f"\n🔝 Najczęstsze źródła błędów:")
+            for (cls, offender), n in offenders:
+                self.log.info(f"   {n:>6} × {cls} | {offender}")
+            self.log.info(f"\n❌ Błędy zapisano w: {self.storage.errors_path} "
+                  f"({self.stats.errors.written} wpisów, max {self.stats.errors.per_key} na źródło)")
+        
+        # Statystyki plików
+        records, rate, waited = self.storage.get_write_stats()
+        self.log.info(f"\n💾 Zapis w tle: {records} rekordów | {rate:.1f} MB/s | "
+              f"oczekiwanie wątków: {waited * 1000:.1f} ms")
+        self.log.info(f"\n💾 Zapisane pliki:")
+        shards = ShardManifest.files(self.storage.texts_path)
+        texts_size = sum(self.storage.get_file_size_mb(p) for p in shards)
+        if texts_size > 0:
+            label = self.storage.texts_path
+            if self.storage.sharded:
+                label = f"{len(shards)} shardów, {label}"
+            self.log.info(f"   📝 {label} ({texts_size:.2f} MB)")
+        links_size = self.storage.get_file_size_mb(self.storage.links_path)
+        if links_size > 0:
+            self.log.info(f"   🔗 {self.storage.links_path} ({links_size * 1024:.1f} KB)")
+        if os.path.exists(self.storage.errors_path):
+            err_size = self.storage.get_file_size_mb(self.storage.errors_path)
+            self.log.info(f"   ❌ {self.storage.errors_path} ({err_size * 1024:.1f} KB)")
+        dedup = self.storage.dedup
+        if dedup:
+            removed = dedup.total_lines - dedup.unique_lines
+            self.log.info(f"   🧹 {self.storage.unique_path} ({self.storage.get_file_size_mb(self.storage.unique_path):.2f} MB, "
+                  f"usunięto {removed} powtórzonych linii"
+                  + (f", boilerplate: {dedup.removed_bytes / 1024:.1f} KB" if dedup.boilerplate else "")
+                  + (f", prawie-duplikaty akapitów: {dedup.near_removed}" if dedup.near else "") + ")")
+        
+        self.log.info(f"\n🎉 CRAWLING GOTOWY!")
+        self.log.info(f"   ✅ Pomyślnie: {visited}")
+        self.log.info(f"   ❌ Błędy: {errors}")
+        self.log.info(f"   🔗 Odkryte linki: {queued}")
+
+
+# ============================================================================
+# DEDUPLIKATOR
+# ============================================================================
+class DedupState:
+    """Trwały stan deduplikacji przyrostowej: skróty sekcji, częstości linii (boilerplate), sygnatury MinHash"""
+    MAGIC = b'DDS1'
+    HEADER = struct.Struct('<4sI')
+    
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.reset()
+    
+    @staticmethod
+    def path(output):
+        return output + ".state"
+    
+    @staticmethod
+    def section_hash(section):
+        return int.from_bytes(hashlib.blake2b(section.encode('utf-8'), digest_size=8).digest(), 'little')
+    
+    @staticmethod
+    def line_hash(line):
+        """64-bitowy skrót linii stały między uruchomieniami (xxhash, gdy dostępny; inaczej blake2b)"""
+        data = line.encode('utf-8')
+        if xxhash:
+            return xxhash.xxh3_64_intdigest(data) - (1 << 63)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True)
+    
+    def reset(self, params=None):
+        self.meta = {'hash': 'xxh3' if xxhash else 'blake2b', 'params': params, 'sections': 0, 'pages': 0,
+                     'ends_newline': False, 'files': {}}
+        self.ends = {}
+        self.sections = array('Q')   # posortowane skróty przetworzonych sekcji (8 B na sekcję)
+        self.new = set()
+        self.counts = {}
+        self.signatures = array('Q')  # sklejone sygnatury MinHash po sig_len wartości
+        self.sig_len = 0
+    
+    def __contains__(self, h):
+        if h in self.new:
+            return True
+        i = bisect.bisect_left(self.sections, h)
+        return i < len(self.sections) and self.sections[i] == h
+    
+    def add(self, h):
+        self.new.add(h)
+    
+    @classmethod
+    def tail_digest(cls, path, offset, size=4096):
+        """Skrót bajtów tuż przed offsetem - wykrywa plik nadpisany zamiast dopisanego"""
+        with open(path, 'rb') as f:
+            f.seek(max(0, offset - size))
+            return hashlib.blake2b(f.read(min(offset, size)), digest_size=16).hexdigest()
+    
+    def resume_offset(self, path):
+        """Bajt, od którego czytać plik (0 - od początku; sekcje rozpoznawane wtedy po skrótach)"""
+        saved = self.meta['files'].get(path)
+        if not saved:
+            return 0
+        offset, digest = saved
+        try:
+            if os.path.getsize(path) < offset or self.tail_digest(path, offset) != digest:
+                return 0
+        except OSError:
+            return 0
+        return offset
+    
+    def processed(self, path, offset):
+        """Zapamiętuje, że plik przeczytano do offsetu (tuż za ostatnim separatorem)"""
+        self.ends[path] = offset
+    
+    def load(self):
+        """Wczytuje stan; False, gdy pliku brak albo powstał z inną funkcją skrótu"""
+        try:
+            with open(self.state_path, 'rb') as f:
+                magic, size = self.HEADER.unpack(f.read(self.HEADER.size))
+                if magic != self.MAGIC:
+                    return False
+                meta = json.loads(f.read(size))
+                if meta['hash'] != ('xxh3' if xxhash else 'blake2b'):
+                    return False
+                sections, keys, values, sigs = (array('Q'), array('q'), array('Q'), array('Q'))
+                sections.fromfile(f, meta['n_sections'])
+                keys.fromfile(f, meta['n_counts'])
+                values.fromfile(f, meta['n_counts'])
+                sigs.fromfile(f, meta['n_signatures'] * meta['sig_len'])
+        except (OSError, EOFError, ValueError, KeyError, struct.error):
+            return False
+        self.meta = meta
+        self.ends = {}
+        self.sections = sections
+        self.new = set()
+        self.counts = dict(zip(keys, values))
+        self.signatures = sigs
+        self.sig_len = meta['sig_len']
+        return True
+    
+    def save(self):
+        """Zapisuje stan atomowo (plik tymczasowy + os.replace)"""
+        self.sections = array('Q', sorted(chain(self.sections, self.new)))
+        self.new = set()
+        for path, offset in self.ends.items():
+            self.meta['files'][path] = [offset, self.tail_digest(path, offset)]
+        sig_len = self.sig_len if self.signatures else 0
+        self.meta.update(n_sections=len(self.sections), n_counts=len(self.counts),
+                         n_signatures=len(self.signatures) // sig_len if sig_len else 0, sig_len=sig_len)
+        header = json.dumps(self.meta).encode('utf-8')
+        tmp = self.state_path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, len(header)))
+            f.write(header)
+            self.sections.tofile(f)
+            array('q', self.counts.keys()).tofile(f)
+            array('Q', self.counts.values()).tofile(f)
+            self.signatures.tofile(f)
+        os.replace(tmp, self.state_path)
+
+
+class Deduplicator:
+    """Deduplikuje teksty (strumieniowo - sekcja po sekcji; z pliku albo przyrostowo w trakcie crawlingu)"""
+    SEP_IN = "_" * 80
+    SEP_OUT = "_" * 50
+    CHUNK = 4 * 1024 * 1024
+    PROGRESS = 10000
+    BOILERPLATE_EPS = 0.1      # błąd zliczania częstości (ułamek progu) - ogranicza pamięć
+    WARMUP = 50                # tryb przyrostowy: tyle stron buforowanych przed pierwszą decyzją o boilerplate
+    RANGE = 16 * 1024 * 1024   # tryb równoległy: docelowy rozmiar zakresu bajtów na zadanie
+    
+    def __init__(self, input_file="teksty.txt", output_file="teksty_unikalne.txt", boilerplate=None, workers=1,
+                 near_duplicates=None, incremental=False):
+        self.input = input_file
+        self.output = output_file
+        self.boilerplate = boilerplate   # np. 0.5 = usuń linie obecne w >50% stron (None = wyłączone)
+        self.workers = workers           # >1 (lub None = liczba rdzeni) - zakresy pliku w puli procesów
+        # np. 0.8 = usuń akapity podobne w >=80% (MinHash) do wcześniejszych w całym korpusie
+        self.near = MinHashIndex(near_duplicates) if near_duplicates else None
+        # Przyrostowo: stan w <wyjście>.state, przetwarzane są tylko nowe sekcje (dopisywane na końcu)
+        self.state = DedupState(DedupState.path(output_file)) if incremental else None
+        # Skróty linii trafiające do trwałego stanu muszą być stałe między procesami
+        self.line_hash = DedupState.line_hash if incremental else hash
+        self.width = max(1, int(1 / (boilerplate * self.BOILERPLATE_EPS))) if boilerplate else None
+        self.counts = {}
+        self.pages = 0
+        self.threshold = float('inf')
+        self.f = None
+        self.container = bool(output_file) and output_file.endswith(RecordFormat.EXT)
+    
+    def _count(self, section):
+        """Zlicza częstość dokumentową linii sekcji (lossy counting na skrótach)"""
+        # hash() str to 64-bitowy skrót, stały w obrębie procesu - zliczanie i filtrowanie działają w jednym
+        # Lossy counting (Manku-Motwani): co `width` stron usuwane są rzadkie skróty,
+        # więc pamięć zależy od progu, nie od liczby unikalnych linii w crawlu
+        self.pages += 1
+        bucket = (self.pages - 1) // self.width + 1
+        # Wpis = górne oszacowanie częstości (liczba + maks. błąd z chwili wstawienia)
+        for h in {self.line_hash(line) for line in section.split('\n') if line.strip()}:
+            self.counts[h] = self.counts.get(h, bucket - 1) + 1
+        if self.pages % self.width == 0:
+            self.counts = {h: c for h, c in self.counts.items() if c > bucket}
+        self.threshold = max(2, self.boilerplate * self.pages)
+    
+    def common_count(self):
+        """Liczba linii uznanych za boilerplate (menu/stopki)"""
+        return sum(1 for c in self.counts.values() if c > self.threshold)
+    
+    def open(self, append=False):
+        """Otwiera plik wyjściowy; sekcje przyjmuje feed()/add_page(), zamyka close()"""
+        if self.container:
+            self.f = open(self.output, 'ab' if append else 'wb', buffering=Compression.BUFFER)
+            self.records_w = RecordWriter(self.f, header=not self.f.tell())
+        else:
+            self.f = open(self.output, 'a' if append else 'w', encoding='utf-8', buffering=Compression.BUFFER)
+        # Przy dopisywaniu separator zależy od końca ostatniej zapisanej sekcji (zapamiętanego w stanie)
+        self.prev = ('\n' if self.state.meta['ends_newline'] else '') if append and self.state.meta['sections'] else None
+        self.pending = []
+        self.fed = 0
+        self.sections = 0
+        self.total_lines = 0
+        self.unique_lines = 0
+        self.removed_bytes = 0
+        self.near_removed = 0
+    
+    def add_page(self, url, text):
+        """Tryb przyrostowy: sekcja w postaci, w jakiej Storage zapisuje ją do teksty.txt"""
+        self.feed(('\n\n' if self.fed else '') + f"{url}\n\n{text}\n\n")
+    
+    def feed(self, section):
+        """Tryb przyrostowy: boilerplate wg częstości ze stron widzianych dotąd (po WARMUP stronach)"""
+        self.fed += 1
+        if not self.boilerplate:
+            self._emit(section)
+            return
+        self._count(section)
+        self.pending.append(section)
+        if self.pages >= self.WARMUP:
+            for s in self.pending:
+                self._emit(s)
+            self.pending = []
+    
+    def close(self):
+        if self.f is None:
+            return
+        for s in self.pending:
+            self._emit(s)
+        self.pending = []
+        self.f.close()
+        self.f = None
+    
+    def _emit(self, section):
+        self._write(*self._dedupe_section(section))
+    
+    def _write(self, out, lines, unique):
+        if self.near:
+            kept = [line for line in out.split('\n') if not (line.strip() and self.near.add(line))]
+            self.near_removed += unique - len(kept)
+            unique = len(kept)
+            out = '\n'.join(kept)
+        self.total_lines += lines
+        self.unique_lines += unique
+        
+        if self.container:
+            # Rekord: pierwsza niepusta linia sekcji to URL, reszta to zdeduplikowany tekst
+            url, _, text = out.strip('\n').partition('\n')
+            # Pusta linia za URL zostaje tylko w pierwszej sekcji - rekordy bez niej, jednakowo
+            self.records_w.write(url, text.lstrip('\n'))
+            self.sections += 1
+            return
+        
+        # Separator przed każdą sekcją oprócz pierwszej (bez separatora na końcu pliku)
+        if self.prev is not None:
+            if not self.prev.endswith('\n'):
+                self.f.write('\n')
+            self.f.write(self.SEP_OUT + '\n')
+        self.f.write(out)
+        self.prev = out
+        self.sections += 1
+    
+    def run(self):
+        print(f"\n{'='*60}")
+        print("🧹 DEDUPLIKATOR TEKSTU")
+        print(f"{'='*60}")
+        print(f"\n📄 Źródło: {self.input}")
+        print(f"💾 Cel: {self.output}\n")
+        
+        start = time.time()
+        
+        try:
+            resumed = self._load_state()
+            if self.boilerplate:
+                print(f"🔍 Przejście 1: linie obecne w >{self.boilerplate:.0%} stron...")
+                if not resumed:
+                    self.counts, self.pages = {}, 0
+                for section in self._new_sections():
+                    self._count(section)
+                print(f"   Stron: {self.pages} | powtarzalnych linii (menu/stopki): {self.common_count()}")
+            
+            self.open(append=resumed)
+            try:
+                if self.state:
+                    print("📖 Przetwarzam tylko nowe sekcje...")
+                    for result in map(self._dedupe_section, self._new_sections(mark=True)):
+                        self._write(*result)
+                elif self._parallel():
+                    print(f"📖 Przetwarzam plik równolegle ({self.workers or os.cpu_count()} procesów)...")
+                    self._run_parallel()
+                else:
+                    print("📖 Przetwarzam plik strumieniowo...")
+                    reported = 0
+                    for result in map(self._dedupe_section, self._sections()):
+                        self._write(*result)
+                        if self.sections - reported >= self.PROGRESS:
+                            reported = self.sections
+                            print(f"   Przetworzono {self.sections} sekcji...")
+            finally:
+                self.close()
+            if self.state:
+                self._save_state()
+            
+            self.print_summary(time.time() - start)
+            return True
+        except FileNotFoundError:
+            print(f"❌ Błąd: Plik '{self.input}' nie istnieje!")
+            return False
+        except Exception as e:
+            print(f"❌ Błąd deduplikacji: {e}")
+            return False
+    
+    def _load_state(self):
+        """Wczytuje stan przyrostowy; False = pełne przetwarzanie (brak stanu, inne parametry, brak wyjścia)"""
+        if not self.state:
+            return False
+        params = {'boilerplate': self.boilerplate, 'near': self.near and self.near.threshold}
+        if not os.path.exists(self.output) or not self.state.load() or self.state.meta['params'] != params:
+            self.state.reset(params)
+            return False
+        self.counts = self.state.counts
+        self.pages = self.state.meta['pages']
+        if self.boilerplate:
+            self.threshold = max(2, self.boilerplate * self.pages)
+        if self.near:
+            self.near.restore(self.state.signatures)
+        print(f"♻️  Stan przyrostowy: {self.state.meta['sections']} sekcji już zdeduplikowanych")
+        return True
+    
+    def _save_state(self):
+        meta = self.state.meta
+        meta['sections'] += self.sections
+        meta['pages'] = self.pages
+        if self.prev is not None:
+            meta['ends_newline'] = self.prev.endswith('\n')
+        self.state.counts = self.counts
+        self.state.signatures = self.near.export() if self.near else array('Q')
+        self.state.sig_len = self.near.num_perm if self.near else 0
+        self.state.save()
+    
+    def _new_sections(self, mark=False):
+        """Sekcje, których skrótu nie ma w stanie przyrostowym (mark=True - zapamiętuje je)"""
+        self.skipped = 0
+        for section in self._sections():
+            if self.state:
+                # Wiodące "\n\n" zależy tylko od pozycji sekcji w pliku
+                h = DedupState.section_hash(section.lstrip('\n'))
+                if h in self.state:
+                    self.skipped += 1
+                    continue
+                if mark:
+                    self.state.add(h)
+            yield section
+    
+    def _parallel(self):
+        """Tryb równoległy: >1 proces, bez boilerplate (hash() zależy od procesu), prawie-duplikatów
+        i trybu przyrostowego (stan całego korpusu), tylko teksty.txt bez kompresji"""
+        if self.workers == 1 or self.boilerplate or self.near or self.state or self.container:
+            return False
+        return all(not Compression.is_compressed(path) and not RecordFormat.is_container(path)
+                   for path in ShardManifest.files(self.input))
+    
+    def _ranges(self):
+        """Dzieli pliki na zakresy bajtów: (ścieżka, start, koniec, prefiks, ostatni, z indeksu). Z pełnym
+        indeksem offsetów - na granicach rekordów (jak odczyt sekwencyjny), inaczej tuż za separatorem"""
+        sep = self.SEP_IN.encode('ascii')
+        for n, path in enumerate(ShardManifest.files(self.input)):
+            size = os.path.getsize(path)
+            if size == 0:
+                continue
+            prefix = '\n\n' if n > 0 else ''
+            if os.path.exists(PageIndex.path(path)):
+                with PageReader(path) as reader:
+                    if reader.is_complete():
+                        for start, end in reader.ranges(-(-size // self.RANGE)):
+                            yield path, start, end, prefix if start == 0 else '\n\n', end == size, True
+                        continue
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while start < size:
+                    end = size
+                    i = mm.find(sep, start + self.RANGE)
+                    # Separator musi zaczynać ciąg podkreśleń - tak samo trafi go odczyt sekwencyjny
+                    while i > 0 and mm[i - 1] == ord('_'):
+                        i = mm.find(sep, i + 1)
+                    if i >= 0:
+                        end = i + len(sep)
+                    yield path, start, end, prefix if start == 0 else '', end == size, False
+                    start = end
+    
+    def _run_parallel(self):
+        """Zakresy w puli procesów; wyniki scalane w kolejności pliku (jak ścieżka sekwencyjna)"""
+        pending = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as pool:
+            window = 2 * (self.workers or os.cpu_count() or 1)
+            for task in self._ranges():
+                pending.append(pool.submit(_dedupe_range, task))
+                if len(pending) >= window:
+                    self._merge(pending.pop(0).result())
+            for future in pending:
+                self._merge(future.result())
+    
+    def _merge(self, result):
+        text, last, sections, lines, unique = result
+        if not sections:
+            return
+        if self.prev is not None:
+            if not self.prev.endswith('\n'):
+                self.f.write('\n')
+            self.f.write(self.SEP_OUT + '\n')
+        self.f.write(text)
+        self.prev = last
+        self.total_lines += lines
+        self.unique_lines += unique
+        self.sections += sections
+    
+    def print_summary(self, elapsed):
+        removed = self.total_lines - self.unique_lines
+        
+        print(f"\n{'='*60}")
+        print(f"✅ DEDUPLIKACJA ZAKOŃCZONA")
+        print(f"{'='*60}")
+        print(f"⏱️  Czas: {elapsed:.2f}s")
+        print(f"📊 Sekcji: {self.sections}")
+        if self.state:
+            print(f"⏭️  Pominięte (zdeduplikowane wcześniej): {self.skipped}")
+        print(f"📝 Łącznie linii: {self.total_lines}")
+        print(f"✅ Unikalne: {self.unique_lines}")
+        print(f"🗑️  Usunięte: {removed}")
+        if self.total_lines > 0:
+            print(f"💾 Oszczędność: {(removed/self.total_lines*100):.1f}%")
+        if self.boilerplate:
+            print(f"🧱 Usunięty boilerplate: {self.removed_bytes / (1024 * 1024):.2f} MB")
+        if self.near:
+            print(f"🪞 Prawie-duplikaty akapitów (MinHash): {self.near_removed}")
+        print(f"{'='*60}")
+        
+        try:
+            size = os.path.getsize(self.output) / (1024 * 1024)
+            print(f"\n💾 Plik wyjściowy:")
+            print(f"   📝 {self.output} ({size:.2f} MB)")
+        except:
+            pass
+    
+    def _dedupe_section(self, section):
+        """Zwraca (sekcja bez powtórzonych linii, liczba linii, liczba unikalnych)"""
+        lines = section.split('\n')
+        seen = set()
+        unique = []
+        for line in lines:
+            if line not in seen:
+                seen.add(line)
+                if self.counts and self.counts.get(self.line_hash(line), 0) > self.threshold and line.strip():
+                    self.removed_bytes += len(line.encode('utf-8')) + 1
+                    continue
+                unique.append(line)
+        return '\n'.join(unique), len(lines), len(unique)
+    
+    def _sections(self):
+        """Iteruje sekcje pliku lub wszystkich shardów z manifestu (jak split(SEP_IN) całości)"""
+        first = True
+        for path in ShardManifest.files(self.input):
+            start = self.state.resume_offset(path) if self.state else 0
+            for i, section in enumerate(self._file_sections(path, start)):
+                # "\n\n" po separatorze należy do następnej sekcji - także na granicy shardów
+                if i == 0 and not first and not start:
+                    section = '\n\n' + section
+                first = False
+                yield section
+    
+    def _file_sections(self, path, start=0):
+        """Kontener czyta rekord po rekordzie; teksty.txt z pełnym indeksem offsetów przez mmap, w przeciwnym
+        razie porcjami. start > 0 - od tego bajtu (tuż za separatorem/rekordem) w pliku bez kompresji"""
+        if RecordFormat.is_container(path):
+            with RecordReader(path, start) as reader:
+                for i, (url, text) in enumerate(reader):
+                    yield ('\n\n' if i or start else '') + f"{url}\n\n{text}\n\n"
+                if self.state and not Compression.is_compressed(path):
+                    self.state.processed(path, reader.offset)
+            return
+        
+        if os.path.exists(PageIndex.path(path)):
+            with PageReader(path) as reader:
+                if reader.is_complete():
+                    for i, (url, text) in enumerate(reader.pages(start)):
+                        yield ('\n\n' if i or start else '') + f"{url}\n\n{text}\n\n"
+                    if self.state:
+                        # Plik kończy się Storage.TAIL - wznowienie tuż za ostatnim separatorem
+                        self.state.processed(path, max(0, len(reader.mm) - 2))
+                    return
+        
+        plain = not Compression.is_compressed(path)
+        if start and plain:
+            raw = open(path, 'rb')
+            raw.seek(start)
+            f = io.TextIOWrapper(raw, encoding='utf-8')
+        else:
+            f = Compression.open_read(path)
+        with f:
+            buf = ''
+            for chunk in iter(lambda: f.read(self.CHUNK), ''):
+                buf += chunk
+                pos = 0
+                while True:
+                    i = buf.find(self.SEP_IN, pos)
+                    if i < 0:
+                        break
+                    yield buf[pos:i]
+                    pos = i + len(self.SEP_IN)
+                buf = buf[pos:]
+            # Jak przy split(): pusta (same białe znaki) ostatnia sekcja jest pomijana
+            if buf.strip():
+                yield buf
+        if self.state and plain:
+            self.state.processed(path, os.path.getsize(path) - len(buf.encode('utf-8')))
+
+
+def _dedupe_range(task):
+    """Zadanie dla puli procesów: zakres pliku -> (scalone sekcje, ostatnia sekcja, sekcje, linie, unikalne)"""
+    path, start, end, prefix, last, indexed = task
+    if indexed:
+        # Jeden rekord indeksu = jedna sekcja, także gdy tekst strony zawiera linię z 80 podkreśleń
+        with PageReader(path) as reader:
+            sections = [(prefix if i == 0 else '\n\n') + f"{url}\n\n{text}\n\n"
+                        for i, (url, text) in enumerate(reader.pages(start, end))]
+    else:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = prefix + f.read(end - start).decode('utf-8')
+        sections = data.split(Deduplicator.SEP_IN)
+        # Zakres kończy się separatorem - ostatni element jest pusty; na końcu pliku jak przy split()
+        if not last or not sections[-1].strip():
+            sections.pop()
+    dedup = Deduplicator(None, None)
+    outs = []
+    lines = unique = 0
+    for out, n, u in map(dedup._dedupe_section, sections):
+        outs.append(out)
+        lines += n
+        unique += u
+    # Separator jak w _emit(): z '\n' przed nim, gdy sekcja nie kończy się nową linią
+    text = ''.join(out + ('' if out.endswith('\n') else '\n') + Deduplicator.SEP_OUT + '\n' for out in outs[:-1])
+    last_out = outs[-1] if outs else ''
+    return text + last_out, last_out, len(outs), lines, unique
+
+
+# ============================================================================
+# GUI
+# ============================================================================
+class ConsoleRedirect:
+    """Przekierowuje print() do GUI: wątki tylko dopisują do kolejki, pętla Tk wstawia tekst partiami"""
+    MAX_LINES = 5000    # bufor pierścieniowy - starsze linie znikają z widoku
+    INTERVAL = 100      # ms między opróżnieniami kolejki
+    
+    def __init__(self, widget, root=None):
+        self.widget = widget
+        self.root = root or widget
+        # deque.append/popleft są atomowe - wątki crawlera nie czekają na blokadę ani na Tk;
+        # przy zalewie logów najstarsze fragmenty są odrzucane jeszcze przed wstawieniem
+        self.pending = deque(maxlen=self.MAX_LINES * 2)
+        self.job = self.root.after(self.INTERVAL, self._poll)
+    
+    def write(self, text):
+        self.pending.append(text)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        """Wstawia zaległy tekst jednym insertem i przycina widok do MAX_LINES linii (tylko wątek Tk)"""
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.pending.popleft())
+        except IndexError:
+            pass
+        if not chunks:
+            return 0
+        
+        text = ''.join(chunks)
+        if text.count('\n') > self.MAX_LINES:
+            text = '\n'.join(text.split('\n')[-self.MAX_LINES - 1:])
+        try:
+            self.widget.insert("end", text)
+            lines = int(self.widget.index('end-1c').split('.')[0])
+            if lines > self.MAX_LINES:
+                self.widget.delete('1.0', f"{lines - self.MAX_LINES + 1}.0")
+            self.widget.see("end")
+        except tk.TclError:
+            pass
+        return len(chunks)
+    
+    def clear(self):
+        self.pending.clear()
+        self.widget.delete('1.0', "end")
+    
+    def _poll(self):
+        self.drain()
+        try:
+            self.job = self.root.after(self.INTERVAL, self._poll)
+        except tk.TclError:
+            pass    # okno zamknięte
+
+
+class GUI:
+    """Interfejs graficzny"""
+    def __init__(self, root):
+        self.root = root
+        self.root.title("🕷️ Web Crawler + Ekstraktor")
+        self.root.geometry("900x950")
+        self.root.configure(bg="#f0f0f0")
+        
+        self.crawler = None
+        self.stop_event = Event()
+        self.running = False
+        self.stats_job = None
+        
+        self._build()
+        self.log = ConsoleRedirect(self.console, self.root)
+    
+    def _build(self):
+        """Buduje UI"""
+        # URL
+        f1 = tk.Frame(self.root, bg="#f0f0f0", padx=10, pady=10)
+        f1.pack(fill=tk.X)
+        tk.Label(f1, text="📍 URL Strony:", font=("Arial", 12, "bold"), bg="#f0f0f0").pack(anchor=tk.W)
+        self.url_entry = tk.Entry(f1, font=("Arial", 11), width=80)
+        self.url_entry.pack(fill=tk.X, pady=5)
+        self.url_entry.insert(0, "https://example.com")
+        
+        # Parametry
+        f2 = tk.LabelFrame(self.root, text="⚙️ Parametry", font=("Arial", 11, "bold"),
+                          bg="#f0f0f0", padx=10, pady=10)
+        f2.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Max stron
+        r1 = tk.Frame(f2, bg="#f0f0f0")
+        r1.pack(fill=tk.X, pady=3)
+        tk.Label(r1, text="📊 Max stron:", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
+        self.max_pages = tk.Spinbox(r1, from_=1, to=100000, width=15, font=("Arial", 10))
+        self.max_pages.delete(0, tk.END)
+        self.max_pages.insert(0, "1000")
+        self.max_pages.pack(side=tk.LEFT, padx=5)
+        tk.Label(r1, text="(min: 1)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
+        
+        # Wątki
+        r2 = tk.Frame(f2, bg="#f0f0f0")
+        r2.pack(fill=tk.X, pady=3)
+        tk.Label(r2, text="🔧 Liczba wątków:", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
+        self.workers = tk.Spinbox(r2, from_=1, to=Config.MAX_WORKERS, width=15, font=("Arial", 10), command=self._tune)
+        self.workers.delete(0, tk.END)
+        self.workers.insert(0, "10")
+        self.workers.pack(side=tk.LEFT, padx=5)
+        tk.Label(r2, text=f"(min: 1, max: {Config.MAX_WORKERS}, zmiana na żywo)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
+        
+        # Opóźnienie
+        r3 = tk.Frame(f2, bg="#f0f0f0")
+        r3.pack(fill=tk.X, pady=3)
+        tk.Label(r3, text="⏱️ Opóźnienie (s):", width=15, anchor=tk.W, bg="#f0f0f0").pack(side=tk.LEFT)
+        self.delay = tk.Spinbox(r3, from_=Config.MIN_DELAY, to=10.0, increment=0.1, width=15,
+                               font=("Arial", 10), format="%.1f", command=self._tune)
+        self.delay.delete(0, tk.END)
+        self.delay.insert(0, "0.3")
+        self.delay.pack(side=tk.LEFT, padx=5)
+        tk.Label(r3, text=f"(min: {Config.MIN_DELAY}, zmiana na żywo)", font=("Arial", 9), fg="#666", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
+        for spinbox in (self.workers, self.delay):
+            spinbox.bind("<Return>", self._tune)
+            spinbox.bind("<FocusOut>", self._tune)
+        
+        # Przyciski START/STOP
+        f3 = tk.Frame(self.root, bg="#f0f0f0", pady=10)
+        f3.pack(fill=tk.X)
+        
+        self.start_btn = tk.Button(f3, text="🚀 SCRAPUJ", font=("Arial", 14, "bold"),
+                                   bg="#4CAF50", fg="white", command=self.start,
+                                   cursor="hand2", padx=30, pady=10)
+        self.start_btn.pack(side=tk.LEFT, padx=(250, 10))
+        
+        self.stop_btn = tk.Button(f3, text="⛔ PRZERWIJ", font=("Arial", 14, "bold"),
+                                  bg="#F44336", fg="white", command=self.stop,
+                                  cursor="hand2", padx=30, pady=10, state=tk.DISABLED)
+        self.stop_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Statystyki
+        f4 = tk.LabelFrame(self.root, text="📊 Statystyki Live", font=("Arial", 11, "bold"),
+                          bg="#f0f0f0", padx=10, pady=10)
+        f4.pack(fill=tk.X, padx=10, pady=5)
+        
+        grid = tk.Frame(f4, bg="#f0f0f0")
+        grid.pack(fill=tk.X)
+        
+        tk.Label(grid, text="✅ Przetworzone:", width=18, anchor=tk.W, bg="#f0f0f0", 
+                font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W, pady=2)
+        self.stat_visited = tk.Label(grid, text="0", width=12, anchor=tk.W,
+                                     font=("Arial", 10, "bold"), fg="#2196F3", bg="#f0f0f0")
+        self.stat_visited.grid(row=0, column=1, sticky=tk.W)
+        
+        tk.Label(grid, text="🔗 Znalezione linki:", width=18, anchor=tk.W, bg="#f0f0f0",
+                font=("Arial", 10)).grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.stat_links = tk.Label(grid, text="0", width=12, anchor=tk.W,
+                                   font=("Arial", 10, "bold"), fg="#FF9800", bg="#f0f0f0")
+        self.stat_links.grid(row=1, column=1, sticky=tk.W)
+        
+        tk.Label(grid, text="❌ Błędy:", width=18, anchor=tk.W, bg="#f0f0f0",
+                font=("Arial", 10)).grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.stat_errors = tk.Label(grid, text="0", width=12, anchor=tk.W,
+                                    font=("Arial", 10, "bold"), fg="#F44336", bg="#f0f0f0")
+        self.stat_errors.grid(row=2, column=1, sticky=tk.W)
+        
+        tk.Label(grid, text="⏱️ Czas:", width=18, anchor=tk.W, bg="#f0f0f0",
+                font=("Arial", 10)).grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.stat_time = tk.Label(grid, text="0.0s", width=12, anchor=tk.W,
+                                  font=("Arial", 10, "bold"), fg="#9C27B0", bg="#f0f0f0")
+        self.stat_time.grid(row=3, column=1, sticky=tk.W)
+        
+        # Metryki na żywo (okno kroczące, percentyle z histogramu)
+        live = [("⚡ Strony/s:", "stat_rate", "#4CAF50"), ("📶 Transfer:", "stat_bytes", "#009688"),
+                ("🔄 W toku:", "stat_in_flight", "#607D8B"), ("📈 Pobieranie p50/95/99:", "stat_fetch", "#3F51B5"),
+                ("🧩 Parsowanie p50/95/99:", "stat_parse", "#795548")]
+        for row, (label, attr, color) in enumerate(live):
+            tk.Label(grid, text=label, width=22, anchor=tk.W, bg="#f0f0f0",
+                    font=("Arial", 10)).grid(row=row, column=2, sticky=tk.W, padx=(20, 0), pady=2)
+            value = tk.Label(grid, text="-", anchor=tk.W, font=("Arial", 10, "bold"), fg=color, bg="#f0f0f0")
+            value.grid(row=row, column=3, sticky=tk.W)
+            setattr(self, attr, value)
+        
+        self.stat_spark = tk.Label(f4, text="", anchor=tk.W, font=("Consolas", 12), fg="#4CAF50", bg="#f0f0f0")
+        self.stat_spark.pack(fill=tk.X)
+        self.stat_slow = tk.Label(f4, text="", anchor=tk.W, justify=tk.LEFT, font=("Consolas", 8),
+                                  fg="#666", bg="#f0f0f0")
+        self.stat_slow.pack(fill=tk.X)
+        
+        self.progress = ttk.Progressbar(f4, mode='indeterminate')
+        self.progress.pack(fill=tk.X, pady=5)
+        
+        # Konsola
+        f5 = tk.LabelFrame(self.root, text="📋 Logi", font=("Arial", 11, "bold"),
+                          bg="#f0f0f0", padx=10, pady=10)
+        f5.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.console = scrolledtext.ScrolledText(f5, height=15, font=("Consolas", 9),
+                                                 bg="#1e1e1e", fg="#d4d4d4", insertbackground="white")
+        self.console.pack(fill=tk.BOTH, expand=True)
+        
+        # Download
+        f6 = tk.Frame(self.root, bg="#f0f0f0", pady=10)
+        f6.pack(fill=tk.X, padx=10)
+        
+        self.dl_texts = tk.Button(f6, text="📥 Pobierz Teksty", font=("Arial", 11, "bold"),
+                                 bg="#2196F3", fg="white", command=self.download_texts,
+                                 cursor="hand2", padx=20, pady=8, state=tk.DISABLED)
+        self.dl_texts.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+        
+        self.dl_errors = tk.Button(f6, text="⚠️ Pobierz Errory", font=("Arial", 11, "bold"),
+                                  bg="#FF5722", fg="white", command=self.download_errors,
+                                  cursor="hand2", padx=20, pady=8, state=tk.DISABLED)
+        self.dl_errors.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+        
+        # Podgląd pojedynczej strony (indeks offsetów)
+        f7 = tk.Frame(self.root, bg="#f0f0f0", pady=5)
+        f7.pack(fill=tk.X, padx=10)
+        self.lookup_entry = tk.Entry(f7, font=("Arial", 10))
+        self.lookup_entry.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+        tk.Button(f7, text="🔎 Pokaż tekst strony", font=("Arial", 10, "bold"), command=self.show_page,
+                  cursor="hand2", padx=10).pack(side=tk.LEFT, padx=5)
+    
+    def start(self):
+        if self.running:
+            messagebox.showwarning("Ostrzeżenie", "Crawling już trwa!")
+            return
+        
+        # Walidacja
+        url = self.url_entry.get().strip()
+        if not url:
+            messagebox.showerror("Błąd", "Podaj URL!")
+            return
+        
+        try:
+            max_pages = int(self.max_pages.get())
+            workers = int(self.workers.get())
+            delay = float(self.delay.get())
+            
+            if max_pages < 1:
+                messagebox.showerror("Błąd", "Minimalna liczba stron to 1!")
+                return
+            if workers < 1:
+                messagebox.showerror("Błąd", "Minimalna liczba wątków to 1!")
+                return
+            if workers > Config.MAX_WORKERS:
+                messagebox.showerror("Błąd", f"Maksymalna liczba wątków to {Config.MAX_WORKERS}!")
+                return
+            if delay < Config.MIN_DELAY:
+                messagebox.showerror("Błąd", f"Minimalne opóźnienie to {Config.MIN_DELAY}s!")
+                return
+        except ValueError:
+            messagebox.showerror("Błąd", "Nieprawidłowe parametry!")
+            return
+        
+        # UI
+        self.stop_event.clear()
+        self.start_btn.config(state=tk.DISABLED, bg="#cccccc")
+        self.stop_btn.config(state=tk.NORMAL, bg="#F44336")
+        self.dl_texts.config(state=tk.DISABLED)
+        self.dl_errors.config(state=tk.DISABLED)
+        self.log.clear()
+        self.stat_visited.config(text="0")
+        self.stat_links.config(text="0")
+        self.stat_errors.config(text="0")
+        self.stat_time.config(text="0.0s")
+        for label in (self.stat_rate, self.stat_bytes, self.stat_in_flight, self.stat_fetch, self.stat_parse):
+            label.config(text="-")
+        self.stat_spark.config(text="")
+        self.stat_slow.config(text="")
+        self.progress.start()
+        
+        # Redirect
+        sys.stdout = self.log
+        
+        # Thread - do czasu przypisania nowego crawlera _tune() nie trafia w zakończony poprzedni
+        self.crawler = None
+        self.running = True
+        config = Config(url, max_pages, workers, delay)
+        config.normalize_url()
+        
+        threading.Thread(target=self._run, args=(config,), daemon=True).start()
+        self._schedule_stats_update()
+    
+    def _tune(self, event=None):
+        """Przekazuje zmienione wątki/opóźnienie do trwającego crawlingu"""
+        crawler = self.crawler
+        if not (self.running and crawler):
+            return
+        try:
+            workers = int(self.workers.get())
+            delay = float(self.delay.get())
+        except ValueError:
+            return
+        crawler.tune(workers, delay)
+    
+    def stop(self):
+        if self.running:
+            self.stop_event.set()
+            self.stop_btn.config(state=tk.DISABLED, bg="#cccccc")
+            print("\n⚠️  Żądanie przerwania... Proszę czekać...")
+    
+    def _run(self, config):
+        try:
+            start = time.time()
+            self.crawler = Crawler(config, self.stop_event, streams=[self.log])
+            self.crawler.run()
+            
+            # Bez deduplikacji w trakcie zapisu - osobne przejście po teksty.txt
+            if not config.dedupe and not self.stop_event.is_set():
+                Deduplicator(self.crawler.storage.texts_path, boilerplate=config.boilerplate,
+                             near_duplicates=config.near_duplicates).run()
+            print(f"\n⏱️  Całkowity czas (crawling + deduplikacja): {time.time() - start:.2f}s")
+            
+            self.root.after(0, lambda: self.dl_texts.config(state=tk.NORMAL))
+            if os.path.exists(self.crawler.storage.errors_path):
+                self.root.after(0, lambda: self.dl_errors.config(state=tk.NORMAL))
+        except Exception as e:
+            error_msg = f"Błąd podczas crawlingu:\n{e}"
+            self.root.after(0, lambda: messagebox.showerror("Błąd", error_msg))
+            print(f"\n❌ {error_msg}")
+        finally:
+            self.running = False
+            self.root.after(0, lambda: self.start_btn.config(state=tk.NORMAL, bg="#4CAF50"))
+            self.root.after(0, lambda: self.stop_btn.config(state=tk.DISABLED, bg="#cccccc"))
+            self.root.after(0, self.progress.stop)
+            self.root.after(100, self._final_stats_update)
+    
+    def _schedule_stats_update(self):
+        if self.running:
+            self._update_stats()
+            self.stats_job = self.root.after(300, self._schedule_stats_update)
+    
+    def _update_stats(self):
+        if self.crawler:
+            try:
+                v, l, e = self.crawler.stats.get_counts()
+                t = self.crawler.stats.get_elapsed_time()
+                self.stat_visited.config(text=str(v))
+                self.stat_links.config(text=str(l))
+                self.stat_errors.config(text=str(e))
+                self.stat_time.config(text=f"{t:.1f}s")
+                
+                m = self.crawler.metrics.snapshot()
+                self.stat_rate.config(text=f"{m.pages_per_s:.1f}")
+                self.stat_bytes.config(text=f"{m.bytes_per_s / 1024:.1f} KB/s")
+                self.stat_in_flight.config(text=str(m.in_flight))
+                self.stat_fetch.config(text=' / '.join(f"{x * 1000:.0f}" for x in m.fetch) + " ms")
+                self.stat_parse.config(text=' / '.join(f"{x * 1000:.1f}" for x in m.parse) + " ms")
+                self.stat_spark.config(text=f"{Metrics.sparkline(m.history)}  max {max(m.history)} stron/s")
+                self.stat_slow.config(text='\n'.join(f"🐢 {x * 1000:6.0f} ms  {url}" for x, url in m.slow[:3]))
+            except:
+                pass
+    
+    def _final_stats_update(self):
+        self._update_stats()
+    
+    def show_page(self):
+        url = self.lookup_entry.get().strip()
+        path = self.crawler.storage.texts_path if self.crawler else "teksty.txt"
+        paths = [p for p in ShardManifest.files(path) if os.path.exists(PageIndex.path(p))]
+        if not paths:
+            messagebox.showerror("Błąd", f"Brak indeksu {PageIndex.path(path)} (tylko zapis bez kompresji)!")
+            return
+        
+        try:
+            text = None
+            for p in paths:
+                with PageReader(p) as reader:
+                    text = reader.get(url)
+                if text is not None:
+                    break
+        except Exception as e:
+            messagebox.showerror("Błąd", f"Nie można odczytać strony:\n{e}")
+            return
+        if text is None:
+            messagebox.showinfo("Brak", f"Nie znaleziono strony:\n{url}")
+            return
+        
+        win = tk.Toplevel(self.root)
+        win.title(url)
+        win.geometry("700x500")
+        box = scrolledtext.ScrolledText(win, font=("Consolas", 9), wrap=tk.WORD)
+        box.pack(fill=tk.BOTH, expand=True)
+        box.insert(tk.END, text)
+        box.config(state=tk.DISABLED)
+    
+    def download_texts(self):
+        source = self.crawler.storage.unique_path if self.crawler else None
+        self._download(source or "teksty_unikalne.txt", "Zapisz teksty")
+    
+    def download_errors(self):
+        source = self.crawler.storage.errors_path if self.crawler else "error_links.txt"
+        self._download(source, "Zapisz errory")
+    
+    def _download(self, source, title):
+        if not os.path.exists(source):
+            messagebox.showerror("Błąd", f"Plik {source} nie istnieje!")
+            return
+        
+        dest = filedialog.asksaveasfilename(
+            title=title,
+            defaultextension=".txt",
+            filetypes=[("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")],
+            initialfile=os.path.splitext(source.replace(RecordFormat.EXT, ".txt"))[0]
+            if source.endswith(('.gz', '.zst')) else source.replace(RecordFormat.EXT, ".txt")
+        )
+        
+        if dest:
+            try:
+                # Kontener jest zapisywany jak teksty_unikalne.txt; pliki skompresowane rozpakowywane w locie
+                if RecordFormat.is_container(source):
+                    RecordFormat.to_text(source, dest, deduplicated=True)
+                else:
+                    with Compression.open_read(source) as src, open(dest, 'w', encoding='utf-8') as dst:
+                        shutil.copyfileobj(src, dst, Compression.BUFFER)
+                messagebox.showinfo("Sukces", f"Zapisano:\n{dest}")
+            except Exception as e:
+                messagebox.showerror("Błąd", f"Nie można zapisać pliku:\n{e}")
+
+
+# ============================================================================
+# WIERSZ POLECEŃ
+# ============================================================================
+def build_parser():
+    """Podkomendy: gui (domyślnie), crawl, dedupe, reextract; domyślne wartości crawl pochodzą z Config"""
+    defaults = Config()
+    parser = argparse.ArgumentParser(prog="app.py", description="🕷️ Web Crawler + Ekstraktor")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('gui', help="interfejs graficzny (domyślnie)")
+    
+    crawl = sub.add_parser('crawl', help="crawling bez GUI (serwery, zadania cykliczne)")
+    crawl.add_argument('url')
+    crawl.add_argument('--max-pages', type=int, default=defaults.max_pages)
+    crawl.add_argument('--workers', type=int, default=defaults.max_workers)
+    crawl.add_argument('--delay', type=float, default=defaults.delay, help=f"opóźnienie przed żądaniem (min {Config.MIN_DELAY}s)")
+    crawl.add_argument('--skip-duplicate-links', action='store_true')
+    crawl.add_argument('--durability', choices=Storage.DURABILITY, default=defaults.durability)
+    crawl.add_argument('--flush-interval', type=float, default=defaults.flush_interval)
+    crawl.add_argument('--compression', choices=sorted(Compression.METHODS), default=defaults.compression)
+    crawl.add_argument('--compression-level', type=int)
+    crawl.add_argument('--records', choices=sorted(RecordSink.FORMATS), help="dodatkowy zapis rekordów")
+    crawl.add_argument('--shard-mb', type=float)
+    crawl.add_argument('--shard-records', type=int)
+    crawl.add_argument('--warc', action='store_true', help="archiwum surowych odpowiedzi")
+    crawl.add_argument('--no-dedupe', action='store_true', help="bez deduplikacji w trakcie zapisu (osobne przejście)")
+    crawl.add_argument('--boilerplate', type=float)
+    crawl.add_argument('--near-duplicates', type=float)
+    crawl.add_argument('--texts-format', choices=Storage.TEXTS_FORMATS, default=defaults.texts_format)
+    crawl.add_argument('--log-level', choices=CrawlLog.LEVELS, default=defaults.log_level)
+    crawl.add_argument('--log-every', type=int, default=defaults.log_every, help="loguj co N-tą stronę")
+    crawl.add_argument('--log-errors-only', action='store_true')
+    crawl.add_argument('--log-json', help="plik logu JSON lines")
+    crawl.add_argument('--no-trap-detection', action='store_true', help="bez wykrywania pułapek URL")
+    crawl.add_argument('--trap-pattern-limit', type=int, default=defaults.trap_pattern_limit)
+    crawl.add_argument('--trap-same-outlinks', type=int, default=defaults.trap_same_outlinks)
+    crawl.add_argument('--trap-outlink-similarity', type=float, default=defaults.trap_outlink_similarity)
+    crawl.add_argument('--simhash', action='store_true', help="pomijaj prawie identyczne strony (SimHash)")
+    crawl.add_argument('--no-learn-non-html', action='store_true', help="bez uczenia się wzorców nie-HTML / 404")
+    crawl.add_argument('--non-html-path', default=defaults.non_html_path, help="plik wyuczonych wzorców")
+    
+    dedupe = sub.add_parser('dedupe', help="deduplikacja pliku tekstów")
+    dedupe.add_argument('input', nargs='?', default="teksty.txt")
+    dedupe.add_argument('output', nargs='?', default="teksty_unikalne.txt")
+    dedupe.add_argument('--boilerplate', type=float)
+    dedupe.add_argument('--near-duplicates', type=float)
+    dedupe.add_argument('--workers', type=int, default=1)
+    dedupe.add_argument('--incremental', action='store_true')
+    
+    reextract = sub.add_parser('reextract', help="ponowna ekstrakcja tekstu z archiwum WARC")
+    reextract.add_argument('warc', nargs='?', default="archiwum.warc.gz")
+    reextract.add_argument('--workers', type=int)
+    return parser
+
+
+def run_crawl(args):
+    config = Config(args.url, max_pages=args.max_pages, max_workers=args.workers, delay=args.delay,
+                    skip_duplicate_links=args.skip_duplicate_links, durability=args.durability,
+                    flush_interval=args.flush_interval, compression=args.compression,
+                    compression_level=args.compression_level, record_format=args.records,
+                    shard_mb=args.shard_mb, shard_records=args.shard_records, warc=args.warc,
+                    dedupe=not args.no_dedupe, boilerplate=args.boilerplate,
+                    near_duplicates=args.near_duplicates, texts_format=args.texts_format,
+                    log_level=args.log_level, log_every=args.log_every,
+                    log_errors_only=args.log_errors_only, log_json=args.log_json,
+                    trap_detection=not args.no_trap_detection, trap_pattern_limit=args.trap_pattern_limit,
+                    trap_same_outlinks=args.trap_same_outlinks, trap_outlink_similarity=args.trap_outlink_similarity,
+                    simhash=args.simhash, learn_non_html=not args.no_learn_non_html,
+                    non_html_path=args.non_html_path)
+    config.normalize_url()
+    
+    # Ctrl+C kończy crawling łagodnie - zapisane pliki zostają domknięte
+    stop_event = Event()
+    previous = signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    try:
+        crawler = Crawler(config, stop_event)
+        crawler.run()
+    finally:
+        signal.signal(signal.SIGINT, previous)
+    if not config.dedupe and not stop_event.is_set():
+        Deduplicator(crawler.storage.texts_path, boilerplate=config.boilerplate,
+                     near_duplicates=config.near_duplicates).run()
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'crawl':
+        return run_crawl(args)
+    if args.command == 'dedupe':
+        ok = Deduplicator(args.input, args.output, boilerplate=args.boilerplate, workers=args.workers,
+                          near_duplicates=args.near_duplicates,
+                          incremental=args.incremental).run()
+        return 0 if ok else 1
+    if args.command == 'reextract':
+        WarcReader(args.warc).reextract(workers=args.workers)
+        return 0
+    
+    root = tk.Tk()
+    GUI(root)
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,506 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import mmap
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event
+
+from app import (Compression, Config, ConsoleRedirect, CrawlLog, Crawler, Deduplicator, Metrics, PageIndex, RecordReader,
+                 Storage, WarcReader, WarcWriter, tk, zstandard)
+
+
+# ============================================================================
+# DANE SYNTETYCZNE
+# ============================================================================
+def synthetic_pages(count, seed=0):
+    """Generuje (url, tekst) przypominające wynik crawlingu (menu/stopki + treść)"""
+    rng = random.Random(seed)
+    words = [f"słowo{i}" for i in range(5000)]
+    boilerplate = ["• Strona główna", "• O nas", "• Kontakt", "Polityka cookies - akceptuję",
+                   "© 2025 Przykładowa firma. Wszelkie prawa zastrzeżone."]
+    for i in range(count):
+        lines = list(boilerplate)
+        for _ in range(rng.randint(10, 40)):
+            lines.append(' '.join(rng.choice(words) for _ in range(rng.randint(5, 20))))
+        lines.extend(boilerplate[:3])
+        yield f"https://example.com/strona/{i}", '\n'.join(lines)
+
+
+class SyntheticSite(BaseHTTPRequestHandler):
+    """Lokalny serwis HTTP: /strona/N z losowym tekstem, wspólnym menu i 5 linkami do losowych stron;
+    /archiwum/K wymienia 10 artykułów /artykul/N i następne archiwum - artykuły linkują tylko do menu;
+    /kalendarz/R/M to pułapka - pusty miesiąc z linkiem do następnego, w nieskończoność"""
+    pages = 0
+    words = [f"słowo{i}" for i in range(5000)]
+    menu = ''.join(f'<a href="/dzial/{i}">Dział {i}</a>' for i in range(20))
+    archive_menu = ''.join(f'<a href="/archiwum/{i}">Archiwum {i}</a>' for i in range(30))
+    
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if parts[0] == 'archiwum':
+            k = int(parts[1])
+            articles = ''.join(f'<a href="/artykul/{n}">Artykuł {n}</a>' for n in range(10 * k, 10 * k + 10))
+            body = f"<html><body>{self.archive_menu}{articles}<a href=\"/archiwum/{k + 1}\">starsze</a></body></html>"
+        elif parts[0] == 'artykul':
+            rng = random.Random(int(parts[1]))
+            text = ''.join(f"<p>{' '.join(rng.choice(self.words) for _ in range(15))}</p>" for _ in range(3))
+            body = f"<html><body>{self.archive_menu}<h1>Artykuł {parts[1]}</h1>{text}</body></html>"
+        elif parts[0] == 'kalendarz':
+            year, month = int(parts[1]), int(parts[2])
+            following = f"/kalendarz/{year + month // 12}/{month % 12 + 1}"
+            body = (f"<html><body><p>{'Kalendarz wydarzeń naszej organizacji - zapraszamy. ' * 5}</p>"
+                    f"<p>Brak wydarzeń w tym miesiącu</p><a href=\"{following}\">dalej</a></body></html>")
+        else:
+            n = int(parts[-1]) if parts[0] == 'strona' else 0
+            rng = random.Random(n)
+            links = ''.join(f'<a href="/strona/{m}">{m}</a>' for m in rng.sample(range(self.pages), min(5, self.pages)))
+            text = ''.join(f"<p>{' '.join(rng.choice(self.words) for _ in range(15))}</p>" for _ in range(10))
+            body = f"<html><body>{self.menu}<p>Strona {n}</p>{text}{links}</body></html>"
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def synthetic_site(pages):
+    """Uruchamia SyntheticSite w tle i zwraca adres pierwszej strony"""
+    handler = type('Site', (SyntheticSite,), {'pages': pages})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/strona/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def crawl_site(url, pages, sink, root=None, **options):
+    """Crawling lokalnego serwisu z logami do sink; z root (Tk) pętla GUI działa w wątku głównym. Zwraca strony/s"""
+    config = Config(url, max_pages=pages, max_workers=10, dedupe=False, **options)
+    config.delay = 0    # pomiar narzutu logowania, nie uprzejmości wobec serwera
+    crawler = Crawler(config, streams=[sink])
+    with contextlib.redirect_stdout(sink):
+        t0 = time.perf_counter()
+        if root is None:
+            crawler.run()
+        else:
+            worker = threading.Thread(target=crawler.run)
+            worker.start()
+            while worker.is_alive():
+                root.update()
+                time.sleep(0.005)
+            if isinstance(sink, ConsoleRedirect):
+                sink.drain()
+        elapsed = time.perf_counter() - t0
+    return crawler.stats.get_counts()[0] / elapsed
+
+
+# ============================================================================
+# BENCHMARKI
+# ============================================================================
+def bench_compression(args):
+    """Czas CPU i bajty zapisu teksty.txt dla różnych metod i poziomów kompresji"""
+    records = [f"{url}\n\n{text}\n\n{'_' * 80}\n\n" for url, text in synthetic_pages(args.pages)]
+    variants = [('none', None)] + [('gzip', l) for l in (1, 6, 9)]
+    if zstandard:
+        variants += [('zstd', l) for l in (1, 3, 10, 19)]
+
+    print(f"{'metoda':<8}{'poziom':>8}{'CPU [s]':>10}{'MB':>10}{'ratio':>8}{'MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_mb = None
+        for method, level in variants:
+            path = os.path.join(tmp, Compression.path("teksty.txt", method))
+            t0 = time.process_time()
+            with Compression.open_write(path, method, level) as f:
+                for rec in records:
+                    f.write(rec)
+            cpu = time.process_time() - t0
+            mb = os.path.getsize(path) / (1024 * 1024)
+            raw_mb = raw_mb or mb
+            print(f"{method:<8}{level if level is not None else '-':>8}{cpu:>10.2f}{mb:>10.1f}"
+                  f"{raw_mb / mb:>8.1f}{raw_mb / cpu if cpu else 0:>10.0f}")
+
+
+def bench_reextract(args):
+    """Ponowna ekstrakcja tekstu z archiwum WARC: strony/s dla 1..N procesów"""
+    pages = args.pages
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            warc = WarcWriter()
+            headers = {'Content-Type': 'text/html; charset=utf-8'}
+            for url, text in synthetic_pages(pages):
+                body = ''.join(f"<p>{line}</p>" for line in text.split('\n'))
+                warc.write(url, 200, headers, f"<html><body>{body}</body></html>".encode('utf-8'))
+            warc.close()
+            print(f"📦 Archiwum: {os.path.getsize(warc.path) / (1024 * 1024):.1f} MB, {pages} stron")
+            
+            for workers in sorted({1, 2, os.cpu_count() or 1}):
+                t0 = time.perf_counter()
+                WarcReader(warc.path).reextract(workers=workers)
+                elapsed = time.perf_counter() - t0
+                print(f"   procesów: {workers:>2} | {pages / elapsed:8.1f} stron/s")
+        finally:
+            os.chdir(cwd)
+
+
+def write_synthetic_file(path, mb):
+    """Zapisuje plik w formacie teksty.txt o rozmiarze ~mb MB (powtarzane strony syntetyczne)"""
+    block = [(url, text) for url, text in synthetic_pages(2000)]
+    target = mb * 1024 * 1024
+    written = 0
+    rnd = 0
+    with open(path, 'w', encoding='utf-8', buffering=Compression.BUFFER) as f:
+        while written < target:
+            for url, text in block:
+                written += f.write(f"{url}?r={rnd}\n\n{text}\n\n{'_' * 80}\n\n")
+            rnd += 1
+
+
+def bench_dedup_memory(args):
+    """Szczytowe RSS Deduplicatora (osobny proces) dla plików ~args.mb/16, /4 i args.mb MB - przy
+    przetwarzaniu strumieniowym ma być stałe, niezależne od rozmiaru wejścia"""
+    code = ("import resource, sys, time; sys.path.insert(0, sys.argv[1]); from app import Deduplicator; "
+            "t0 = time.time(); Deduplicator(sys.argv[2], sys.argv[3]).run(); "
+            "print('WYNIK', time.time() - t0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+    for mb in sorted({max(1, args.mb // 16), max(1, args.mb // 4), args.mb}):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "teksty.txt")
+            print(f"📝 Generuję {mb} MB...")
+            write_synthetic_file(src, mb)
+            out = subprocess.run([sys.executable, '-c', code, os.path.dirname(os.path.abspath(__file__)), src,
+                                  os.path.join(tmp, "wynik.txt")], capture_output=True, text=True).stdout
+            _, elapsed, rss = out.strip().splitlines()[-1].split()
+            size = os.path.getsize(src) / (1024 * 1024)
+            print(f"   wejście: {size:.0f} MB | czas: {float(elapsed):.1f}s | szczytowe RSS: {int(rss) / 1024:.0f} MB")
+
+
+def bench_dedup_parallel(args):
+    """Deduplikator równoległy: MB/s dla 1..N procesów (wynik identyczny jak sekwencyjny)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "teksty.txt")
+        print(f"📝 Generuję {args.mb} MB...")
+        write_synthetic_file(src, args.mb)
+        size = os.path.getsize(src) / (1024 * 1024)
+        reference = None
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            out = os.path.join(tmp, f"wynik-{workers}.txt")
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                Deduplicator(src, out, workers=workers).run()
+            elapsed = time.perf_counter() - t0
+            with open(out, 'rb') as f:
+                digest = hashlib.blake2b(f.read()).digest()
+            reference = reference or digest
+            print(f"   procesów: {workers:>2} | {elapsed:6.2f}s | {size / elapsed:7.1f} MB/s | "
+                  f"{'identyczny' if digest == reference else 'RÓŻNY!'}")
+
+
+def bench_dedup_incremental(args):
+    """Deduplikacja przyrostowa po dopisaniu ~10% stron vs pełne ponowne przetworzenie"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "teksty.txt")
+        print(f"📝 Generuję {args.mb} MB...")
+        write_synthetic_file(src, args.mb)
+        inc, full = os.path.join(tmp, "przyrostowo.txt"), os.path.join(tmp, "pelne.txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            Deduplicator(src, inc, incremental=True).run()
+        with open(src, 'a', encoding='utf-8') as f:
+            for url, text in synthetic_pages(args.pages, seed=1):
+                f.write(f"{url}?nowa=1\n\n{text}\n\n{'_' * 80}\n\n")
+        
+        timings = {}
+        for label, output, kwargs in (("przyrostowo", inc, {'incremental': True}), ("pełne", full, {})):
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                Deduplicator(src, output, **kwargs).run()
+            timings[label] = time.perf_counter() - t0
+        with open(inc, 'rb') as a, open(full, 'rb') as b:
+            same = a.read() == b.read()
+        print(f"   +{args.pages} stron | przyrostowo: {timings['przyrostowo']:.2f}s | "
+              f"pełne: {timings['pełne']:.2f}s | wynik {'identyczny' if same else 'RÓŻNY!'}")
+
+
+def bench_container(args):
+    """Skan i odczyt losowych rekordów: teksty.txt (separatory) vs kontener .rec (prefiks długości)"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for fmt in ('txt', 'rec'):
+                storage = Storage(texts_format=fmt)
+                for url, text in synthetic_pages(args.pages):
+                    storage.save_page(url, text)
+                storage.close()
+            with open(PageIndex.path("teksty.rec"), 'rb') as f:
+                rec_offsets = [e[1] for e in PageIndex.ENTRY.iter_unpack(f.read())]
+            with open(PageIndex.path("teksty.txt"), 'rb') as f:
+                txt_offsets = [e[1] for e in PageIndex.ENTRY.iter_unpack(f.read())]
+            
+            print(f"{'format':<8}{'MB':>8}{'skan [s]':>10}{'MB/s':>9}{'odczyt [µs]':>13}")
+            for fmt, path in (('txt', "teksty.txt"), ('rec', "teksty.rec")):
+                mb = os.path.getsize(path) / (1024 * 1024)
+                t0 = time.perf_counter()
+                if fmt == 'txt':
+                    # Bez długości trzeba szukać separatorów w całym tekście
+                    pages = sum(1 for s in Deduplicator(path, None)._file_sections(path) if s.strip())
+                else:
+                    with RecordReader(path) as reader:
+                        pages = sum(1 for _ in reader)
+                scan = time.perf_counter() - t0
+                
+                rng = random.Random(0)
+                picks = [rng.randrange(args.pages) for _ in range(1000)]
+                t0 = time.perf_counter()
+                if fmt == 'txt':
+                    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        for i in picks:
+                            start = txt_offsets[i]
+                            mm[start:mm.find(Storage.SEP.encode('ascii'), start)].decode('utf-8')
+                else:
+                    with RecordReader(path) as reader:
+                        for i in picks:
+                            reader.read_at(rec_offsets[i])
+                seek = (time.perf_counter() - t0) / len(picks) * 1e6
+                print(f"{fmt:<8}{mb:>8.1f}{scan:>10.2f}{mb / scan:>9.0f}{seek:>13.1f}   ({pages} stron)")
+        finally:
+            os.chdir(cwd)
+
+
+def bench_console(args):
+    """Przepustowość crawlingu: bez GUI vs konsola GUI (kolejka + after) vs stary insert z wątków"""
+    class ThreadInsert:
+        """Dawny ConsoleRedirect: insert/see/update_idletasks przy każdym wpisie, poza pętlą Tk"""
+        def __init__(self, widget):
+            self.widget = widget
+        
+        def write(self, text):
+            try:
+                self.widget.insert(tk.END, text)
+                self.widget.see(tk.END)
+                self.widget.update_idletasks()
+            except Exception:
+                pass
+        
+        def flush(self):
+            pass
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        root = None
+        print(f"⚠️  Brak wyświetlacza ({e}) - mierzę tylko tryb bez GUI")
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, synthetic_site(args.pages) as url:
+        os.chdir(tmp)
+        try:
+            with open(os.devnull, 'w') as devnull:
+                print(f"   bez GUI               | {crawl_site(url, args.pages, devnull):8.1f} stron/s")
+            if root is not None:
+                from tkinter import scrolledtext
+                console = scrolledtext.ScrolledText(root)
+                console.pack()
+                print(f"   GUI: kolejka + after  | {crawl_site(url, args.pages, ConsoleRedirect(console, root), root):8.1f} stron/s")
+                console.delete('1.0', tk.END)
+                print(f"   GUI: insert z wątków  | {crawl_site(url, args.pages, ThreadInsert(console), root):8.1f} stron/s")
+                root.destroy()
+        finally:
+            os.chdir(cwd)
+
+
+def bench_logging(args):
+    """Koszt logowania w wątkach crawlera (print vs CrawlLog) i przepustowość dla opcji próbkowania"""
+    calls, threads = 20000, 8
+    with tempfile.TemporaryDirectory() as tmp:
+        def caller_time(emit):
+            def worker(n):
+                for i in range(calls):
+                    emit(f"🔍 [{i}/{calls}] https://example.com/{n}/{i}", i)
+            
+            pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            t0 = time.perf_counter()
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            return (time.perf_counter() - t0) / (calls * threads) * 1e6
+        
+        print(f"{'wątki crawlera':<28}{'µs/wpis':>10}")
+        with open(os.path.join(tmp, "print.log"), 'w', encoding='utf-8') as f:
+            print(f"{'print()':<28}{caller_time(lambda msg, i: print(msg, file=f)):>10.2f}")
+        with open(os.path.join(tmp, "print.log"), 'w', encoding='utf-8', buffering=1) as f:
+            print(f"{'print() bufor liniowy (tty)':<28}{caller_time(lambda msg, i: print(msg, file=f)):>10.2f}")
+        for label, kwargs in (("CrawlLog", {}), ("CrawlLog co 100. strona", {'every': 100}),
+                              ("CrawlLog tylko błędy", {'errors_only': True})):
+            with open(os.path.join(tmp, "log.log"), 'w', encoding='utf-8') as f:
+                log = CrawlLog(streams=[f], **kwargs)
+                elapsed = caller_time(lambda msg, i: log.info(msg, page=i))
+                log.close()
+            print(f"{label:<28}{elapsed:>10.2f}")
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, synthetic_site(args.pages) as url:
+        os.chdir(tmp)
+        try:
+            print(f"\n{'crawling':<28}{'stron/s':>10}")
+            with open(os.devnull, 'w') as devnull:
+                for label, options in (("każda strona", {}), ("co 100. strona", {'log_every': 100}),
+                                       ("tylko błędy", {'log_errors_only': True}),
+                                       ("każda strona + JSONL", {'log_json': "crawl.jsonl"})):
+                    print(f"{label:<28}{crawl_site(url, args.pages, devnull, **options):>10.1f}")
+        finally:
+            os.chdir(cwd)
+
+
+def bench_metrics(args):
+    """Narzut Metrics: koszt rejestracji pobrania w wątkach crawlera i koszt migawki dla GUI"""
+    calls, threads = 20000, 8
+    metrics = Metrics()
+    rng = random.Random(0)
+    latencies = [rng.lognormvariate(-3, 1) for _ in range(calls)]
+    
+    def worker(n):
+        for i, elapsed in enumerate(latencies):
+            metrics.start_fetch()
+            metrics.end_fetch(f"https://example.com/{n}/{i}", elapsed, 20000)
+            if i % 4 == 0:
+                metrics.record_parse(elapsed / 10)
+    
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    per_fetch = (time.perf_counter() - t0) / (calls * threads) * 1e6
+    
+    t0 = time.perf_counter()
+    for _ in range(100):
+        snap = metrics.snapshot()
+    per_snapshot = (time.perf_counter() - t0) / 100 * 1e3
+    print(f"   rejestracja pobrania: {per_fetch:.2f} µs | migawka GUI: {per_snapshot:.2f} ms "
+          f"| p50/p95/p99: {' / '.join(f'{x * 1000:.0f}' for x in snap.fetch)} ms")
+
+
+def bench_startup(args):
+    """Start programu: czas importu app (-X importtime) i czas od uruchomienia do pierwszego żądania HTTP"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=root)
+    
+    def import_ms():
+        out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], capture_output=True,
+                             text=True, env=env, cwd=root).stderr
+        return int(out.strip().splitlines()[-1].split('|')[1]) / 1000
+    
+    print(f"   import app: {min(import_ms() for _ in range(5)):.0f} ms (najlepszy z 5)")
+    
+    first = []
+    
+    class FirstRequest(SyntheticSite):
+        def do_GET(self):
+            first.append(time.time())
+            super().do_GET()
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), type('Site', (FirstRequest,), {'pages': 1}))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/strona/0"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, command in (("python -m app crawl", ['-m', 'app']), ("python app.py crawl", [os.path.join(root, 'app.py')])):
+                timings = []
+                for _ in range(5):
+                    first.clear()
+                    t0 = time.time()
+                    subprocess.run([sys.executable, *command, 'crawl', url, '--max-pages', '1', '--log-level', 'error'],
+                                   capture_output=True, env=env, cwd=tmp)
+                    timings.append((first[0] - t0) * 1000)
+                print(f"   {label:<20} → pierwsze żądanie: {min(timings):.0f} ms (najlepszy z 5)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_tuning(args):
+    """Strojenie na żywo: 2 wątki, po 8 s zmiana na 20 (opóźnienie 0.3s) - przepustowość przed i po zmianie"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, synthetic_site(args.pages) as url, \
+            open(os.devnull, 'w') as devnull:
+        os.chdir(tmp)
+        try:
+            stop = Event()
+            crawler = Crawler(Config(url, max_pages=args.pages, max_workers=2, dedupe=False), stop, streams=[devnull])
+            worker = threading.Thread(target=crawler.run)
+            worker.start()
+            time.sleep(8)
+            crawler.tune(workers=20)
+            time.sleep(Metrics.WINDOW + 3)
+            stop.set()
+            worker.join()
+            for change in crawler.tuning:
+                print(f"   wątki 2 → {change['workers']} | przed: {change['before']:.1f} stron/s | "
+                      f"po: {change['after']:.1f} stron/s")
+        finally:
+            os.chdir(cwd)
+
+
+def bench_traps(args):
+    """Regresja TrapDetector: numerowany serwis /strona/N i artykuły z samym menu (te same linki wychodzące)
+    mają być pobrane w całości, kalendarz - zdławiony"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, synthetic_site(args.pages) as url, \
+            open(os.devnull, 'w') as devnull:
+        os.chdir(tmp)
+        try:
+            sites = (("serwis /strona/N", url), ("artykuły z samym menu", url.replace("/strona/0", "/archiwum/0")),
+                     ("kalendarz (pułapka)", url.replace("/strona/0", "/kalendarz/2000/1")))
+            for label, start in sites:
+                config = Config(start, max_pages=args.pages, max_workers=10, dedupe=False)
+                config.delay = 0
+                crawler = Crawler(config, streams=[devnull])
+                crawler.run()
+                visited = crawler.stats.get_counts()[0]
+                print(f"   {label:<22} | pobrane: {visited:>5} / limit {args.pages} | "
+                      f"pominięte: {crawler.traps.get_blocked()} | wzorce: {[p for p, _, _ in crawler.traps.report()]}")
+        finally:
+            os.chdir(cwd)
+
+
+BENCHMARKS = {
+    'kompresja': bench_compression,
+    'reextract': bench_reextract,
+    'dedup-pamiec': bench_dedup_memory,
+    'dedup-rownolegle': bench_dedup_parallel,
+    'dedup-przyrostowy': bench_dedup_incremental,
+    'kontener': bench_container,
+    'konsola': bench_console,
+    'logi': bench_logging,
+    'metryki': bench_metrics,
+    'start': bench_startup,
+    'strojenie': bench_tuning,
+    'pulapki': bench_traps,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarki crawlera i deduplikatora")
+    parser.add_argument('name', choices=sorted(BENCHMARKS))
+    parser.add_argument('--pages', type=int, default=5000, help="liczba syntetycznych stron")
+    parser.add_argument('--mb', type=int, default=5120, help="rozmiar pliku wejściowego (dedup-*)")
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args)
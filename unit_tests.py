@@ -1,6 +1,19 @@
+import io
+import json
+import random
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+
 import pytest
 
-from app import Config, DomainManager, HTMLParser
+import app
+from app import (Compression, Config, ConsoleRedirect, CrawlLog, Deduplicator, DomainManager, ErrorLog, HTMLParser, HTTPClient, LatencyHistogram,
+                 Metrics, MinHashIndex,
+                 NonHTMLLearner, PageReader, RecordFormat, RecordReader, ShardManifest, SimHashIndex, Stats, Storage,
+                 TrapDetector, WarcReader, WarcWriter)
 
 
 # =========================
@@ -56,3 +69,762 @@ def test_html_parser_extract_text_removes_scripts_and_keeps_content():
     assert "Nagłówek" in text
     assert "Paragraf" in text
     assert "• Element 1" in text
+
+
+# =========================
+# TEST 4: HTMLParser canonical + Stats przekierowania
+# =========================
+def test_html_parser_returns_canonical_url():
+    parser = HTMLParser(DomainManager("https://example.com"))
+    html = '<html><head><link rel="canonical" href="/strona?sort=asc"></head><body><p>Tekst</p></body></html>'
+
+    _, _, text, canonical = parser.parse("https://example.com/strona/print", html)
+
+    assert canonical == "https://example.com/strona"
+    assert "Tekst" in text
+
+
+def test_stats_rewrites_links_to_known_redirect_targets():
+    stats = Stats()
+    stats.mark_visited("https://example.com/a")
+    stats.mark_alias("https://example.com/a", "https://example.com/b")
+
+    added = stats.add_queued(["https://example.com/b", "https://example.com/c"])
+
+    assert added == ["https://example.com/c"]
+    assert stats.avoided == 1
+
+
+def test_stats_does_not_count_filtered_links():
+    stats = Stats()
+    calls = []
+
+    def no_calendar(urls):
+        calls.append(urls)
+        return [url for url in urls if "kalendarz" not in url]
+
+    urls = ["https://example.com/a", "https://example.com/kalendarz/1"]
+    assert stats.add_queued(urls, no_calendar) == ["https://example.com/a"]
+    assert stats.add_queued(urls, no_calendar) == []
+    assert stats.get_counts()[1] == 1
+    assert calls == [urls]
+
+
+# =========================
+# TEST 5: TrapDetector
+# =========================
+def test_trap_detector_blocks_repeated_segments_and_throttles_patterns():
+    traps = TrapDetector(pattern_limit=3, throttle=10)
+
+    assert traps.filter(["https://example.com/a/a/a/a/strona"]) == []
+    # Puste strony kalendarza - treść w większości zduplikowana
+    for i in range(TrapDetector.MIN_OBSERVED):
+        traps.observe_page(f"https://example.com/kalendarz/{100 + i}", [], duplicate=True)
+    allowed = traps.filter([f"https://example.com/kalendarz/{i}" for i in range(1, 11)])
+
+    assert len(allowed) == 3 + 1
+    assert traps.template("https://example.com/kalendarz/2024/5") == "example.com/kalendarz/{n}/{n}"
+    assert traps.get_blocked() == 1 + 6
+
+
+def test_trap_detector_throttles_pages_with_identical_outlinks():
+    traps = TrapDetector(same_outlinks=2, throttle=10)
+    menu = [f"https://example.com/dzial/{i}" for i in range(10)]
+
+    # Filtry /lista?sort=N pokazują dokładnie te same linki i tę samą treść
+    for sort in range(1, TrapDetector.MIN_OBSERVED + 1):
+        traps.observe_page(f"https://example.com/lista/{sort}", menu, duplicate=True)
+
+    assert traps.filter(["https://example.com/lista/3"]) == []
+    assert traps.report()[0][1] == TrapDetector.SAME_OUTLINKS
+
+
+def test_trap_detector_allows_numbered_articles_and_catalogues():
+    traps = TrapDetector()
+    menu = [f"https://example.com/dzial/{i}" for i in range(30)]
+
+    for n in range(1, 300):
+        related = [f"https://example.com/artykul/{(n * 7 + k) % 5000}" for k in range(5)]
+        traps.observe_page(f"https://example.com/artykul/{n}", menu + related)
+        traps.filter(related)
+    new = [f"https://example.com/artykul/{n}" for n in range(1000, 1100)]
+    assert traps.filter(new) == new
+
+    products = [f"https://example.com/produkt/{n}" for n in range(1000)]
+    for n, url in enumerate(products[:50]):
+        traps.observe_page(url, menu + products[n + 1:n + 4])
+    assert traps.filter(products) == products
+
+    # Artykuły linkujące tylko do menu serwisu - te same linki, ale własna treść
+    for n in range(39):
+        traps.observe_page(f"https://example.com/wiadomosci/{n}", menu)
+    new = [f"https://example.com/wiadomosci/{n}" for n in range(39, 139)]
+    assert traps.filter(new) == new
+    assert traps.report() == []
+
+
+# =========================
+# TEST 6: SimHashIndex
+# =========================
+def test_simhash_index_detects_near_duplicate_pages():
+    index = SimHashIndex()
+    text = " ".join(f"słowo{i}" for i in range(200))
+
+    assert index.add("https://example.com/a", text) is None
+    assert index.add("https://example.com/a?print=1", text + " wersja do druku") == "https://example.com/a"
+    assert index.add("https://example.com/b", " ".join(f"inne{i}" for i in range(200))) is None
+    assert index.add("https://example.com/krotka", "za krótki tekst") is None
+
+
+def test_simhash_fingerprint_is_identical_without_numpy(monkeypatch):
+    text = " ".join(f"słowo{i % 37} Zażółć {i}" for i in range(300))
+    expected = SimHashIndex().fingerprint(text)
+    monkeypatch.setattr(app, "np", None)
+
+    assert SimHashIndex().fingerprint(text) == expected
+
+
+def test_simhash_keeps_distinct_articles_sharing_a_template():
+    rng = random.Random(7)
+    words = [f"słowo{i}" for i in range(5000)]
+    menu = "\n".join(" ".join(rng.choice(words) for _ in range(10)) for _ in range(30))
+    footer = "\n".join(" ".join(rng.choice(words) for _ in range(10)) for _ in range(10))
+    template, index = app.TemplateLines(), SimHashIndex()
+
+    saved = 0
+    for i in range(200):
+        body = " ".join(rng.choice(words) for _ in range(20))
+        content = template.strip(f"{menu}\nArtykuł {i}\n{body}\n{footer}")
+        saved += index.add(f"https://example.com/artykul/{i}", content) is None
+        assert not template.is_template_only(content)
+
+    assert saved == 200
+    assert index.add("https://example.com/artykul/0?print=1", content) == "https://example.com/artykul/199"
+    assert template.is_template_only(template.strip(f"{menu}\nKalendarz 2024/5\n{footer}"))
+    assert Config().simhash is False
+
+
+# =========================
+# TEST 7: Stats - identyczna treść
+# =========================
+def test_stats_records_identical_content_as_alias():
+    stats = Stats()
+    digest = HTTPClient.content_hash("<html><body>Ta sama treść</body></html>".encode("utf-8"))
+
+    assert stats.claim_content(digest, "https://example.com/a") is None
+    assert stats.claim_content(digest, "https://example.com/a/") == "https://example.com/a"
+    assert stats.content_aliases == {"https://example.com/a/": "https://example.com/a"}
+
+
+# =========================
+# TEST 8: NonHTMLLearner
+# =========================
+def test_non_html_learner_skips_learned_patterns_across_runs(tmp_path):
+    path = str(tmp_path / "wzorce.json")
+    learner = NonHTMLLearner(path, min_samples=3)
+
+    for i in range(3):
+        learner.record(f"https://example.com/download/{i}", False, "Nie-HTML (Content-Type: application/pdf)")
+    learner.record("https://example.com/artykul/1", True)
+    learner.save()
+
+    again = NonHTMLLearner(path, min_samples=3)
+    urls = ["https://example.com/download/99", "https://example.com/artykul/2"]
+
+    assert again.filter(urls) == ["https://example.com/artykul/2"]
+    assert again.skipped == 1
+
+
+def test_non_html_learner_file_stays_bounded_after_html_crawls(tmp_path):
+    path = str(tmp_path / "wzorce.json")
+    for run in range(3):
+        learner = NonHTMLLearner(path, min_samples=3, max_saved=5)
+        for i in range(2000):
+            learner.record(f"https://serwis{run}-{i}.example/artykul/{i}", True)
+        for i in range(10):
+            for k in range(3 + i):
+                learner.record(f"https://example.com/{'abcdefghij'[i]}/{k}.pdf", False, "Nie-HTML (Content-Type: application/pdf)")
+        learner.save()
+
+    saved = json.loads((tmp_path / "wzorce.json").read_text(encoding="utf-8"))
+    assert sorted(saved) == [f"example.com/{c}/{{n}}.pdf" for c in "fghij"]
+    assert NonHTMLLearner(path, min_samples=3).filter(["https://example.com/j/1.pdf"]) == []
+
+
+def test_non_html_learner_ignores_transient_errors(tmp_path):
+    learner = NonHTMLLearner(str(tmp_path / "wzorce.json"), min_samples=3)
+
+    for i in range(5):
+        learner.record(f"https://example.com/api/{i}", False, "HTTPError: 503 Server Error", 503)
+        learner.record(f"https://example.com/szukaj/{i}", False, "HTTPError: 429 Too Many Requests", 429)
+        learner.record(f"https://example.com/stare/{i}", False, "HTTPError: 404 Not Found", 404)
+
+    assert [pattern for pattern, _, _ in learner.report()] == ["example.com/stare/{n}"]
+
+
+# =========================
+# TEST 9: Storage - zapis w tle
+# =========================
+def test_storage_writes_pages_through_background_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(durability='fsync', flush_interval=0.05)
+
+    for i in range(300):
+        assert storage.save_page(f"https://example.com/{i}", f"Tekst {i}") is True
+    storage.close()
+
+    texts = (tmp_path / "teksty.txt").read_text(encoding="utf-8")
+    links = (tmp_path / "all_links.txt").read_text(encoding="utf-8").splitlines()
+
+    assert storage.save_page("https://example.com/po-zamknieciu", "x") is False
+    assert links == [f"https://example.com/{i}" for i in range(300)]
+    assert texts.count(Storage.SEP) == 300
+    assert storage.get_write_stats()[0] == 300
+
+
+# =========================
+# TEST 10: Kompresja wyjścia
+# =========================
+def test_storage_gzip_output_is_read_transparently_by_deduplicator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(compression='gzip', level=1)
+    storage.save_page("https://example.com/a", "linia\nlinia\ninna")
+    storage.close()
+
+    assert storage.texts_path == "teksty.txt.gz"
+    with Compression.open_read(storage.texts_path) as f:
+        assert f.read().startswith("https://example.com/a\n\nlinia")
+
+    assert Deduplicator(storage.texts_path, "wynik.txt").run() is True
+    assert (tmp_path / "wynik.txt").read_text(encoding="utf-8").count("linia") == 1
+
+
+# =========================
+# TEST 11: Rekordy JSONL / SQLite
+# =========================
+def test_storage_writes_structured_records(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for fmt in ('jsonl', 'sqlite'):
+        storage = Storage(record_format=fmt)
+        storage.save_page("https://example.com/a", "Tekst\n" + Storage.SEP, final_url="https://example.com/b",
+                          status=200, size=120, fetch_ms=12.5, parse_ms=1.5, content_hash="ab12")
+        storage.close()
+
+    with open("strony.jsonl", encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    row = sqlite3.connect("strony.sqlite").execute("SELECT final_url, status, text FROM strony").fetchone()
+
+    assert record["final_url"] == "https://example.com/b" and record["content_hash"] == "ab12"
+    assert row == ("https://example.com/b", 200, "Tekst\n" + Storage.SEP)
+
+
+# =========================
+# TEST 12: PageReader (indeks offsetów)
+# =========================
+def test_page_reader_returns_single_page_and_splits_ranges(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage()
+    for i in range(10):
+        storage.save_page(f"https://example.com/{i}", f"Zażółć {i}\n" + "_" * 80)
+    storage.close()
+
+    with PageReader(storage.texts_path) as reader:
+        assert reader.is_complete()
+        assert reader.get("https://example.com/7") == "Zażółć 7\n" + "_" * 80
+        assert reader.get("https://example.com/brak") is None
+        pages = [page for start, end in reader.ranges(3) for page in reader.pages(start, end)]
+
+    assert [url for url, _ in pages] == [f"https://example.com/{i}" for i in range(10)]
+
+
+# =========================
+# TEST 13: Shardy wyjścia
+# =========================
+def test_storage_rotates_shards_with_manifest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(shard_records=4)
+    for i in range(10):
+        storage.save_page(f"https://example.com/{i}", f"Tekst {i}")
+    storage.close()
+
+    entries = ShardManifest.read(storage.texts_path)
+
+    assert [e['records'] for e in entries] == [4, 4, 2]
+    assert ShardManifest.files(storage.texts_path) == ["teksty-00000.txt", "teksty-00001.txt", "teksty-00002.txt"]
+    assert ShardManifest.verify(storage.texts_path) == []
+
+
+# =========================
+# TEST 14: Archiwum WARC
+# =========================
+def test_warc_stores_identical_bodies_once_and_reextracts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    warc = WarcWriter()
+    body = "<html><body><p>Zażółć gęślą jaźń</p><script>x()</script></body></html>".encode("utf-8")
+    headers = {"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"}
+    warc.write("https://example.com/a", 200, headers, body)
+    warc.write("https://example.com/a?ref=1", 200, headers, body)
+    warc.close()
+
+    reader = WarcReader(warc.path)
+    types = [fields["WARC-Type"] for fields, _ in reader.records()]
+
+    assert types == ["response", "revisit"]
+    assert [(url, b) for url, _, b in reader.responses()] == [("https://example.com/a", body)]
+    assert reader.reextract(workers=1) == 1
+    assert "Zażółć gęślą jaźń" in (tmp_path / "teksty.txt").read_text(encoding="utf-8")
+
+
+# =========================
+# TEST 15: ErrorLog
+# =========================
+def test_error_log_aggregates_and_bounds_written_entries(tmp_path):
+    log = ErrorLog(str(tmp_path / "error_links.txt"), per_key=2)
+    for i in range(100):
+        log.add(f"/zly | Niepoprawny URL (brak schematu/domeny) | Źródło: https://example.com/{i}")
+    log.add("https://example.com/x | HTTPError: 404 Client Error: Not Found for url: https://example.com/x")
+    log.close()
+
+    classes, offenders = log.summary()
+
+    assert log.count() == 101
+    assert classes == {"Niepoprawny URL": 100, "HTTPError 404": 1}
+    assert offenders[0] == (("Niepoprawny URL", "/zly"), 100)
+    assert offenders[1] == (("HTTPError 404", "example.com"), 1)
+    assert len((tmp_path / "error_links.txt").read_text(encoding="utf-8").splitlines()) == 3
+
+
+# =========================
+# TEST 16: Deduplicator strumieniowy
+# =========================
+def test_deduplicator_streams_across_chunk_boundaries(tmp_path, monkeypatch):
+    sep = "_" * 80
+    src = tmp_path / "teksty.txt"
+    src.write_text("".join(f"url{i}\n\nmenu\nmenu\ntreść {i}\n\n{sep}\n\n" for i in range(50)), encoding="utf-8")
+    monkeypatch.setattr(Deduplicator, "CHUNK", 37)
+
+    Deduplicator(str(src), str(tmp_path / "wynik.txt")).run()
+    sections = (tmp_path / "wynik.txt").read_text(encoding="utf-8").split("_" * 50 + "\n")
+
+    assert len(sections) == 50
+    assert all(s.count("menu") == 1 for s in sections)
+    assert "treść 49" in sections[-1]
+
+
+# =========================
+# TEST 17: Boilerplate
+# =========================
+def test_deduplicator_removes_site_wide_boilerplate(tmp_path):
+    sep = "_" * 80
+    src = tmp_path / "teksty.txt"
+    src.write_text("".join(f"https://example.com/{i}\n\n• Menu\n{'Rzadka linia' if i < 2 else ''}\ntreść {i}\n\n"
+                           f"{sep}\n\n" for i in range(100)), encoding="utf-8")
+    out = tmp_path / "wynik.txt"
+
+    dedup = Deduplicator(str(src), str(out), boilerplate=0.5)
+    dedup.run()
+    text = out.read_text(encoding="utf-8")
+
+    assert "• Menu" not in text
+    assert text.count("Rzadka linia") == 2
+    assert "treść 99" in text
+    assert dedup.removed_bytes == 100 * len("• Menu\n".encode("utf-8"))
+
+
+# =========================
+# TEST 18: Deduplikacja w trakcie zapisu
+# =========================
+def test_storage_inline_dedupe_matches_post_crawl_pass(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(dedupe=True, batch_size=7)
+    for i in range(30):
+        storage.save_page(f"https://example.com/{i}", f"menu\nmenu\ntreść {i}\nmenu" + ("\n" if i % 2 else ""))
+    storage.close()
+
+    post = Deduplicator("teksty.txt", "dwa_przejscia.txt")
+    post.run()
+
+    assert (tmp_path / "teksty_unikalne.txt").read_bytes() == (tmp_path / "dwa_przejscia.txt").read_bytes()
+    assert (storage.dedup.total_lines, storage.dedup.unique_lines) == (post.total_lines, post.unique_lines)
+
+
+def test_storage_inline_dedupe_removes_boilerplate_after_warmup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage(dedupe=True, boilerplate=0.5)
+    for i in range(Deduplicator.WARMUP + 20):
+        storage.save_page(f"https://example.com/{i}", f"• Strona główna\ntreść {i}")
+    storage.close()
+
+    text = (tmp_path / "teksty_unikalne.txt").read_text(encoding="utf-8")
+    assert "• Strona główna" not in text
+    assert text.count("treść") == Deduplicator.WARMUP + 20
+
+
+# =========================
+# TEST 19: Deduplicator równoległy
+# =========================
+def test_parallel_deduplicator_matches_serial_output(tmp_path, monkeypatch):
+    sep = "_" * 80
+    src = tmp_path / "teksty.txt"
+    src.write_text("".join(f"url{i}\n\nmenu\nmenu\n{'_' * (i % 90)}\ntreść {i}\n\n{sep}\n\n" for i in range(200)),
+                   encoding="utf-8")
+    monkeypatch.setattr(Deduplicator, "RANGE", 500)
+
+    Deduplicator(str(src), str(tmp_path / "serial.txt")).run()
+    Deduplicator(str(src), str(tmp_path / "parallel.txt"), workers=2).run()
+
+    assert (tmp_path / "serial.txt").read_bytes() == (tmp_path / "parallel.txt").read_bytes()
+
+
+def test_parallel_deduplicator_uses_page_index_for_embedded_separators(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage()
+    for i in range(60):
+        storage.save_page(f"https://example.com/{i}", f"menu\nmenu\n{'_' * 80}\ntreść {i}")
+    storage.close()
+    monkeypatch.setattr(Deduplicator, "RANGE", 500)
+
+    Deduplicator("teksty.txt", "serial.txt").run()
+    Deduplicator("teksty.txt", "parallel.txt", workers=2).run()
+
+    assert (tmp_path / "serial.txt").read_text(encoding="utf-8").count("menu") == 60
+    assert (tmp_path / "serial.txt").read_bytes() == (tmp_path / "parallel.txt").read_bytes()
+
+
+# =========================
+# TEST 20: MinHash LSH
+# =========================
+def test_minhash_drops_near_duplicate_paragraphs_across_sections(tmp_path):
+    sep = "_" * 80
+    pages = [f"https://example.com/{i}\n\nOpublikowano {i + 2} dni temu przez redakcję portalu informacyjnego\n"
+             f"Unikalny akapit numer {'abcdefghij'[i]} o zupełnie innej treści strony\n\n{sep}\n\n" for i in range(10)]
+    src = tmp_path / "teksty.txt"
+    src.write_text("".join(pages), encoding="utf-8")
+
+    dedup = Deduplicator(str(src), str(tmp_path / "wynik.txt"), near_duplicates=0.8)
+    dedup.run()
+    text = (tmp_path / "wynik.txt").read_text(encoding="utf-8")
+
+    assert text.count("Opublikowano") == 1
+    assert text.count("Unikalny akapit") == 10
+    assert dedup.near_removed == 9
+
+
+def test_minhash_signature_is_identical_without_numpy(monkeypatch):
+    text = "Zażółć gęślą jaźń - polityka cookies, akceptuję wszystkie pliki 2025"
+    expected = MinHashIndex().signature(text)
+    monkeypatch.setattr(app, "np", None)
+
+    assert MinHashIndex().signature(text) == expected
+    assert MinHashIndex.choose_bands(64, 0.8) == (8, 8)
+
+
+def test_minhash_index_keeps_compact_bounded_signatures():
+    rng = random.Random(5)
+    paragraphs = [" ".join("".join(rng.choice("abcdefghij") for _ in range(6)) for _ in range(8)) for _ in range(200)]
+    index = MinHashIndex(max_signatures=50)
+    for paragraph in paragraphs:
+        assert index.add(paragraph) is False
+
+    assert len(index.signatures) == 50 * 64 and index.signatures.itemsize == 8
+    assert all(bucket.size == 50 for bucket in index.buckets)
+    assert index.add(paragraphs[-1]) is True
+    assert index.add(paragraphs[0]) is False
+
+    restored = MinHashIndex(max_signatures=50)
+    restored.restore(index.export())
+    assert restored.export() == index.export()
+    assert restored.add(paragraphs[-2]) is True
+
+
+def test_int_map_matches_dict_with_removals():
+    rng = random.Random(3)
+    table, expected = app.IntMap(capacity=8), {}
+    for step in range(5000):
+        key = rng.randrange(-300, 300) * (1 << 40)
+        if rng.random() < 0.4 and key in expected:
+            table.remove(key, expected.pop(key))
+        else:
+            table.set(key, step)
+            expected[key] = step
+    assert table.size == len(expected)
+    assert all(table.get(key) == expected.get(key) for key in range(-300 << 40, 300 << 40, 1 << 40))
+
+
+# =========================
+# TEST 21: Deduplikacja przyrostowa
+# =========================
+def test_incremental_dedupe_appends_only_new_sections(tmp_path):
+    sep = "_" * 80
+    src = tmp_path / "teksty.txt"
+    out = tmp_path / "wynik.txt"
+    page = lambda i: f"https://example.com/{i}\n\nmenu\nmenu\ntreść {i}\n\n{sep}\n\n"
+    src.write_text("".join(page(i) for i in range(20)), encoding="utf-8")
+    Deduplicator(str(src), str(out), incremental=True).run()
+
+    with open(src, "a", encoding="utf-8") as f:
+        f.write("".join(page(i) for i in range(20, 30)))
+    dedup = Deduplicator(str(src), str(out), incremental=True)
+    dedup.run()
+    Deduplicator(str(src), str(tmp_path / "pelne.txt")).run()
+
+    assert dedup.sections == 10
+    assert out.read_bytes() == (tmp_path / "pelne.txt").read_bytes()
+    assert (tmp_path / "wynik.txt.state").exists()
+
+
+# =========================
+# TEST 22: Kontener rekordów
+# =========================
+def test_record_container_is_binary_safe_and_checksummed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pages = [("https://example.com/a", "tekst z separatorem\n" + "_" * 80 + "\ndalej"), ("https://example.com/b", "")]
+    storage = Storage(texts_format="rec")
+    for url, text in pages:
+        storage.save_page(url, text)
+    storage.close()
+
+    with RecordReader("teksty.rec") as reader:
+        assert list(reader) == pages
+    with PageReader("teksty.rec") as reader:
+        assert reader.is_complete() and reader.get("https://example.com/a") == pages[0][1]
+
+    data = bytearray((tmp_path / "teksty.rec").read_bytes())
+    data[-5] ^= 0x01
+    (tmp_path / "uszkodzony.rec").write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        with RecordReader("uszkodzony.rec") as reader:
+            list(reader)
+
+
+def test_record_container_converts_to_and_from_legacy_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage()
+    for i in range(5):
+        storage.save_page(f"https://example.com/{i}", f"menu\nmenu\ntreść {i}")
+    storage.close()
+
+    assert RecordFormat.from_text("teksty.txt", "teksty.rec") == 5
+    assert RecordFormat.to_text("teksty.rec", "z_powrotem.txt") == 5
+    assert (tmp_path / "z_powrotem.txt").read_bytes() == (tmp_path / "teksty.txt").read_bytes()
+
+    Deduplicator("teksty.txt", "z_tekstu.txt").run()
+    Deduplicator("teksty.rec", "z_kontenera.txt").run()
+    assert (tmp_path / "z_tekstu.txt").read_bytes() == (tmp_path / "z_kontenera.txt").read_bytes()
+
+
+def test_deduplicated_container_matches_deduplicated_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage()
+    for i in range(5):
+        storage.save_page(f"https://example.com/{i}", f"menu\nmenu\ntreść {i % 3}" if i != 2 else "")
+    storage.close()
+
+    Deduplicator("teksty.txt", "teksty_unikalne.txt").run()
+    Deduplicator("teksty.txt", "teksty_unikalne.rec").run()
+    with RecordReader("teksty_unikalne.rec") as reader:
+        records = list(reader)
+    # Każdy rekord bez pustych linii na początku - także pierwszy
+    assert records[0] == ("https://example.com/0", "menu\ntreść 0")
+    assert all(not text.startswith('\n') for _, text in records)
+
+    assert RecordFormat.to_text("teksty_unikalne.rec", "z_kontenera.txt", deduplicated=True) == 5
+    assert (tmp_path / "z_kontenera.txt").read_bytes() == (tmp_path / "teksty_unikalne.txt").read_bytes()
+
+
+# =========================
+# TEST 23: Konsola GUI (kolejka + bufor pierścieniowy)
+# =========================
+class FakeText:
+    """Zastępuje ScrolledText: zapamiętuje tekst i wątki, które go dotykały"""
+    def __init__(self):
+        self.text = ""
+        self.threads = set()
+        self.jobs = []
+
+    def after(self, ms, func):
+        self.jobs.append(func)
+
+    def insert(self, index, text):
+        self.threads.add(threading.get_ident())
+        self.text += text
+
+    def index(self, index):
+        return f"{self.text.count(chr(10)) + 1}.0"
+
+    def delete(self, start, end):
+        self.text = "" if end == "end" else self.text.split("\n", int(end.split(".")[0]) - 1)[-1]
+
+    def see(self, index):
+        pass
+
+
+def test_console_redirect_batches_writes_on_gui_thread(monkeypatch):
+    monkeypatch.setattr(app, "tk", None)    # bez importu tkinter
+    widget = FakeText()
+    log = ConsoleRedirect(widget)
+
+    def worker(n):
+        for i in range(3000):
+            print(f"wątek {n} linia {i}", file=log)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert widget.text == "" and not widget.threads
+
+    assert log.drain() == ConsoleRedirect.MAX_LINES * 2    # nadmiar odrzucony już w kolejce
+    assert widget.threads == {threading.get_ident()}
+    lines = widget.text.split("\n")
+    assert len(lines) <= ConsoleRedirect.MAX_LINES and lines[-1] == ""
+    assert "linia 2999\n" in widget.text
+
+    print("nowa linia", file=log)
+    assert log.drain() == 2 and widget.text.endswith("nowa linia\n")
+    assert len(widget.text.split("\n")) <= ConsoleRedirect.MAX_LINES
+
+
+# =========================
+# TEST 24: Logi z poziomami i próbkowaniem
+# =========================
+def test_crawl_log_samples_pages_and_writes_jsonl(tmp_path):
+    console = io.StringIO()
+    log = CrawlLog(every=3, json_path=str(tmp_path / "crawl.jsonl"), streams=[console])
+    log.info("start")
+    for page in range(1, 10):
+        log.info(f"strona {page}", page=page, url=f"https://example.com/{page}")
+    log.error("błąd 4", page=4, url="https://example.com/4")
+    log.debug("szczegóły")
+    log.close()
+
+    assert console.getvalue().splitlines() == ["start", "strona 3", "strona 6", "strona 9", "błąd 4"]
+    entries = [json.loads(line) for line in (tmp_path / "crawl.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [e["msg"] for e in entries] == ["start", "strona 3", "strona 6", "strona 9", "błąd 4"]
+    assert entries[-1]["level"] == "error" and entries[-1]["url"] == "https://example.com/4"
+
+    quiet = io.StringIO()
+    log = CrawlLog(errors_only=True, streams=[quiet])
+    log.info("strona 1", page=1)
+    log.warning("⚠️  Przerwano")
+    log.error("błąd 2", page=2)
+    log.close()
+    assert quiet.getvalue().splitlines() == ["⚠️  Przerwano", "błąd 2"]
+
+
+# =========================
+# TEST 25: Metryki na żywo
+# =========================
+def test_latency_histogram_percentiles_are_within_bucket_error():
+    rng = random.Random(0)
+    samples = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+    hist = LatencyHistogram()
+    for x in samples:
+        hist.record(x)
+    exact = sorted(samples)
+    for p, approx in zip((50, 95, 99), hist.percentiles(50, 95, 99)):
+        value = exact[-(-p * len(exact) // 100) - 1]
+        assert abs(approx - value) / value < 1 / LatencyHistogram.SUB
+    assert LatencyHistogram().percentiles(50) == [0.0]
+
+
+def test_metrics_snapshot_tracks_rate_in_flight_and_slowest(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: clock[0])
+    metrics = Metrics()
+    for second in range(3):
+        for i in range(4):
+            metrics.start_fetch()
+            metrics.end_fetch(f"https://example.com/{second}/{i}", 0.01 * (i + 1) + second, 1000)
+        clock[0] += 1
+    metrics.start_fetch()
+    metrics.record_parse(0.002)
+
+    snap = metrics.snapshot()
+    assert snap.pages_per_s == 12 / Metrics.WINDOW and snap.bytes_per_s == 12000 / Metrics.WINDOW
+    assert snap.in_flight == 1 and snap.history[-3:] == [4, 4, 4]
+    assert [url for _, url in snap.slow[:2]] == ["https://example.com/2/3", "https://example.com/2/2"]
+    assert len(snap.slow) == Metrics.SLOW and snap.parse[0] == pytest.approx(0.002, rel=0.05)
+    assert Metrics.sparkline([0, 1, 4]) == "▁▂█"
+
+
+# =========================
+# TEST 26: CLI bez GUI i leniwe importy
+# =========================
+def test_import_app_skips_heavy_modules():
+    code = ("import sys, app; print(','.join(m for m in ('tkinter', 'numpy', 'requests', 'bs4', 'pyarrow') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=app.os.path.dirname(app.__file__)).stdout
+    assert out.strip() == ""
+
+
+def test_lazy_module_missing_attribute_raises_attribute_error():
+    lazy = app.LazyModule("json")
+
+    assert not hasattr(lazy, "brak_atrybutu")
+    assert lazy.decoder.JSONDecodeError is json.JSONDecodeError
+
+
+def test_cli_dedupe_and_crawl_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = Storage()
+    for i in range(3):
+        storage.save_page(f"https://example.com/{i}", f"menu\ntreść {i}")
+    storage.close()
+
+    assert app.main(["dedupe", "teksty.txt", "wynik.txt", "--boilerplate", "0.5"]) == 0
+    result = (tmp_path / "wynik.txt").read_text(encoding="utf-8")
+    assert "menu" not in result and "treść 2" in result
+    assert app.main(["dedupe", "brak.txt"]) == 1
+
+    args = app.build_parser().parse_args(["crawl", "example.com"])
+    defaults = Config()
+    assert (args.max_pages, args.workers, args.delay, args.texts_format) == \
+        (defaults.max_pages, defaults.max_workers, defaults.delay, defaults.texts_format)
+
+
+def test_cli_crawl_restores_sigint_handler(monkeypatch):
+    class FailingCrawler:
+        def __init__(self, config, stop_event):
+            assert signal.getsignal(signal.SIGINT) is not handler
+
+        def run(self):
+            raise RuntimeError("błąd crawlera")
+
+    handler = signal.getsignal(signal.SIGINT)
+    monkeypatch.setattr(app, "Crawler", FailingCrawler)
+    with pytest.raises(RuntimeError):
+        app.main(["crawl", "example.com"])
+    assert signal.getsignal(signal.SIGINT) is handler
+
+
+# =========================
+# TEST 27: Strojenie wątków i opóźnienia w trakcie
+# =========================
+def test_crawler_tune_clamps_and_logs_following_throughput(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clock = [100.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: clock[0])
+    console = io.StringIO()
+    crawler = app.Crawler(Config("https://example.com", max_workers=2, log_json="crawl.jsonl"), streams=[console])
+
+    assert crawler.tune(workers=80, delay=0.1)
+    assert (crawler.config.max_workers, crawler.config.delay) == (Config.MAX_WORKERS, Config.MIN_DELAY)
+    assert not crawler.tune(workers=Config.MAX_WORKERS)
+
+    for i in range(30):
+        crawler.metrics.start_fetch()
+        crawler.metrics.end_fetch(f"https://example.com/{i}", 0.01, 100)
+        if i % 5 == 4:
+            clock[0] += 1
+    crawler._report_tuning()
+    crawler.log.close()
+    crawler.storage.close()
+
+    change = crawler.tuning[0]
+    assert change["before"] == 0 and change["after"] == 5.0
+    assert "Po zmianie (wątki 50, opóźnienie 0.3s): 5.0 stron/s" in console.getvalue()
+    entries = [json.loads(line) for line in (tmp_path / "crawl.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [e["pages_per_s"] for e in entries if "pages_per_s" in e] == [0, 5.0]